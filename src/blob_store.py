@@ -0,0 +1,212 @@
+"""Content-addressed, compressed storage for message bodies.
+
+Message bodies are the bulk of the scraped data and the same message is
+seen by many scrapes, so they are kept out of the month partitions:
+each body is stored once under blobs/<hh>/<sha256> in the child's
+directory and the record only keeps its hash in `content_ref`.
+Bodies are loaded (and decompressed) only when a tool returns content.
+
+Compression uses zstd when the optional `zstandard` package is installed,
+zlib otherwise. School messages share a lot of boilerplate (greetings,
+signatures, footers), so once enough bodies are stored a dictionary is
+built from them and used for later blobs - a trained zstd dictionary, or a
+zlib preset dictionary of sample text. Every blob header records its codec
+and dictionary, so old blobs stay readable when either changes.
+"""
+import functools
+import hashlib
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .child_registry import child_registry
+
+try:
+    import zstandard
+except ImportError:  # optional - zlib is used instead
+    zstandard = None
+
+
+BLOBS_DIR = "blobs"
+
+# Header: magic, codec byte, 8 hex chars of dictionary id ("00000000" = none)
+MAGIC = b"LB1"
+CODEC_ZLIB = b"z"
+CODEC_ZSTD = b"s"
+NO_DICTIONARY = "00000000"
+
+# Bodies collected before building a dictionary, and its size
+DICTIONARY_MIN_SAMPLES = 64
+# New bodies needed before retrying after a failed training
+DICTIONARY_RETRY_SAMPLES = 64
+DICTIONARY_SIZE = 32 * 1024  # also the zlib window, larger preset dicts are truncated
+
+ZLIB_LEVEL = 9
+ZSTD_LEVEL = 19
+
+_dictionary_lock = threading.Lock()
+# child blobs dir -> current dictionary id (None = not built yet)
+_current_dictionary: Dict[Path, Optional[str]] = {}
+# child blobs dir -> number of blobs when dictionary training last failed
+_training_failed_at: Dict[Path, int] = {}
+
+
+def blob_key(text: str) -> str:
+    """Content address of a body"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _blobs_dir(child_name: str) -> Path:
+    return child_registry.child_dir(child_name, BLOBS_DIR)
+
+
+def _blob_path(blobs_dir: Path, key: str) -> Path:
+    return blobs_dir / key[:2] / key
+
+
+@functools.lru_cache(maxsize=32)
+def _load_dictionary(blobs_dir: Path, dict_id: str) -> bytes:
+    return (blobs_dir / f"dict-{dict_id}.bin").read_bytes()
+
+
+def _dictionary_id(blobs_dir: Path) -> Optional[str]:
+    if blobs_dir not in _current_dictionary:
+        current = blobs_dir / "current_dict"
+        _current_dictionary[blobs_dir] = current.read_text().strip() if current.exists() else None
+    return _current_dictionary[blobs_dir]
+
+
+def build_dictionary(samples: List[bytes]) -> bytes:
+    """Train a zstd dictionary, or concatenate samples into a zlib preset dictionary"""
+    if zstandard is not None:
+        return zstandard.train_dictionary(DICTIONARY_SIZE, samples).as_bytes()
+    # zlib favours the end of the preset dictionary - newest samples last
+    return b"".join(samples)[-DICTIONARY_SIZE:]
+
+
+def _stored_samples(paths: List[Path], blobs_dir: Path) -> List[bytes]:
+    """Decompressed bodies already in the store (only read until a dictionary exists)"""
+    return [
+        decompress(path.read_bytes(), lambda dict_id: _load_dictionary(blobs_dir, dict_id))
+        for path in sorted(paths, key=lambda p: p.stat().st_mtime_ns)
+    ]
+
+
+def _maybe_build_dictionary(blobs_dir: Path):
+    """Build the child's dictionary once enough bodies exist (caller holds the lock)"""
+    from .storage import atomic_write_bytes
+
+    if _dictionary_id(blobs_dir) is not None:
+        return
+    # Count first - bodies are only read once there are enough of them
+    paths = list(blobs_dir.glob("??/*"))
+    threshold = DICTIONARY_MIN_SAMPLES
+    if blobs_dir in _training_failed_at:
+        threshold = max(threshold, _training_failed_at[blobs_dir] + DICTIONARY_RETRY_SAMPLES)
+    if len(paths) < threshold:
+        return
+    try:
+        dictionary = build_dictionary(_stored_samples(paths, blobs_dir))
+    except Exception:
+        # zstd training can fail on too little / too uniform data, retry with more samples
+        _training_failed_at[blobs_dir] = len(paths)
+        return
+    _training_failed_at.pop(blobs_dir, None)
+    dict_id = hashlib.sha256(dictionary).hexdigest()[:8]
+    atomic_write_bytes(blobs_dir / f"dict-{dict_id}.bin", dictionary)
+    atomic_write_bytes(blobs_dir / "current_dict", dict_id.encode("ascii"))
+    _current_dictionary[blobs_dir] = dict_id
+
+
+def compress(data: bytes, dictionary: Optional[bytes] = None, dict_id: str = NO_DICTIONARY) -> bytes:
+    """Compress with a self-describing header"""
+    if zstandard is not None:
+        zdict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        payload = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=zdict).compress(data)
+        codec = CODEC_ZSTD
+    else:
+        compressor = zlib.compressobj(ZLIB_LEVEL, zdict=dictionary) if dictionary else zlib.compressobj(ZLIB_LEVEL)
+        payload = compressor.compress(data) + compressor.flush()
+        codec = CODEC_ZLIB
+    return MAGIC + codec + dict_id.encode("ascii") + payload
+
+
+def decompress(blob: bytes, load_dictionary=None) -> bytes:
+    """Inverse of compress(); load_dictionary(dict_id) supplies dictionaries"""
+    if blob[:3] != MAGIC:
+        raise ValueError("Not a blob")
+    codec, dict_id, payload = blob[3:4], blob[4:12].decode("ascii"), blob[12:]
+    dictionary = load_dictionary(dict_id) if dict_id != NO_DICTIONARY else None
+
+    if codec == CODEC_ZLIB:
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return decompressor.decompress(payload) + decompressor.flush()
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Blob is zstd-compressed, install the 'zstandard' package")
+        zdict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstandard.ZstdDecompressor(dict_data=zdict).decompress(payload)
+    raise ValueError(f"Unknown blob codec: {codec!r}")
+
+
+def put_many(child_name: str, bodies: Iterable[str]) -> List[str]:
+    """
+    Store bodies (deduplicated by content) and return their keys.
+
+    Caller holds storage.child_lock, blobs are written atomically.
+    """
+    from .storage import atomic_write_bytes
+
+    blobs_dir = _blobs_dir(child_name)
+    keys = []
+    added = False
+    with _dictionary_lock:
+        for text in bodies:
+            key = blob_key(text)
+            keys.append(key)
+            path = _blob_path(blobs_dir, key)
+            if path.exists():
+                continue
+
+            data = text.encode("utf-8")
+            dict_id = _dictionary_id(blobs_dir)
+            dictionary = _load_dictionary(blobs_dir, dict_id) if dict_id else None
+            path.parent.mkdir(exist_ok=True)
+            atomic_write_bytes(path, compress(data, dictionary, dict_id or NO_DICTIONARY))
+            added = True
+
+        if added:
+            _maybe_build_dictionary(blobs_dir)
+    return keys
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_cached(blobs_dir: Path, key: str) -> str:
+    blob = _blob_path(blobs_dir, key).read_bytes()
+    return decompress(blob, lambda dict_id: _load_dictionary(blobs_dir, dict_id)).decode("utf-8")
+
+
+def get(child_name: str, key: str) -> str:
+    """Load one body by key"""
+    return _get_cached(_blobs_dir(child_name), key)
+
+
+def resolve_content(child_name: str, item: Dict) -> str:
+    """Body of a record - inline content, or loaded from the blob store"""
+    if "content" in item:
+        return item["content"] or ""
+    if item.get("content_ref"):
+        try:
+            return get(child_name, item["content_ref"])
+        except FileNotFoundError:
+            return ""
+    return ""
+
+
+def with_content(child_name: str, records: Iterable[Dict]) -> List[Dict]:
+    """Copies of records with bodies loaded - use only for records a tool returns"""
+    return [
+        dict(item, content=resolve_content(child_name, item)) if "content_ref" in item else item
+        for item in records
+    ]
@@ -0,0 +1,53 @@
+"""One headless browser shared by every scrape.
+
+Launching WebKit costs more than most delta scrapes, and with several
+tenants on one server a browser per scrape would multiply that. The
+pool starts the browser on first use and keeps it running; each scrape
+opens its own context (cookies, storage and routes of that child only)
+and closes just the context when done. How many contexts are open at
+once is bounded by scrape_scheduler.
+
+Playwright is imported on first use, like in handlers.scraping.
+"""
+import asyncio
+import sys
+from typing import Optional
+
+from .config import Colors
+
+
+class BrowserPool:
+    """Lazily launched shared browser, relaunched if it disconnects"""
+
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def browser(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+            print(f"{Colors.BLUE}Launching shared browser...{Colors.ENDC}", file=sys.stderr)
+            self._browser = await self._playwright.webkit.launch(headless=True)
+            return self._browser
+
+    async def close(self):
+        """Close the browser and stop Playwright (server shutdown)"""
+        browser, playwright = self._browser, self._playwright
+        self._browser = self._playwright = None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                print(f"{Colors.YELLOW}Closing browser failed: {e}{Colors.ENDC}", file=sys.stderr)
+        if playwright is not None:
+            await playwright.stop()
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,147 @@
+"""Append-only log of record changes, for "what's new since I last looked".
+
+Every ingest (storage._save_monthly_data_locked) appends one entry per
+record that was added, modified or removed, with a per-child monotonic
+sequence number. Entries live in changes.sqlite in the child directory
+(seq is the INTEGER PRIMARY KEY, so reading "since seq N" is one index
+range scan) and carry only a short summary of the record - the caller
+fetches full records through the other tools if it needs them.
+"""
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .blob_store import blob_key
+from .child_registry import child_registry
+
+
+LOG_FILE = "changes.sqlite"
+
+OPS = ("added", "modified", "removed")
+
+DEFAULT_LIMIT = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    at TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    op TEXT NOT NULL,
+    record_key TEXT NOT NULL,
+    summary TEXT NOT NULL
+);
+"""
+
+# Fields kept in an entry's summary, per kind
+SUMMARY_FIELDS = {
+    'messages': ('date', 'sender', 'title', 'requires_response'),
+    'announcements': ('date', 'title', 'author'),
+    'grades': ('date', 'subject', 'grade', 'category'),
+    'calendar': ('date', 'title', 'category'),
+    'remarks': ('date', 'teacher', 'category', 'polarity'),
+    'homework': ('dateDue', 'subject', 'title'),
+}
+
+# Not part of a record's content for change detection: derived tags,
+# storage details, identity fields and read state (which flips without
+# the record changing)
+IGNORED_FIELDS = frozenset({'content_ref', 'content', 'requires_response', 'polarity', 'isRead', 'link', 'id', 'slot'})
+
+
+def _connect(child_name: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(child_registry.child_dir(child_name) / LOG_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def content_fingerprint(item: Dict) -> Tuple:
+    """Comparable form of a record - inline bodies compared by their blob key"""
+    fields = tuple(sorted((k, repr(v)) for k, v in item.items() if k not in IGNORED_FIELDS))
+    body = blob_key(item['content'] or '') if 'content' in item else item.get('content_ref')
+    return fields, body
+
+
+def summarize(kind: str, item: Dict) -> Dict:
+    return {f: item[f] for f in SUMMARY_FIELDS.get(kind, ()) if item.get(f) not in (None, '')}
+
+
+def append(child_name: str, changes: Iterable[Tuple[str, str, str, Dict]]) -> int:
+    """
+    Log changes as (kind, op, record key, record).
+
+    Caller holds storage.child_lock, so sequence numbers follow ingest order.
+
+    Returns:
+        Number of entries written
+    """
+    rows = [
+        (datetime.now().isoformat(timespec='seconds'), kind, op, key,
+         json.dumps(summarize(kind, item), ensure_ascii=False))
+        for kind, op, key, item in changes
+    ]
+    if not rows:
+        return 0
+    with closing(_connect(child_name)) as conn, conn:
+        conn.executemany(
+            "INSERT INTO changes (at, kind, op, record_key, summary) VALUES (?, ?, ?, ?, ?)", rows
+        )
+    return len(rows)
+
+
+def latest_seq(child_name: str) -> int:
+    """Sequence number of the newest entry (0 if nothing was logged yet)"""
+    if not (child_registry.child_dir(child_name) / LOG_FILE).exists():
+        return 0
+    with closing(_connect(child_name)) as conn:
+        return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+
+def op_counts(child_name: str, since_seq: int, kind: str) -> Dict[str, int]:
+    """Number of entries of one kind after since_seq, per op"""
+    if not (child_registry.child_dir(child_name) / LOG_FILE).exists():
+        return {}
+    with closing(_connect(child_name)) as conn:
+        return dict(conn.execute(
+            "SELECT op, COUNT(*) FROM changes WHERE seq > ? AND kind = ? GROUP BY op", (since_seq, kind)
+        ).fetchall())
+
+
+def changes_since(
+    child_name: str,
+    since_seq: int = 0,
+    kinds: Optional[List[str]] = None,
+    limit: int = DEFAULT_LIMIT
+) -> Dict:
+    """
+    Entries after since_seq, oldest first.
+
+    Returns:
+        {"changes": [...], "next_seq": seq to pass next time, "has_more": bool}
+    """
+    if not (child_registry.child_dir(child_name) / LOG_FILE).exists():
+        return {"changes": [], "next_seq": since_seq, "has_more": False}
+
+    sql = "SELECT seq, at, kind, op, summary FROM changes WHERE seq > ?"
+    params: list = [since_seq]
+    if kinds:
+        sql += f" AND kind IN ({','.join('?' * len(kinds))})"
+        params.extend(kinds)
+    sql += " ORDER BY seq LIMIT ?"
+    params.append(limit + 1)
+
+    with closing(_connect(child_name)) as conn:
+        rows = conn.execute(sql, params).fetchall()
+        newest = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changes = [
+        {"seq": seq, "at": at, "kind": kind, "op": op, **json.loads(summary)}
+        for seq, at, kind, op, summary in rows
+    ]
+    # With a kind filter, skipped entries of other kinds are behind us too
+    next_seq = rows[-1][0] if has_more else max(newest, since_seq)
+    return {"changes": changes, "next_seq": next_seq, "has_more": has_more}
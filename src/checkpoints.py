@@ -0,0 +1,240 @@
+"""Streaming ingest and checkpoints that make an interrupted scrape resumable.
+
+The page streams records to Python in batches (the librusIngest binding)
+as they are scraped; every batch is validated, deduplicated (ingest.py)
+and upserted into the month partitions right away, so neither the page
+nor Python holds the whole inbox. The last batch of every unit - an inbox
+page, a whole section (announcements, grades, calendar, remarks) or a
+homework month - carries a cursor that is written to `scrape_progress`
+in state.json. The last_scrape_iso watermark only moves when the whole
+scrape completes with every section ok, so a retried scrape_librus of
+the same kind (FULL or DELTA since the same watermark) picks the cursor
+up and skips the finished units instead of starting from zero.
+
+Sections scraped completely on every run (calendar months ahead, the
+school year's grades and remarks) also drop stored records the finished
+section no longer returned - they were deleted or retracted in Librus -
+and log them as removed. A finished section without any records removes
+nothing (a failed page is likelier than an emptied school year). With the
+grades upserted by grade_identity, one scrape flags new, corrected and
+retracted grades in the change log.
+"""
+import asyncio
+import copy
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .change_log import latest_seq, op_counts
+from .config import config, Colors
+from .executor import run_io
+from .ingest import BatchDeduplicator
+from .memory import forget_grade_history, merge_grade_history
+from .scraper import expand_records
+from .storage import (
+    RECORD_KINDS, child_lock, relocate_undated_records, remove_missing_records, save_scrape_data, save_state
+)
+
+
+PROGRESS_KEY = "scrape_progress"
+
+# An older cursor is dropped - the data it skips would be too stale
+RESUME_MAX_AGE = timedelta(hours=24)
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _months(first: Tuple[int, int], last: Tuple[int, int]) -> List[Tuple[int, int]]:
+    months = []
+    year, month = first
+    while (year, month) <= last:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _calendar_scope(now: datetime) -> List[Tuple[int, int]]:
+    """Months the calendar section fetches: this one and calendar_months_ahead more"""
+    ahead = now.month - 1 + config.calendar_months_ahead
+    return _months((now.year, now.month), (now.year + ahead // 12, ahead % 12 + 1))
+
+
+def _school_year_scope(now: datetime) -> List[Tuple[int, int]]:
+    """Months of the current school year so far (the grades and remarks pages list the whole year)"""
+    start_year = now.year if now.month >= 9 else now.year - 1
+    return _months((start_year, 9), (now.year, now.month))
+
+
+# Section -> partitions it covers completely on every scrape
+REMOVAL_SCOPES = {
+    'calendar': _calendar_scope,
+    'grades': _school_year_scope,
+    'remarks': _school_year_scope,
+}
+
+
+def start_progress(state: Dict, full: bool, since: Optional[str], now: datetime) -> Dict:
+    """
+    Cursor for this scrape - the interrupted one's if it can be resumed.
+
+    A cursor is resumed when it is for the same kind of scrape (full, or
+    delta since the same watermark) and younger than RESUME_MAX_AGE.
+    """
+    progress = state.get(PROGRESS_KEY)
+    if progress and progress.get("full") == full and progress.get("since") == since:
+        started = datetime.strptime(progress["started"], TIME_FORMAT)
+        if now - started <= RESUME_MAX_AGE:
+            return progress
+
+    progress = {
+        "full": full,
+        "since": since,
+        "started": now.strftime(TIME_FORMAT),
+        "sections_done": [],
+        "messages_page": 0,
+        "messages_collected": 0,
+        "homework_done": []
+    }
+    state[PROGRESS_KEY] = progress
+    return progress
+
+
+def is_resumed(progress: Dict) -> bool:
+    """True if an earlier run already checkpointed part of this scrape"""
+    return bool(progress["sections_done"] or progress["messages_page"] or progress["homework_done"])
+
+
+def without_records(result: Dict) -> Dict:
+    """Scrape result minus its record lists (they were stored by checkpoints)"""
+    stripped = {k: v for k, v in result.items() if k != 'homework'}
+    stripped['rawData'] = {k: v for k, v in (result.get('rawData') or {}).items() if k not in RECORD_KINDS}
+    return stripped
+
+
+def failed_sections(result: Dict) -> List[str]:
+    """Sections of a scrape result that ended with an error"""
+    return [name for name, section in (result.get("sections") or {}).items() if section.get("status") == "error"]
+
+
+class Checkpointer:
+    """Stores streamed record batches and advances the cursor in state.json"""
+
+    def __init__(self, child_name: str, state: Dict, progress: Dict, mode: str):
+        self.child_name = child_name
+        self.state = state
+        self.progress = progress
+        self.mode = mode
+        self.started = datetime.strptime(progress["started"], TIME_FORMAT)
+        self.dedup = BatchDeduplicator()
+        # Change log position before this run's first store
+        self.first_seq: Optional[int] = None
+        # Checkpoints from concurrent sections are stored one at a time, in order
+        self._lock = asyncio.Lock()
+
+    @property
+    def homework_done(self) -> List[str]:
+        return self.progress["homework_done"]
+
+    def js_resume(self) -> Dict:
+        """Cursor in the shape the in-page scraper takes (params.resume)"""
+        return {
+            "sectionsDone": list(self.progress["sections_done"]),
+            "messagesPage": self.progress["messages_page"],
+            "messagesCollected": self.progress["messages_collected"]
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Records ingested by this run, per kind"""
+        return dict(self.dedup.counts)
+
+    def grade_changes(self) -> Dict[str, int]:
+        """New ('added'), corrected ('modified') and retracted ('removed') grades of this run"""
+        return op_counts(self.child_name, self.first_seq, 'grades') if self.first_seq is not None else {}
+
+    def _store(self, result: Dict, state: Optional[Dict], completed: Optional[str] = None):
+        with child_lock(self.child_name):
+            if self.first_seq is None:
+                self.first_seq = latest_seq(self.child_name)
+            home = (self.started.year, self.started.month)
+            for kind, scope in REMOVAL_SCOPES.items():
+                if result["rawData"].get(kind):
+                    relocate_undated_records(self.child_name, kind, result["rawData"][kind], scope(self.started), home)
+            if any(result["rawData"].get(kind) for kind in RECORD_KINDS) or result.get("homework") \
+                    or "descriptiveGrade" in result["rawData"]:
+                save_scrape_data(self.child_name, result, self.mode, self.started, refresh_views=False)
+            if result["rawData"].get("grades"):
+                merge_grade_history(self.child_name, result["rawData"])
+            if completed in REMOVAL_SCOPES and not self.dedup.counts.get(completed):
+                # An empty section is far more likely a page that failed to parse
+                # than every record gone - keep what is stored
+                print(f"{Colors.YELLOW}[{self.child_name}] {completed}: no records, "
+                      f"skipping removal of stored ones{Colors.ENDC}", file=sys.stderr)
+            elif completed in REMOVAL_SCOPES:
+                removed = remove_missing_records(
+                    self.child_name, completed, REMOVAL_SCOPES[completed](self.started),
+                    lambda item: self.dedup.seen(completed, item)
+                )
+                if completed == 'grades' and removed:
+                    forget_grade_history(self.child_name, removed)
+            if state is not None:
+                save_state(self.child_name, state)
+
+    async def _ingest(self, result: Dict, advance=None, completed: Optional[str] = None):
+        async with self._lock:
+            state = None
+            if advance:
+                advance(self.progress)
+                state = copy.deepcopy(self.state)
+            await run_io(self._store, result, state, completed)
+
+    async def ingest_batch(self, cursor: Optional[Dict], records: Dict):
+        """
+        Called from the page (librusIngest) with a batch of records.
+
+        cursor is set on the last batch of a finished inbox page or section.
+        """
+        raw = {}
+        for key, value in (records or {}).items():
+            # Non-record fields (descriptiveGrade) pass through
+            if key in RECORD_KINDS:
+                raw[key] = self.dedup.fresh(key, value, lambda valid, k=key: expand_records({k: valid})[k])
+            else:
+                raw[key] = value
+
+        def advance(progress):
+            if cursor.get("done"):
+                progress["sections_done"].append(cursor["section"])
+            if cursor.get("page"):
+                progress["messages_page"] = cursor["page"]
+                progress["messages_collected"] = cursor.get("collected", 0)
+
+        completed = cursor["section"] if cursor and cursor.get("done") else None
+        await self._ingest({"rawData": raw}, advance if cursor else None, completed)
+
+    async def homework_month(self, date_from: str, homework: List[Dict]):
+        """Called by scrape_homework after each month"""
+        await self._ingest(
+            {"rawData": {}, "homework": self.dedup.fresh("homework", homework)},
+            lambda progress: progress["homework_done"].append(date_from)
+        )
+
+    def finish(self, result: Dict) -> bool:
+        """
+        Store what checkpoints didn't (stats, sections) and close the scrape.
+
+        The watermark becomes the time the scrape started, so records that
+        appeared while an interrupted scrape was waiting are fetched next time.
+        If a section failed, the cursor and the watermark stay: the next
+        scrape of the same kind resumes and runs the failed sections again.
+
+        Returns:
+            True if the scrape is complete (the watermark moved)
+        """
+        failed = failed_sections(result)
+        with child_lock(self.child_name):
+            save_scrape_data(self.child_name, without_records(result), self.mode, self.started)
+            if not failed:
+                self.state.pop(PROGRESS_KEY, None)
+                self.state["last_scrape_iso"] = self.progress["started"]
+            save_state(self.child_name, self.state)
+        return not failed
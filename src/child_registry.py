@@ -0,0 +1,112 @@
+"""Child registry - alias lookup and data directories built once from config"""
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+from . import tenants
+from .config import config
+from .credentials import load_credentials
+
+
+BROWSER_CONTEXT_DIR = "browser_context"
+
+
+class UnknownChild(ValueError):
+    """Raised for a name that isn't a configured child of the current tenant"""
+    pass
+
+
+class ChildRegistry:
+    """
+    Case-folded alias -> canonical name map plus memoized, pre-created
+    per-child directories, kept per tenant.
+
+    Rebuilt only when the configuration changes (config.yaml reloaded -
+    see config.watch_config - children replaced or data_dir overridden), so
+    resolving a name or getting a child's directory is a dict lookup with
+    no filesystem calls. Names resolve in the current tenant (see tenants),
+    and only its configured children get a directory, so no name can reach
+    outside the tenant's storage root.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # tenant -> (source, aliases)
+        self._aliases: Dict[str, Tuple[Tuple, Dict[str, str]]] = {}
+        # tenant -> (storage root, {(name, subdir): path})
+        self._dirs: Dict[str, Tuple[Path, Dict[Tuple[str, str], Path]]] = {}
+
+    def _current_aliases(self) -> Dict[str, str]:
+        # Config only - resolving names never touches the filesystem
+        tenant_id = tenants.current_tenant()
+        source = (config.generation, id(tenants.children(tenant_id)))
+        state = self._aliases.get(tenant_id)
+        if state is None or state[0] != source:
+            with self._lock:
+                state = self._aliases.get(tenant_id)
+                if state is None or state[0] != source:
+                    state = self._rebuild(source)
+                    self._aliases[tenant_id] = state
+        return state[1]
+
+    def _current_dirs(self) -> Tuple[Path, Dict[Tuple[str, str], Path]]:
+        tenant_id = tenants.current_tenant()
+        root = tenants.data_dir(tenant_id)
+        state = self._dirs.get(tenant_id)
+        if state is None or state[0] != root:
+            with self._lock:
+                state = self._dirs.get(tenant_id)
+                if state is None or state[0] != root:
+                    state = (root, {})
+                    self._dirs[tenant_id] = state
+        return state
+
+    def _rebuild(self, source: Tuple):
+        aliases: Dict[str, str] = {}
+        for child in load_credentials().get("children", []):
+            canonical = child["name"]
+            # First match wins, same precedence as scanning children in order
+            aliases.setdefault(canonical.casefold(), canonical)
+            for alias in child.get("aliases", []):
+                aliases.setdefault(alias.casefold(), canonical)
+
+        return source, aliases
+
+    def invalidate(self, _config=None):
+        """Force a rebuild on next access (also used as config reload subscriber)"""
+        with self._lock:
+            self._aliases = {}
+            self._dirs = {}
+
+    def resolve(self, name: str) -> str:
+        """Resolve alias to canonical name (unknown names are returned unchanged)"""
+        return self._current_aliases().get(name.casefold(), name)
+
+    def child_dir(self, name: str, subdir: str = "") -> Path:
+        """
+        Get (and create once) a child's data directory or a subdirectory of it.
+
+        Raises:
+            UnknownChild: name is not a child (or alias) of the current tenant
+        """
+        root, dirs = self._current_dirs()
+        key = (name, subdir)
+        path = dirs.get(key)
+        if path is None:
+            # Only configured children get a directory - a name is never a path
+            canonical = self._current_aliases().get(name.casefold())
+            if canonical is None:
+                raise UnknownChild(f"Unknown child: {name}")
+            safe_name = canonical.lower().replace(" ", "-")
+            if safe_name in ("", ".", "..") or "/" in safe_name or "\\" in safe_name:
+                raise UnknownChild(f"Child name can't be used as a directory: {canonical}")
+            path = root / safe_name
+            if subdir:
+                path = path / subdir
+            path.mkdir(parents=True, exist_ok=True)
+            dirs[key] = path
+        return path
+
+
+child_registry = ChildRegistry()
+config.subscribe(child_registry.invalidate)
@@ -0,0 +1,179 @@
+"""Ingest-time classification of messages and remarks.
+
+All keyword lists are compiled into one prefix-trie regex over lowercased
+text, so a record field is scanned once no matter how many keywords are
+configured. Results are stored on the records themselves:
+
+- messages: requires_response (bool)
+- remarks: polarity ('positive', 'negative' or 'neutral')
+
+Keyword lists come from the `classification` section of config.yaml
+(defaults below). Each classified scrape result records the fingerprint of
+the lists it was classified with, so records are reclassified after the
+lists change.
+"""
+import functools
+import hashlib
+import json
+import re
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from .blob_store import resolve_content
+from .config import config
+
+
+DEFAULT_KEYWORDS = {
+    "response_keywords": [
+        'proszę o odpowiedź', 'proszę potwierdzić', 'czy może', 'czy mogłaby', 'czy mógłby',
+        'proszę o informację', 'proszę o kontakt', 'proszę o zgłoszenie', 'proszę o przesłanie',
+        'czy zgadza się', 'czy wyrażają państwo zgodę', 'proszę o podpisanie',
+        'termin', 'deadline', 'do kiedy', 'najpóźniej', 'wymagana odpowiedź'
+    ],
+    "response_subject_words": ['zgoda', 'potwierdzenie', 'odpowiedź', 'prośba'],
+    "positive_remark_words": ['dobr', 'świetn', 'wzorn', 'aktywn', 'pomoc'],
+    "negative_remark_words": ['brak', 'nie', 'źle', 'słab', 'problem'],
+}
+
+
+def keyword_lists() -> Dict[str, Tuple[str, ...]]:
+    """Configured keyword lists (config.yaml overrides defaults per list)"""
+    configured = config.classification
+    return {
+        name: tuple(configured.get(name, default))
+        for name, default in DEFAULT_KEYWORDS.items()
+    }
+
+
+def trie_pattern(words) -> str:
+    """
+    Regex source matching any of the words, factored into a prefix trie.
+
+    Python's re engine tries plain alternatives one by one at every
+    position; sharing prefixes ("proszę o ...", "czy ...") lets it reject
+    a position after a character or two.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    return build(trie)
+
+
+class Matcher:
+    """All keyword lists compiled into a single pattern"""
+
+    def __init__(self, lists: Tuple[Tuple[str, Tuple[str, ...]], ...]):
+        self.lists_by_word: Dict[str, FrozenSet[str]] = {}
+        for name, words in lists:
+            for word in words:
+                word = word.lower()
+                self.lists_by_word[word] = self.lists_by_word.get(word, frozenset()) | {name}
+
+        # The trie reports the longest keyword at a position, which implies
+        # every keyword that is a prefix of it matched there too
+        for word in list(self.lists_by_word):
+            for other, names in list(self.lists_by_word.items()):
+                if other != word and word.startswith(other):
+                    self.lists_by_word[word] = self.lists_by_word[word] | names
+
+        if self.lists_by_word:
+            # Zero-width lookahead: every start position is tried, matches may overlap
+            self.pattern = re.compile("(?=(" + trie_pattern(self.lists_by_word) + "))")
+        else:
+            self.pattern = None
+
+    def match_lists(self, text: str) -> FrozenSet[str]:
+        """Names of keyword lists with at least one match in text"""
+        if not text or self.pattern is None:
+            return frozenset()
+        found: FrozenSet[str] = frozenset()
+        for match in self.pattern.finditer(text.lower()):
+            found |= self.lists_by_word.get(match.group(1), frozenset())
+        return found
+
+
+@functools.lru_cache(maxsize=8)
+def _compile(lists: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Matcher:
+    return Matcher(lists)
+
+
+@functools.lru_cache(maxsize=8)
+def fingerprint(lists: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> str:
+    """Short stable hash of keyword lists"""
+    return hashlib.sha1(json.dumps(lists, ensure_ascii=False).encode("utf-8")).hexdigest()[:12]
+
+
+def _current() -> Tuple[Matcher, str]:
+    lists = tuple(sorted(keyword_lists().items()))
+    return _compile(lists), fingerprint(lists)
+
+
+def current_fingerprint() -> str:
+    """Fingerprint of the currently configured keyword lists"""
+    return _current()[1]
+
+
+def classify_message(matcher: Matcher, message: Dict, child_name: Optional[str] = None) -> bool:
+    """True if a message looks like it needs a reply from the parent"""
+    if "content" in message or child_name is None:
+        content = message.get("content", "")
+    else:
+        # Body moved to the blob store at ingest
+        content = resolve_content(child_name, message)
+    if "response_keywords" in matcher.match_lists(content):
+        return True
+    subject = message.get("title") or message.get("subject", "")
+    return "response_subject_words" in matcher.match_lists(subject)
+
+
+def classify_remark(matcher: Matcher, remark: Dict) -> str:
+    """Remark polarity - positive words win over negative ones"""
+    found = matcher.match_lists(remark.get("content", ""))
+    if "positive_remark_words" in found:
+        return "positive"
+    if "negative_remark_words" in found:
+        return "negative"
+    return "neutral"
+
+
+def classify_result(result: Dict, force: bool = False, child_name: Optional[str] = None) -> Dict:
+    """
+    Tag messages and remarks of one scrape result in place.
+
+    Skipped if the result was already classified with the current lists,
+    unless force is set (records were added since). child_name is needed
+    for stored months, whose message bodies live in the blob store.
+    """
+    raw = result.get("rawData")
+    if not raw:
+        return result
+    matcher, current = _current()
+    if not force and result.get("classifier") == current:
+        return result
+
+    for message in raw.get("messages") or []:
+        message["requires_response"] = classify_message(matcher, message, child_name)
+    for remark in raw.get("remarks") or []:
+        remark["polarity"] = classify_remark(matcher, remark)
+    result["classifier"] = current
+    return result
+
+
+def classify_months(months_data: Dict, child_name: Optional[str] = None) -> Dict:
+    """Make sure every month from get_recent_months_data() carries current tags"""
+    for month_data in months_data.values():
+        if month_data.get("data"):
+            classify_result(month_data["data"], child_name=child_name)
+    return months_data
@@ -1,7 +1,13 @@
 """Configuration loader and manager"""
+import asyncio
+import os
+import sys
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional
+
+
+CONFIG_FILE = Path(__file__).parent.parent / "config.yaml"
 
 
 class Config:
@@ -10,6 +16,10 @@ class Config:
     _instance = None
     _config: Dict[str, Any] = {}
     _test_overrides: Dict[str, Any] = {}
+    _mtime_ns: Optional[int] = None
+    _data_dir: Optional[Path] = None
+    _subscribers: List[Callable[["Config"], None]] = []
+    generation: int = 0
     
     def __new__(cls):
         if cls._instance is None:
@@ -19,13 +29,67 @@ class Config:
     
     def _load_config(self):
         """Load configuration from YAML file"""
-        config_file = Path(__file__).parent.parent / "config.yaml"
+        config_file = CONFIG_FILE
         
         if not config_file.exists():
             raise FileNotFoundError(f"Config file not found: {config_file}")
         
         with open(config_file, 'r') as f:
-            self._config = yaml.safe_load(f)
+            loaded = yaml.safe_load(f)
+        if not isinstance(loaded, dict):
+            raise ValueError(f"Config file must contain a mapping: {config_file}")
+        
+        self._config = loaded
+        self._mtime_ns = os.stat(config_file).st_mtime_ns
+        self._data_dir = None
+        self.generation += 1
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reload config.yaml if its mtime changed since the last load.
+        
+        Returns:
+            True if the configuration was reloaded
+        """
+        try:
+            mtime_ns = os.stat(CONFIG_FILE).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime_ns == self._mtime_ns:
+            return False
+        
+        try:
+            self._load_config()
+        except Exception as e:
+            # Keep serving with the last good configuration, don't retry until it changes again
+            self._mtime_ns = mtime_ns
+            print(f"{Colors.YELLOW}Config reload failed, keeping previous config: {e}{Colors.ENDC}", file=sys.stderr)
+            return False
+        
+        self._notify()
+        return True
+    
+    def subscribe(self, callback: Callable[["Config"], None]):
+        """
+        Register a callback run after config.yaml is reloaded.
+        
+        Used by components holding derived state (child registry, executor
+        pools, caches) to rebuild themselves without a server restart.
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+    
+    def unsubscribe(self, callback: Callable[["Config"], None]):
+        """Remove a reload callback"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+    
+    def _notify(self):
+        for callback in list(self._subscribers):
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"{Colors.YELLOW}Config subscriber {callback!r} failed: {e}{Colors.ENDC}", file=sys.stderr)
     
     def set_test_override(self, key: str, value: Any):
         """Set test override for a config value"""
@@ -41,10 +105,11 @@ class Config:
         if 'data_dir' in self._test_overrides:
             return self._test_overrides['data_dir']
         
-        dir_name = self._config['storage']['data_dir']
-        path = Path.home() / dir_name
-        path.mkdir(exist_ok=True)
-        return path
+        if self._data_dir is None:
+            path = Path.home() / self._config['storage']['data_dir']
+            path.mkdir(parents=True, exist_ok=True)
+            self._data_dir = path
+        return self._data_dir
     
     @property
     def login_timeout_ms(self) -> int:
@@ -54,6 +119,20 @@ class Config:
     def page_timeout_ms(self) -> int:
         return self._config['browser']['page_timeout_ms']
     
+    @property
+    def block_resources(self) -> bool:
+        """Abort image/font/stylesheet requests in headless scraping contexts"""
+        return self._config['browser'].get('block_resources', True)
+    
+    @property
+    def blocked_resource_types(self) -> List[str]:
+        return self._config['browser'].get('blocked_resource_types', ['image', 'font', 'stylesheet', 'media'])
+    
+    @property
+    def resource_allowlist(self) -> List[str]:
+        """URL substrings that always load, even when their type is blocked"""
+        return self._config['browser'].get('resource_allowlist') or []
+    
     @property
     def max_messages(self) -> int:
         return self._config['scraping']['max_messages']
@@ -70,6 +149,91 @@ class Config:
     def calendar_months_ahead(self) -> int:
         return self._config['scraping']['calendar_months_ahead']
     
+    @property
+    def max_concurrent_requests(self) -> int:
+        """Requests the in-page scraper keeps in flight across all sections"""
+        return self._config['scraping'].get('max_concurrent_requests', 4)
+    
+    @property
+    def fetch_retries(self) -> int:
+        """Retries of a throttled (429/5xx) page fetch, spaced by the rate limiter's backoff"""
+        return self._config['scraping'].get('fetch_retries', 2)
+    
+    @property
+    def stream_batch_size(self) -> int:
+        """Records per batch the page streams back to Python while scraping"""
+        return self._config['scraping'].get('stream_batch_size', 25)
+    
+    @property
+    def homework_days_ahead(self) -> int:
+        return self._config['scraping'].get('homework_days_ahead', 30)
+    
+    @property
+    def homework_form_timeout_ms(self) -> int:
+        return self._config['scraping'].get('homework_form_timeout_ms', 5000)
+    
+    @property
+    def config_reload_interval_s(self) -> float:
+        """How often the server polls config.yaml for changes (0 disables)"""
+        return self._config.get('server', {}).get('config_reload_interval_s', 2.0)
+    
+    @property
+    def transport(self) -> str:
+        """MCP transport: 'stdio' (one process per client) or 'http' (streamable HTTP, shared)"""
+        return self._config.get('server', {}).get('transport', 'stdio')
+    
+    @property
+    def http_host(self) -> str:
+        return self._config.get('server', {}).get('host', '127.0.0.1')
+    
+    @property
+    def http_port(self) -> int:
+        return self._config.get('server', {}).get('port', 8765)
+    
+    @property
+    def http_path(self) -> str:
+        return self._config.get('server', {}).get('path', '/mcp')
+    
+    @property
+    def max_concurrent_calls(self) -> int:
+        """Tool calls running at once; further calls wait for a slot"""
+        return self._config.get('server', {}).get('max_concurrent_calls', 8)
+    
+    @property
+    def shutdown_grace_s(self) -> float:
+        """How long shutdown waits for running tool calls to finish"""
+        return self._config.get('server', {}).get('shutdown_grace_s', 30.0)
+    
+    @property
+    def max_concurrent_scrapes(self) -> int:
+        """Scrapes running at once across all tenants (browser contexts in the shared browser)"""
+        return self._config.get('scheduler', {}).get('max_concurrent_scrapes', 4)
+    
+    @property
+    def tenant_max_concurrent_scrapes(self) -> int:
+        """Default per-tenant quota of concurrent scrapes"""
+        return self._config.get('scheduler', {}).get('tenant_max_concurrent_scrapes', 1)
+    
+    @property
+    def io_workers(self) -> int:
+        """Thread pool size for blocking file I/O"""
+        return self._config.get('executor', {}).get('io_workers', 8)
+    
+    @property
+    def cpu_workers(self) -> int:
+        """Process pool size for CPU-heavy work (0 = use the I/O thread pool)"""
+        return self._config.get('executor', {}).get('cpu_workers', 0)
+    
+    @property
+    def rate_limit(self) -> Dict[str, float]:
+        """Adaptive per-host rate limiter settings (see rate_limiter.py)"""
+        return self._config.get('rate_limit') or {}
+    
+    @property
+    def classification(self) -> Dict[str, List[str]]:
+        """Keyword list overrides for message/remark classification"""
+        return self._config.get('classification') or {}
+    
     @property
     def colors_enabled(self) -> bool:
         return self._config['console']['colors_enabled']
@@ -100,6 +264,21 @@ class Colors:
         cls.BOLD = ''
 
 
+async def watch_config(interval_s: Optional[float] = None):
+    """
+    Poll config.yaml mtime and reload on change, notifying subscribers.
+    
+    Runs until cancelled. The interval is re-read after each reload so it
+    can itself be tuned live.
+    """
+    while True:
+        interval = interval_s or config.config_reload_interval_s
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+        config.reload_if_changed()
+
+
 # Initialize colors based on config
 config = Config()
 if not config.colors_enabled:
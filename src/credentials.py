@@ -1,7 +1,7 @@
 """Credentials management"""
 import json
 from typing import Dict, List
-from .config import config
+from . import tenants
 
 
 class CredentialsError(Exception):
@@ -10,20 +10,24 @@ class CredentialsError(Exception):
 
 
 def load_credentials() -> Dict:
-    """Load credentials from config.yaml"""
-    if 'children' not in config._config:
+    """Load credentials of the current tenant from config.yaml"""
+    children = tenants.children()
+    if children is None:
         raise CredentialsError(
             f"Missing children configuration in config.yaml!\n"
             f"Copy config.yaml.example and fill in your data"
         )
     
-    return {"children": config._config['children']}
+    return {"children": children}
 
 
 def resolve_child_name(name: str) -> str:
     """
     Resolve alias to canonical child name.
     
+    Uses the precomputed alias map in child_registry (rebuilt only when
+    config changes).
+    
     Args:
         name: Child name or alias (case-insensitive)
         
@@ -34,18 +38,8 @@ def resolve_child_name(name: str) -> str:
         >>> resolve_child_name("Kuba")
         "Jakub"
     """
-    creds = load_credentials()
-    name_lower = name.lower()
-    
-    for child in creds.get("children", []):
-        if child["name"].lower() == name_lower:
-            return child["name"]
-        
-        for alias in child.get("aliases", []):
-            if alias.lower() == name_lower:
-                return child["name"]
-    
-    return name
+    from .child_registry import child_registry
+    return child_registry.resolve(name)
 
 
 def list_children() -> List[Dict]:
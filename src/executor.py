@@ -0,0 +1,91 @@
+"""Executor layer - keeps blocking file I/O and CPU work off the asyncio event loop.
+
+All MCP requests and the stdio transport share one event loop, so handlers
+must not call pickle/json/reportlab directly. Instead:
+
+- run_io() for file access and other blocking calls (thread pool)
+- run_cpu() for heavy rendering/analysis (process pool if configured,
+  otherwise the thread pool)
+"""
+import asyncio
+import contextvars
+import functools
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .config import config
+
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_cpu_executor: Optional[ProcessPoolExecutor] = None
+_pool_sizes = (0, 0)
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get (or create) the shared I/O thread pool"""
+    global _io_executor, _pool_sizes
+    if _io_executor is None:
+        _pool_sizes = (config.io_workers, config.cpu_workers)
+        _io_executor = ThreadPoolExecutor(
+            max_workers=config.io_workers,
+            thread_name_prefix="librus-io"
+        )
+    return _io_executor
+
+
+def get_cpu_executor() -> Executor:
+    """Get the CPU executor - a process pool, or the I/O pool if cpu_workers is 0"""
+    global _cpu_executor
+    if config.cpu_workers <= 0:
+        return get_io_executor()
+    if _cpu_executor is None:
+        _cpu_executor = ProcessPoolExecutor(max_workers=config.cpu_workers)
+    return _cpu_executor
+
+
+async def run_io(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking call in the I/O thread pool (in the caller's context - e.g. its tenant)"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_io_executor(), functools.partial(context.run, func, *args, **kwargs))
+
+
+async def run_cpu(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run CPU-heavy work in the CPU executor.
+
+    With a process pool, func and its arguments must be picklable
+    (module-level functions, plain data).
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_cpu_executor()
+    if executor is get_io_executor():
+        return await loop.run_in_executor(executor, functools.partial(contextvars.copy_context().run, func, *args, **kwargs))
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def to_json(obj: Any) -> str:
+    """Serialize a (possibly large) tool result to indented JSON off the event loop"""
+    return await run_io(json.dumps, obj, ensure_ascii=False, indent=2, default=str)
+
+
+def shutdown(wait: bool = True):
+    """Shut down executors (called on server exit)"""
+    global _io_executor, _cpu_executor
+    if _io_executor is not None:
+        _io_executor.shutdown(wait=wait)
+        _io_executor = None
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=wait)
+        _cpu_executor = None
+
+
+def _on_config_reload(_config):
+    """Recreate pools lazily if their configured sizes changed"""
+    if _io_executor is not None and _pool_sizes != (config.io_workers, config.cpu_workers):
+        # In-flight work finishes on the old pools
+        shutdown(wait=False)
+
+
+config.subscribe(_on_config_reload)
@@ -0,0 +1,296 @@
+"""Grade analytics over the school year, batched across children.
+
+analyze() loads the current (non-semester) grades of every requested
+child since the start of the school year - or over an explicit date
+range - into flat columns, one row per grade, and computes the
+statistics of every (child, subject) group in one pass:
+
+- weighted average (Librus weights from the grade tooltip, 1 when
+  missing; grades that don't count towards the average have weight 0
+  and are left out)
+- rolling weighted average over the last ROLLING_WINDOW grades
+- weighted least-squares slope of grade over time
+- projected semester average: the semester's grades so far plus the
+  grades still expected at the subject's pace, valued on the fitted line
+
+Column sums use NumPy when it is installed and a pure-Python fallback
+otherwise (same results). Results are cached by the children's views
+generations, so repeated calls between scrapes skip the computation.
+"""
+import functools
+import threading
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .executor import run_cpu, run_io
+from .query import query_all
+from .tenants import current_tenant
+from .views import data_generation, is_semester_category
+
+try:
+    import numpy as np
+except ImportError:  # optional - pure-Python sums are used instead
+    np = None
+
+
+ROLLING_WINDOW = 3
+
+# Fitted change over the analysed period that counts as a trend
+TREND_THRESHOLD = 0.3
+
+MIN_GRADES = 2
+
+DEFAULT_WEIGHT = 1.0
+
+# Last day (month, day) of the first semester; the second ends with June
+FIRST_SEMESTER_END = (1, 31)
+SECOND_SEMESTER_END = (6, 30)
+
+GRADE_MIN, GRADE_MAX = 1.0, 6.0
+
+CACHE_SIZE = 32
+
+
+@functools.lru_cache(maxsize=256)
+def parse_grade(grade_str: str) -> Optional[float]:
+    """Convert Polish grade string ('4', '5+', '3-') to a number"""
+    if grade_str.isdigit():
+        return int(grade_str)
+    if '+' in grade_str:
+        base = grade_str.replace('+', '')
+        if base.isdigit():
+            return int(base) + 0.5
+    elif '-' in grade_str:
+        base = grade_str.replace('-', '')
+        if base.isdigit():
+            return int(base) - 0.5
+    return None
+
+
+def parse_weight(weight) -> float:
+    """Librus weight ('3', '0' for grades not counted) as a number, DEFAULT_WEIGHT if unknown"""
+    try:
+        return max(0.0, float(str(weight).replace(',', '.')))
+    except ValueError:
+        return DEFAULT_WEIGHT
+
+
+def school_year_start(today: date) -> date:
+    return date(today.year if today.month >= 9 else today.year - 1, 9, 1)
+
+
+def semester_bounds(today: date) -> Tuple[date, date]:
+    """First and last day of the semester today falls in"""
+    start = school_year_start(today)
+    first_end = date(start.year + 1, *FIRST_SEMESTER_END)
+    if today <= first_end:
+        return start, first_end
+    return first_end + timedelta(days=1), date(start.year + 1, *SECOND_SEMESTER_END)
+
+
+def _rows(grades_by_child: Dict[str, List[Dict]], origin: date) -> Tuple[List[Tuple[str, str]], List[Tuple]]:
+    """
+    Flatten grades into rows (group, day, value, weight, original), sorted by group and day.
+
+    day counts from origin; groups index the returned (child, subject) keys.
+    """
+    keyed = []
+    for child_name, grades in grades_by_child.items():
+        for grade in grades:
+            if is_semester_category(grade.get('category') or ''):
+                continue
+            value = parse_grade(grade.get('grade') or '')
+            weight = parse_weight(grade.get('weight') or DEFAULT_WEIGHT)
+            try:
+                day = date.fromisoformat((grade.get('date') or '')[:10])
+            except ValueError:
+                continue
+            if value is None or weight <= 0:
+                continue
+            keyed.append(((child_name, grade.get('subject') or 'Unknown'), (day - origin).days, value, weight,
+                          grade.get('grade')))
+    keyed.sort(key=lambda row: (row[0], row[1]))
+
+    keys: List[Tuple[str, str]] = []
+    index: Dict[Tuple[str, str], int] = {}
+    rows = []
+    for key, day, value, weight, original in keyed:
+        if key not in index:
+            index[key] = len(keys)
+            keys.append(key)
+        rows.append((index[key], day, value, weight, original))
+    return keys, rows
+
+
+def _sums_numpy(group: Sequence[int], x: Sequence[float], y: Sequence[float], w: Sequence[float],
+                semester_from: float, n_groups: int) -> Tuple[Dict[str, List[float]], List[float]]:
+    g = np.asarray(group, dtype=np.intp)
+    x, y, w = (np.asarray(v, dtype=float) for v in (x, y, w))
+    in_semester = (x >= semester_from).astype(float)
+
+    def total(values):
+        return np.bincount(g, weights=values, minlength=n_groups).tolist()
+
+    sums = {
+        "n": total(np.ones_like(x)), "y": total(y),
+        "w": total(w), "wx": total(w * x), "wy": total(w * y),
+        "wxx": total(w * x * x), "wxy": total(w * x * y),
+        "sem_n": total(in_semester), "sem_w": total(w * in_semester), "sem_wy": total(w * y * in_semester)
+    }
+
+    # Rolling window over each group's rows (rows are sorted by group)
+    cw = np.concatenate(([0.0], np.cumsum(w)))
+    cwy = np.concatenate(([0.0], np.cumsum(w * y)))
+    idx = np.arange(len(g))
+    start = np.searchsorted(g, np.arange(n_groups))[g]
+    low = np.maximum(idx - ROLLING_WINDOW + 1, start)
+    rolling = (cwy[idx + 1] - cwy[low]) / (cw[idx + 1] - cw[low])
+    return sums, rolling.tolist()
+
+
+def _sums_python(group: Sequence[int], x: Sequence[float], y: Sequence[float], w: Sequence[float],
+                 semester_from: float, n_groups: int) -> Tuple[Dict[str, List[float]], List[float]]:
+    sums = {key: [0.0] * n_groups for key in ("n", "y", "w", "wx", "wy", "wxx", "wxy", "sem_n", "sem_w", "sem_wy")}
+    rolling = []
+    for i, (gi, xi, yi, wi) in enumerate(zip(group, x, y, w)):
+        sums["n"][gi] += 1
+        sums["y"][gi] += yi
+        sums["w"][gi] += wi
+        sums["wx"][gi] += wi * xi
+        sums["wy"][gi] += wi * yi
+        sums["wxx"][gi] += wi * xi * xi
+        sums["wxy"][gi] += wi * xi * yi
+        if xi >= semester_from:
+            sums["sem_n"][gi] += 1
+            sums["sem_w"][gi] += wi
+            sums["sem_wy"][gi] += wi * yi
+        window = [j for j in range(max(0, i - ROLLING_WINDOW + 1), i + 1) if group[j] == gi]
+        rolling.append(sum(w[j] * y[j] for j in window) / sum(w[j] for j in window))
+    return sums, rolling
+
+
+def _clip(value: float) -> float:
+    return min(GRADE_MAX, max(GRADE_MIN, value))
+
+
+def compute_analytics(grades_by_child: Dict[str, List[Dict]], today: date) -> Dict[str, Dict[str, Dict]]:
+    """
+    Per-subject statistics for each child's grades.
+
+    Module-level and pure so it can run in the CPU process pool.
+
+    Returns:
+        {child: {subject: stats}} for subjects with at least MIN_GRADES grades
+    """
+    origin = school_year_start(today)
+    semester_start, semester_end = semester_bounds(today)
+    today_x = (today - origin).days
+    semester_x = (semester_start - origin).days
+    end_x = (semester_end - origin).days
+
+    keys, rows = _rows(grades_by_child, origin)
+    analysis: Dict[str, Dict[str, Dict]] = {child_name: {} for child_name in grades_by_child}
+    if not rows:
+        return analysis
+
+    group, x, y, w, originals = (list(column) for column in zip(*rows))
+    sums_of = _sums_numpy if np is not None else _sums_python
+    sums, rolling = sums_of(group, x, y, w, semester_x, len(keys))
+
+    first_row = {}
+    for i, gi in enumerate(group):
+        first_row.setdefault(gi, i)
+
+    for gi, (child_name, subject) in enumerate(keys):
+        n = int(sums["n"][gi])
+        if n < MIN_GRADES:
+            continue
+        rows_of = range(first_row[gi], first_row[gi] + n)
+        sw, swx, swy = sums["w"][gi], sums["wx"][gi], sums["wy"][gi]
+        denominator = sw * sums["wxx"][gi] - swx * swx
+        slope = (sw * sums["wxy"][gi] - swx * swy) / denominator if abs(denominator) > 1e-9 else 0.0
+        intercept = (swy - slope * swx) / sw
+        span = x[rows_of[-1]] - x[rows_of[0]]
+        trend = slope * span
+
+        projected = None
+        sem_n, sem_w = sums["sem_n"][gi], sums["sem_w"][gi]
+        if sem_n:
+            elapsed = max(1, today_x - semester_x + 1)
+            days_left = max(0, end_x - today_x)
+            expected_weight = sem_n / elapsed * days_left * (sem_w / sem_n)
+            expected_value = _clip(intercept + slope * (today_x + days_left / 2))
+            projected = (sums["sem_wy"][gi] + expected_weight * expected_value) / (sem_w + expected_weight)
+
+        if trend > TREND_THRESHOLD:
+            direction = "IMPROVING"
+        elif trend < -TREND_THRESHOLD:
+            direction = "DECLINING"
+        else:
+            direction = "STABLE"
+
+        sequence = [originals[i] for i in rows_of]
+        analysis[child_name][subject] = {
+            "total_grades": n,
+            "average": round(sums["y"][gi] / n, 2),
+            "weighted_average": round(swy / sw, 2),
+            "rolling_average": round(rolling[rows_of[-1]], 2),
+            "rolling_averages": [round(rolling[i], 2) for i in rows_of][-5:],
+            "slope_per_month": round(slope * 30, 2),
+            "trend_value": round(trend, 2),
+            "trend_direction": direction,
+            "projected_semester_average": round(projected, 2) if projected is not None else None,
+            "semester_ends": semester_end.isoformat(),
+            "recent_grades": sequence[-5:],
+            "grade_sequence": " → ".join(sequence)
+        }
+    return analysis
+
+
+# (tenant, children's generations, range, today) -> analysis
+_cache: Dict[Tuple, Dict] = {}
+_cache_lock = threading.Lock()
+
+
+def _generations(child_names: List[str]) -> Tuple:
+    """The children's views generations - they change with every stored scrape"""
+    return tuple((child_name, data_generation(child_name)) for child_name in child_names)
+
+
+def _load_grades(child_names: List[str], date_from: str, date_to: Optional[str]) -> Dict[str, List[Dict]]:
+    return {
+        child_name: query_all(child_name, 'grades', date_from, date_to,
+                              fields=['subject', 'grade', 'date', 'category', 'weight'])
+        for child_name in child_names
+    }
+
+
+async def analyze(child_names: List[str], date_from: Optional[str] = None, date_to: Optional[str] = None,
+                  today: Optional[date] = None) -> Dict[str, Dict[str, Dict]]:
+    """
+    Grade analytics for several children at once (default: this school year).
+
+    Returns:
+        {child: {subject: stats}}
+    """
+    today = today or date.today()
+    date_from = date_from or school_year_start(today).isoformat()
+    key = (current_tenant(), await run_io(_generations, child_names), date_from, date_to, today)
+    with _cache_lock:
+        if key in _cache:
+            return _cache[key]
+
+    grades_by_child = await run_io(_load_grades, child_names, date_from, date_to)
+    analysis = await run_cpu(compute_analytics, grades_by_child, today)
+
+    with _cache_lock:
+        if len(_cache) >= CACHE_SIZE:
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = analysis
+    return analysis
+
+
+def clear_cache():
+    """Forget cached results (tests)"""
+    with _cache_lock:
+        _cache.clear()
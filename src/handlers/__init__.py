@@ -0,0 +1 @@
+"""MCP tool handlers grouped by domain. Modules are imported lazily by src.tools."""
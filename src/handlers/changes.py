@@ -0,0 +1,23 @@
+"""Handler for the change log"""
+from typing import Dict
+
+from ..change_log import changes_since
+from ..credentials import resolve_child_name
+from ..executor import run_io, to_json
+
+
+async def handle_get_changes(arguments: Dict) -> str:
+    """Records added, modified or removed since a sequence number"""
+    try:
+        child_name = resolve_child_name(arguments["child_name"])
+        result = await run_io(
+            changes_since,
+            child_name,
+            arguments["since_seq"],
+            arguments.get("kinds"),
+            arguments["limit"]
+        )
+        result["child_name"] = child_name
+        return await to_json(result)
+    except Exception as e:
+        return f"Error reading changes: {str(e)}"
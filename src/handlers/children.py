@@ -0,0 +1,25 @@
+"""Handlers for child listing"""
+from typing import Dict
+
+from ..credentials import list_children
+from ..executor import run_io
+from ..storage import load_state
+
+
+async def handle_list_children(arguments: Dict) -> str:
+    """List configured children with their last scan dates"""
+    children = list_children()
+    result = "📚 Configured children:\n\n"
+    
+    for child in children:
+        name = child["name"]
+        aliases = child.get("aliases", [])
+        state = await run_io(load_state, name)
+        last_scan = state.get("last_scrape_iso", "Never")
+        
+        result += f"- **{name}**"
+        if aliases:
+            result += f" (aliases: {', '.join(aliases)})"
+        result += f"\n  Last scan: {last_scan}\n"
+    
+    return result
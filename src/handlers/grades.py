@@ -0,0 +1,57 @@
+"""Handlers for grades summaries and trend analysis"""
+from typing import Dict
+
+from ..credentials import list_children, resolve_child_name
+from ..executor import run_io, to_json
+from ..grade_analytics import analyze
+from ..views import get_views
+
+
+async def handle_analyze_grade_trends(arguments: Dict) -> str:
+    """Weighted averages, trends and semester projections per subject (one child or all)"""
+    try:
+        if arguments.get("child_name"):
+            child_names = [resolve_child_name(arguments["child_name"])]
+        else:
+            child_names = [child["name"] for child in list_children()]
+        
+        analysis = await analyze(child_names, arguments.get("date_from"), arguments.get("date_to"))
+        if len(child_names) == 1:
+            analysis = analysis[child_names[0]]
+            if not analysis:
+                return f"No grades to analyze for {child_names[0]}"
+        
+        return await to_json(analysis)
+    except Exception as e:
+        return f"Error analyzing trends: {str(e)}"
+
+
+async def handle_get_grades_summary(arguments: Dict) -> str:
+    """Get grades summary for a child (recent grades, averages, trends)"""
+    child_name = arguments["child_name"]
+    try:
+        views = await run_io(get_views, child_name, arguments.get("date_from"), arguments.get("date_to"))
+        if not views["has_data"]:
+            return f"No recent data found for {child_name}"
+        
+        grades = views["grades"]
+        current_grades = grades["current"]
+        summary = {
+            "total_current_grades": len(current_grades),
+            "recent_current_grades": current_grades[-10:],
+            "semester_grades": grades["semester"],
+            "subjects": grades["subjects"]
+        }
+        
+        # Add descriptive grade if exists (for primary school)
+        descriptive_grade = grades["descriptive_grade"]
+        if descriptive_grade:
+            summary["descriptive_grade"] = {
+                "text": descriptive_grade,
+                "length": len(descriptive_grade),
+                "note": "Ocena opisowa dla ucznia szkoły podstawowej"
+            }
+        
+        return await to_json(summary)
+    except Exception as e:
+        return f"Error getting grades: {str(e)}"
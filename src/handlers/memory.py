@@ -0,0 +1,74 @@
+"""Handlers for memory, notes and analysis summaries"""
+import json
+from datetime import datetime
+from typing import Dict
+
+from ..credentials import resolve_child_name
+from ..executor import run_io, to_json
+from ..storage import (
+    load_memory, load_analysis_summary, save_analysis_summary
+)
+from ..memory import add_memory_entry, format_memory
+
+
+ANALYSIS_TYPE_KEYS = {
+    "issue": "issues",
+    "action_item": "action_items",
+    "parent_note": "parent_notes",
+}
+
+
+async def handle_get_memory(arguments: Dict) -> str:
+    """Get stored memory and trends for a child"""
+    memory = await run_io(load_memory, arguments["child_name"])
+    return format_memory(memory)
+
+
+async def handle_save_analysis(arguments: Dict) -> str:
+    """Save an insight or note to child's memory"""
+    child_name = arguments["child_name"]
+    analysis_type = arguments["analysis_type"]
+    
+    entry = {
+        "content": arguments["content"],
+        "timestamp": datetime.now().isoformat()
+    }
+    await run_io(add_memory_entry, child_name, ANALYSIS_TYPE_KEYS[analysis_type], entry)
+    
+    return f"✅ Saved {analysis_type} for {resolve_child_name(child_name)}"
+
+
+async def handle_get_analysis_summary(arguments: Dict) -> str:
+    """Get agent's previous analysis summary for a child"""
+    child_name = arguments["child_name"]
+    try:
+        summary = await run_io(load_analysis_summary, child_name)
+        if summary:
+            return await to_json(summary)
+        return f"No analysis summary found for {child_name}"
+    except Exception as e:
+        return f"Error loading analysis summary: {str(e)}"
+
+
+async def handle_save_analysis_summary(arguments: Dict) -> str:
+    """Save agent's analysis summary for a child"""
+    child_name = arguments["child_name"]
+    summary_text = arguments["summary_text"]
+    try:
+        # Parse the summary text as JSON or create structured summary
+        try:
+            summary = json.loads(summary_text)
+        except json.JSONDecodeError:
+            # If not JSON, create structured summary
+            summary = {
+                "timestamp": datetime.now().isoformat(),
+                "analysis": summary_text,
+                "key_points": [],
+                "action_items": [],
+                "concerns": []
+            }
+        
+        await run_io(save_analysis_summary, child_name, summary)
+        return f"Analysis summary saved for {child_name}"
+    except Exception as e:
+        return f"Error saving analysis summary: {str(e)}"
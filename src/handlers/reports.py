@@ -0,0 +1,151 @@
+"""Handlers for PDF and family reports"""
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from ..credentials import list_children
+from ..executor import run_io
+from ..report_renderer import render_pdf_async
+from ..tenants import current_tenant
+from ..views import data_generation, get_views, homework_due_on
+
+
+async def handle_generate_pdf_report(arguments: Dict) -> str:
+    """Generate PDF report from markdown content and save to file"""
+    documents = list(arguments.get("reports") or [])
+    if arguments.get("content"):
+        documents.insert(0, arguments["content"])
+    
+    if not any(documents):
+        return "Error: No content provided for PDF generation"
+    
+    try:
+        output_path = await render_pdf_async(documents, arguments["output_path"])
+        return f"PDF report generated successfully: {output_path}"
+    except Exception as e:
+        return f"Error generating PDF: {str(e)}"
+
+
+# (tenant, report_type, day, per-child data generations) -> report
+_family_reports: Dict[Tuple, str] = {}
+_family_reports_lock = threading.Lock()
+
+FAMILY_REPORT_CACHE_SIZE = 8
+
+
+def child_section(child_name: str, now: datetime) -> Tuple[str, List[str]]:
+    """
+    One child's part of the family report and its urgent items (blocking, run via executor).
+    
+    Read from the materialized views - no month files are opened or re-parsed.
+    """
+    try:
+        tomorrow = (now + timedelta(days=1)).strftime('%Y-%m-%d')
+        urgent_hw = homework_due_on(get_views(child_name), tomorrow)
+        
+        urgent_items = [
+            f"**[{child_name.upper()}]** - ZADANIE JUTRO! {hw.get('subject', 'Unknown')} - {hw.get('title', 'sprawdź czy zrobione!')}"
+            for hw in urgent_hw
+        ]
+        
+        section = f"## {child_name.upper()}\n\n"
+        section += f"### PILNE ACTION POINTS\n"
+        
+        # Add homework analysis
+        if urgent_hw:
+            for hw in urgent_hw:
+                section += f"- ZADANIE JUTRO: {hw.get('subject')} - {hw.get('title')}\n"
+        else:
+            section += "- Brak pilnych zadań na jutro\n"
+        
+        section += f"\n### OSTATNIE OCENY\n"
+        section += "*(Analiza trendów dostępna przez analyze_grade_trends)*\n\n"
+        
+        section += f"### NADCHODZĄCE WYDARZENIA\n"
+        section += "*(Sprawdziany i wydarzenia na 14 dni)*\n\n"
+        
+        section += "---\n\n"
+        return section, urgent_items
+    except Exception as e:
+        return f"## {child_name.upper()} - Błąd pobierania danych: {str(e)}\n\n", []
+
+
+def compose_family_report(report_date: str, sections: List[Tuple[str, List[str]]]) -> str:
+    """Join per-child sections and add the family summary"""
+    report = f"# RAPORT RODZINNY - {report_date}\n\n"
+    
+    urgent_items = []
+    for section, items in sections:
+        report += section
+        urgent_items.extend(items)
+    
+    # Add family summary
+    report += "## WSPÓLNE DLA WSZYSTKICH\n\n"
+    
+    if urgent_items:
+        report += "### PILNE NA DZIŚ/JUTRO\n"
+        for item in urgent_items:
+            report += f"- {item}\n"
+        report += "\n"
+    
+    report += "### PŁATNOŚCI DO SPRAWDZENIA\n"
+    report += "- Obiady szkolne\n"
+    report += "- Składki klasowe\n"
+    report += "- Wycieczki\n\n"
+    
+    report += "### ZAKUPY WEEKEND\n"
+    report += "- Materiały szkolne\n"
+    report += "- Stroje na wydarzenia\n\n"
+    
+    report += "### PODSUMOWANIE NA LODÓWKĘ\n"
+    if urgent_items:
+        report += "**PILNE:**\n"
+        for item in urgent_items[:3]:  # Max 3 items for fridge
+            report += f"• {item.replace('**', '').replace('[', '').replace(']', '')}\n"
+    else:
+        report += "• Wszystko pod kontrolą!\n"
+    
+    return report
+
+
+def _generation_or_none(child_name: str):
+    try:
+        return data_generation(child_name)
+    except Exception:
+        return None
+
+
+async def build_family_report(report_type: str, now: Optional[datetime] = None) -> str:
+    """
+    Family report for all children, memoized per day until any child's data changes.
+    
+    Per-child sections are read concurrently; a child whose data can't be
+    read gets an error line and the report isn't memoized.
+    """
+    now = now or datetime.now()
+    names = [child['name'] for child in list_children()]
+    
+    generations = await asyncio.gather(*(run_io(_generation_or_none, name) for name in names))
+    key = (current_tenant(), report_type, now.date(), tuple(zip(names, generations)))
+    with _family_reports_lock:
+        if key in _family_reports:
+            return _family_reports[key]
+    
+    sections = await asyncio.gather(*(run_io(child_section, name, now) for name in names))
+    report = compose_family_report(now.strftime("%d.%m.%Y"), sections)
+    
+    if None not in generations:
+        with _family_reports_lock:
+            if len(_family_reports) >= FAMILY_REPORT_CACHE_SIZE:
+                _family_reports.pop(next(iter(_family_reports)))
+            _family_reports[key] = report
+    return report
+
+
+async def handle_generate_family_report(arguments: Dict) -> str:
+    """Generate comprehensive family report with all children"""
+    try:
+        return await build_family_report(arguments["report_type"])
+    except Exception as e:
+        return f"Error generating family report: {str(e)}"
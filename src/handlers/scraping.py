@@ -0,0 +1,273 @@
+"""Handlers for scraping and login - the only place Playwright is needed.
+
+Playwright is imported inside the functions that launch a browser so that
+loading this module (and starting the server) stays cheap. Scrapes run in
+contexts of the shared browser (browser_pool), in turns per tenant
+(scrape_scheduler); manual login opens its own visible browser.
+"""
+import sys
+from datetime import datetime, timedelta
+from typing import Dict
+
+from ..config import config, Colors
+from ..credentials import resolve_child_name
+from ..executor import run_io
+from ..storage import get_context_dir, load_state
+from ..checkpoints import Checkpointer, is_resumed, start_progress
+from ..markdown_renderer import write_latest_from_store
+from ..scraper import scrape_librus_data
+from ..browser_pool import browser_pool
+from ..scrape_scheduler import scheduler
+from ..tenants import current_tenant
+from .. import rate_limiter, resource_policy
+
+
+# ============================================================================
+# BROWSER CONTEXT
+# ============================================================================
+
+async def get_browser_context(child_name: str, browser):
+    """
+    Get or create browser context with auto-login.
+    
+    Tries to use saved cookies, but if login fails, opens browser for manual login.
+    """
+    context_dir = get_context_dir(child_name)
+    cookies_file = context_dir / "cookies.json"
+    
+    # Try with cookies if they exist
+    if cookies_file.exists():
+        print(f"{Colors.CYAN}[{child_name}] Trying auto-login with saved session{Colors.ENDC}")
+        context = await browser.new_context(storage_state=str(cookies_file))
+        page = await context.new_page()
+        
+        try:
+            # Test if cookies are still valid - fail fast
+            await page.goto('https://synergia.librus.pl/rodzic/index', timeout=3000, wait_until='domcontentloaded')
+            
+            # Check if we're actually logged in (not redirected to login page)
+            current_url = page.url
+            if '/loguj' in current_url or '/login' in current_url:
+                print(f"{Colors.YELLOW}Session expired{Colors.ENDC}")
+                await page.close()
+                await context.close()
+                cookies_file.unlink()
+                return None
+            else:
+                print(f"{Colors.GREEN}Auto-login successful{Colors.ENDC}")
+                await page.close()
+                return context
+                
+        except Exception as e:
+            print(f"{Colors.YELLOW}Auto-login failed: {e}{Colors.ENDC}")
+            await page.close()
+            await context.close()
+            cookies_file.unlink()
+            return None
+    
+    # No valid session - return None (don't auto-open browser)
+    return None
+
+
+# ============================================================================
+# MAIN SCRAPING FUNCTION
+# ============================================================================
+
+def session_expired(child_name: str, force_full: bool, message: str) -> Dict:
+    """Result of a scrape that needs manual_login first"""
+    print(f"\n{Colors.BOLD}{Colors.RED}Session expired for {child_name}{Colors.ENDC}")
+    print(f"{Colors.YELLOW}Use manual_login tool to refresh login session.{Colors.ENDC}\n")
+    return {
+        "status": "session_expired",
+        "child_name": child_name,
+        "message": message,
+        "mode": "full" if force_full else "delta",
+        "stats": {}
+    }
+
+
+async def scrape_librus(child_name: str, force_full: bool = False) -> Dict:
+    """
+    Scrape Librus data for a child.
+    
+    Args:
+        child_name: Child name or alias
+        force_full: If True, scrape all data. If False, only new data since last scrape.
+        
+    Returns:
+        Dict with markdown, stats, sections, network, grade_changes, mode, and child_name
+    """
+    try:
+        state = await run_io(load_state, child_name)
+        last_scrape_raw = state.get("last_scrape_iso")
+        is_first = last_scrape_raw is None or force_full
+        
+        # For DELTA mode: go back to 23:59:59 of the day before last scrape
+        # This ensures we capture all data from the day of last scrape
+        last_scrape = None
+        if not is_first and last_scrape_raw:
+            last_dt = datetime.strptime(last_scrape_raw, "%Y-%m-%d %H:%M:%S")
+            # Go back to previous day at 23:59:59
+            delta_start = (last_dt.date() - timedelta(days=1))
+            last_scrape = f"{delta_start} 23:59:59"
+        
+        mode = "FULL" if is_first else f"DELTA since {last_scrape}"
+        
+        # Finished units of an interrupted scrape of the same kind are skipped
+        progress = start_progress(state, is_first, last_scrape, datetime.now())
+        checkpointer = Checkpointer(child_name, state, progress, "delta" if not force_full else "full")
+        if is_resumed(progress):
+            mode += f" (resumed from {progress['started']})"
+        
+        print(f"\n{Colors.BOLD}{'='*60}{Colors.ENDC}")
+        print(f"{Colors.BOLD}{Colors.HEADER}{child_name} - {mode}{Colors.ENDC}")
+        print(f"{Colors.BOLD}{'='*60}{Colors.ENDC}\n")
+        
+        # Without a saved session there is nothing to scrape headless
+        if not (get_context_dir(child_name) / "cookies.json").exists():
+            return session_expired(child_name, force_full, "Session expired. Manual login required.")
+        
+        # Wait for this tenant's turn, then scrape in a context of the shared browser
+        async with scheduler.slot(current_tenant()):
+            browser = await browser_pool.browser()
+            context = await get_browser_context(child_name, browser)
+            if context is None:
+                return session_expired(child_name, force_full, "Session expired. Manual login required.")
+            
+            try:
+                # Images, fonts and stylesheets are aborted - the extractors only read the DOM
+                network = await resource_policy.install(context)
+                page = await context.new_page()
+            
+                print(f"{Colors.BLUE}Navigating to Librus...{Colors.ENDC}")
+                grades_url = 'https://synergia.librus.pl/przegladaj_oceny/uczen'
+                async with rate_limiter.request(grades_url) as outcome:
+                    response = await page.goto(grades_url, timeout=config.page_timeout_ms, wait_until='domcontentloaded')
+                    outcome.status = response.status if response else None
+                await resource_policy.wait_for_grades_page(page)
+                print(f"{Colors.GREEN}Page loaded{Colors.ENDC}")
+            
+                print(f"{Colors.BLUE}Running scraper...{Colors.ENDC}")
+                try:
+                    result = await scrape_librus_data(page, last_scrape, is_first, checkpointer)
+                except Exception as e:
+                    # Check if it's a session expired error
+                    if "SESSION_EXPIRED" in str(e):
+                        return session_expired(child_name, force_full,
+                                               "Session expired during scraping. Manual login required.")
+                    else:
+                        raise
+            
+                print(f"{Colors.GREEN}Scraping complete{Colors.ENDC}")
+                for name, section in result.get("sections", {}).items():
+                    color = Colors.GREEN if section.get("status") == "ok" else Colors.RED
+                    error = f" - {section['error']}" if section.get("error") else ""
+                    print(f"{color}  {name}: {section.get('status')} in {section.get('ms')} ms{error}{Colors.ENDC}", file=sys.stderr)
+                network_report = network.report()
+                print(
+                    f"{Colors.CYAN}  network: {network_report['requests']} requests, {network_report['bytes'] // 1024} KiB "
+                    f"in {network_report['elapsed_ms']} ms, blocked {network_report['blocked_total']} "
+                    f"{network_report['blocked']}{Colors.ENDC}",
+                    file=sys.stderr
+                )
+                for host, limiter in rate_limiter.snapshot().items():
+                    print(f"{Colors.CYAN}  rate limit {host}: {limiter['rate_rps']} req/s, "
+                          f"{limiter['requests']} requests, {limiter['errors']} errors{Colors.ENDC}", file=sys.stderr)
+                if checkpointer.dedup.rejected or checkpointer.dedup.duplicates:
+                    print(f"{Colors.YELLOW}  ingest: {checkpointer.dedup.rejected} malformed records dropped, "
+                          f"{checkpointer.dedup.duplicates} duplicates skipped{Colors.ENDC}", file=sys.stderr)
+            
+                # Records (and grade history) were stored batch by batch while
+                # scraping; store stats/sections, refresh views, move the watermark
+                if not await run_io(checkpointer.finish, result):
+                    print(f"{Colors.YELLOW}  sections failed - the next scrape resumes them{Colors.ENDC}", file=sys.stderr)
+                grade_changes = await run_io(checkpointer.grade_changes)
+                if grade_changes:
+                    print(f"{Colors.CYAN}  grades: {grade_changes.get('added', 0)} new, "
+                          f"{grade_changes.get('modified', 0)} changed, "
+                          f"{grade_changes.get('removed', 0)} retracted{Colors.ENDC}", file=sys.stderr)
+            
+                # latest.md from the stored recent months, re-rendering only changed sections
+                markdown = await run_io(write_latest_from_store, child_name, result["rawData"].get("collectionDate", ""))
+            
+                return {
+                    "markdown": markdown,
+                    "stats": result["stats"],
+                    "sections": result.get("sections", {}),
+                    "network": network_report,
+                    "grade_changes": grade_changes,
+                    "mode": mode,
+                    "child_name": resolve_child_name(child_name)
+                }
+            finally:
+                await context.close()
+            
+    except Exception as e:
+        print(f"\n{Colors.BOLD}{Colors.RED}Error: {str(e)}{Colors.ENDC}\n")
+        print(f"{Colors.YELLOW}Finished sections are saved - retrying resumes the scrape.{Colors.ENDC}\n", file=sys.stderr)
+        raise e
+
+
+# ============================================================================
+# TOOL HANDLERS
+# ============================================================================
+
+async def handle_scrape_librus(arguments: Dict) -> str:
+    """Scrape Librus data for a child"""
+    result = await scrape_librus(arguments["child_name"], arguments["force_full"])
+    
+    if result.get("status") == "session_expired":
+        return f"❌ Session expired for {result['child_name']}. Use manual_login tool to refresh."
+    
+    failed = {name: section.get("error") for name, section in result.get("sections", {}).items()
+              if section.get("status") != "ok"}
+    warning = f"\n⚠️ Sections failed: {failed} - scrape again to resume them" if failed else ""
+    
+    grade_changes = result.get("grade_changes")
+    if grade_changes:
+        warning += (f"\n📊 Grades: {grade_changes.get('added', 0)} new, {grade_changes.get('modified', 0)} changed, "
+                    f"{grade_changes.get('removed', 0)} retracted (details: get_changes)")
+    
+    return f"✅ Scraped {result['stats']} for {result['child_name']}{warning}\n\n{result['markdown'][:1000]}..."
+
+
+async def handle_manual_login(arguments: Dict) -> str:
+    """Open a visible browser so the parent can log in and save the session"""
+    child_name = arguments["child_name"]
+    try:
+        # Remove old cookies to force manual login
+        context_dir = get_context_dir(child_name)
+        cookies_file = context_dir / "cookies.json"
+        if cookies_file.exists():
+            cookies_file.unlink()
+        
+        # Show clear message about which child is being logged in
+        print(f"\n{Colors.BOLD}{Colors.YELLOW}=== MANUAL LOGIN FOR {child_name.upper()} ==={Colors.ENDC}")
+        print(f"{Colors.YELLOW}Opening browser for {child_name} login only.{Colors.ENDC}")
+        print(f"{Colors.YELLOW}Please log in as parent for {child_name} and close browser when done.{Colors.ENDC}\n")
+        
+        # Do a minimal login-only scrape
+        from playwright.async_api import async_playwright
+        
+        async with async_playwright() as p:
+            browser = await p.webkit.launch(headless=False)
+            
+            context = await browser.new_context()
+            page = await context.new_page()
+            
+            await page.goto('https://portal.librus.pl/rodzina/synergia/loguj')
+            print(f"{Colors.YELLOW}Waiting for login for {child_name}...{Colors.ENDC}")
+            
+            # Wait for successful login
+            await page.wait_for_url(lambda url: '/rodzic' in url, timeout=300000)  # 5 min timeout
+            print(f"{Colors.GREEN}Login successful for {child_name}!{Colors.ENDC}")
+            
+            # Save cookies
+            await context.storage_state(path=str(cookies_file))
+            
+            await context.close()
+            await browser.close()
+        
+        return f"Manual login completed for {child_name}. Session saved. You can now scrape data."
+    except Exception as e:
+        return f"Manual login failed for {child_name}: {str(e)}"
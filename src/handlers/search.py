@@ -0,0 +1,44 @@
+"""Handler for full-text search"""
+from typing import Dict
+
+from ..credentials import list_children, resolve_child_name
+from ..executor import run_io, to_json
+from ..search_index import count_matches, search
+
+
+def search_children(arguments: Dict) -> Dict:
+    """Run the search for one child or all children (blocking, run via executor)"""
+    if arguments.get("child_name"):
+        names = [resolve_child_name(arguments["child_name"])]
+    else:
+        names = [child["name"] for child in list_children()]
+    
+    filters = {
+        "kinds": arguments.get("kinds"),
+        "date_from": arguments.get("date_from"),
+        "date_to": arguments.get("date_to")
+    }
+    results = []
+    total = 0
+    for name in names:
+        for hit in search(name, arguments["query"], limit=arguments["limit"], **filters):
+            hit["child_name"] = name
+            results.append(hit)
+        total += count_matches(name, arguments["query"], **filters)
+    
+    results.sort(key=lambda hit: hit["score"])
+    results = results[:arguments["limit"]]
+    return {
+        "query": arguments["query"],
+        "total": total,
+        "returned": len(results),
+        "results": results
+    }
+
+
+async def handle_search(arguments: Dict) -> str:
+    """Full-text search over messages, announcements, remarks and homework"""
+    try:
+        return await to_json(await run_io(search_children, arguments))
+    except Exception as e:
+        return f"Error searching: {str(e)}"
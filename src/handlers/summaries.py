@@ -0,0 +1,163 @@
+"""Handlers for homework, remarks, messages, calendar and raw data summaries"""
+from typing import Dict
+
+from ..blob_store import with_content
+from ..classifier import classify_months
+from ..executor import run_io, to_json
+from ..query import query_all
+from ..storage import (
+    load_state, save_state, get_recent_months_data, extract_records, with_message_bodies
+)
+from ..views import get_views, homework_buckets, upcoming_events
+
+
+async def handle_get_recent_data(arguments: Dict) -> str:
+    """Get recent months data for analysis"""
+    child_name = arguments["child_name"]
+    months_back = arguments["months_back"]
+    try:
+        data = await run_io(get_recent_months_data, child_name, months_back)
+        if data:
+            data = await run_io(with_message_bodies, child_name, data)
+            # Convert to JSON for agent consumption
+            return await to_json(data)
+        return f"No recent data found for {child_name}"
+    except Exception as e:
+        return f"Error loading recent data: {str(e)}"
+
+
+async def handle_get_homework_summary(arguments: Dict) -> str:
+    """Get homework assignments and deadlines for a child"""
+    child_name = arguments["child_name"]
+    try:
+        date_from, date_to = arguments.get("date_from"), arguments.get("date_to")
+        views = await run_io(get_views, child_name, date_from, date_to)
+        if not views["has_data"]:
+            return f"No recent data found for {child_name}"
+        
+        # Buckets (overdue, tomorrow, this week, 14 days) cut from the due-date index
+        summary = homework_buckets(views)
+        if date_from or date_to:
+            summary["homework"] = views["homework"]["by_due"] + views["homework"]["undated"]
+        
+        return await to_json(summary)
+    except Exception as e:
+        return f"Error getting homework: {str(e)}"
+
+
+async def handle_get_remarks_summary(arguments: Dict) -> str:
+    """Get teacher remarks and notes for a child"""
+    child_name = arguments["child_name"]
+    try:
+        views = await run_io(get_views, child_name, arguments.get("date_from"), arguments.get("date_to"))
+        if not views["has_data"]:
+            return f"No recent data found for {child_name}"
+        
+        remarks = views["remarks"]
+        summary = {
+            "total_remarks": remarks["total"],
+            "recent_remarks": remarks["recent"],  # Last 5
+            "positive": remarks["positive"],
+            "negative": remarks["negative"],
+            "neutral": remarks["neutral"]
+        }
+        
+        return await to_json(summary)
+    except Exception as e:
+        return f"Error getting remarks: {str(e)}"
+
+
+async def handle_get_messages_summary(arguments: Dict) -> str:
+    """Get messages from teachers for a child"""
+    child_name = arguments["child_name"]
+    try:
+        date_from, date_to = arguments.get("date_from"), arguments.get("date_to")
+        
+        # Load state to check last analysis time
+        state = await run_io(load_state, child_name)
+        last_analysis = state.get("last_messages_analysis")
+        
+        if date_from or date_to:
+            all_messages = await run_io(query_all, child_name, 'messages', date_from, date_to)
+        else:
+            data = await run_io(get_recent_months_data, child_name, 2)
+            if not data:
+                return f"No recent data found for {child_name}"
+            
+            # Months saved before classification existed (or with other keywords) get tagged here
+            all_messages = extract_records(classify_months(data, child_name), 'messages')
+        
+        # Sort by date
+        all_messages_sorted = sorted(all_messages, key=lambda x: x.get('date', ''), reverse=True)
+        
+        # Filter messages based on last analysis time
+        if date_from or date_to:
+            # Explicit range - everything in it, analysis state untouched
+            messages_to_analyze = all_messages_sorted
+            mode = f"RANGE {date_from or '…'} to {date_to or '…'}"
+        elif last_analysis:
+            # DELTA mode - only new messages since last analysis
+            messages_to_analyze = [
+                msg for msg in all_messages_sorted
+                if msg.get('date', '') > last_analysis
+            ]
+            mode = f"DELTA since {last_analysis}"
+        else:
+            # First time - return all messages
+            messages_to_analyze = all_messages_sorted
+            mode = "FULL (first analysis)"
+        
+        # Bodies are loaded from the blob store only for the messages returned
+        messages_to_analyze = await run_io(with_content, child_name, messages_to_analyze)
+        
+        # Check for unread or requiring response
+        unread = [msg for msg in messages_to_analyze if msg.get('isNew', False)]
+        
+        # Tagged at ingest by the classifier (keywords in content or subject)
+        requiring_response = [msg for msg in messages_to_analyze if msg.get('requires_response')]
+        
+        # Update state with current analysis time
+        if messages_to_analyze and not (date_from or date_to):
+            # Use the newest message date as last_analysis time
+            state["last_messages_analysis"] = all_messages_sorted[0].get('date', '')
+            await run_io(save_state, child_name, state)
+        
+        summary = {
+            "mode": mode,
+            "total_messages_in_system": len(all_messages),
+            "new_messages": len(messages_to_analyze),
+            "messages": messages_to_analyze,
+            "unread_count": len(unread),
+            "unread_messages": unread,
+            "requiring_response_count": len(requiring_response),
+            "requiring_response": requiring_response
+        }
+        
+        return await to_json(summary)
+    except Exception as e:
+        return f"Error getting messages: {str(e)}"
+
+
+async def handle_get_calendar_events(arguments: Dict) -> str:
+    """Get upcoming calendar events for a child"""
+    child_name = arguments["child_name"]
+    try:
+        date_from, date_to = arguments.get("date_from"), arguments.get("date_to")
+        views = await run_io(get_views, child_name, date_from, date_to)
+        if not views["has_data"]:
+            return f"No recent data found for {child_name}"
+        
+        if date_from or date_to:
+            summary = {
+                "total_events": views["calendar"]["total"],
+                "events": views["calendar"]["by_date"] + views["calendar"]["undated"]
+            }
+        else:
+            summary = {
+                "total_events": views["calendar"]["total"],
+                "upcoming_14_days": upcoming_events(views)
+            }
+        
+        return await to_json(summary)
+    except Exception as e:
+        return f"Error getting calendar: {str(e)}"
@@ -0,0 +1,49 @@
+"""Handlers for parent tasks and checkoffs"""
+from datetime import datetime
+from typing import Dict
+
+from ..executor import run_io, to_json
+from ..storage import child_lock, load_tasks, save_tasks
+
+
+def complete_task(child_name: str, task_id: str, notes: str):
+    """Move a task to completed under the child lock (blocking, run via executor)"""
+    with child_lock(child_name):
+        tasks = load_tasks(child_name) or {"completed": [], "pending": []}
+        
+        # Add to completed with timestamp
+        completed_task = {
+            "task_id": task_id,
+            "completed_at": datetime.now().isoformat(),
+            "notes": notes
+        }
+        tasks.setdefault("completed", []).append(completed_task)
+        
+        # Remove from pending if exists
+        tasks["pending"] = [t for t in tasks.get("pending", []) if t.get("id") != task_id]
+        
+        save_tasks(child_name, tasks)
+
+
+async def handle_mark_task_done(arguments: Dict) -> str:
+    """Mark a task as completed by parent"""
+    child_name = arguments["child_name"]
+    task_id = arguments["task_id"]
+    notes = arguments.get("notes", "")
+    try:
+        await run_io(complete_task, child_name, task_id, notes)
+        return f"Task {task_id} marked as completed for {child_name}"
+    except Exception as e:
+        return f"Error marking task done: {str(e)}"
+
+
+async def handle_get_pending_tasks(arguments: Dict) -> str:
+    """Get pending tasks for a child"""
+    child_name = arguments["child_name"]
+    try:
+        tasks = await run_io(load_tasks, child_name)
+        if tasks and tasks.get("pending"):
+            return await to_json(tasks["pending"])
+        return f"No pending tasks for {child_name}"
+    except Exception as e:
+        return f"Error loading tasks: {str(e)}"
@@ -0,0 +1,85 @@
+"""Validation and deduplication of record batches streamed from the page.
+
+The in-page scraper hands records to Python in small batches while it
+runs (see checkpoints.Checkpointer). Each batch is checked here before it
+is stored: malformed records are dropped and records already ingested by
+this scrape (e.g. a message seen again after the inbox shifted between
+pages) are skipped. Only signature digests are remembered, so memory
+stays bounded by the record count, not by record size.
+"""
+import hashlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .storage import RECORD_KINDS, record_signature
+
+
+# Fields a record needs to be worth storing
+REQUIRED_FIELDS = {
+    'messages': ('title', 'date'),
+    'announcements': ('title',),
+    'grades': ('subject', 'grade'),
+    'calendar': ('date', 'title'),
+    'remarks': ('content',),
+    'homework': ('subject', 'title'),
+}
+
+
+def validate_records(kind: str, items) -> Tuple[List[Dict], int]:
+    """
+    Keep well-formed records of one kind.
+
+    Returns:
+        (valid records, number rejected)
+    """
+    if kind not in RECORD_KINDS:
+        raise ValueError(f"Unknown record kind: {kind}")
+    if not isinstance(items, list):
+        return [], 1 if items else 0
+
+    required = REQUIRED_FIELDS[kind]
+    valid = [
+        item for item in items
+        if isinstance(item, dict) and all(isinstance(item.get(f), str) and item[f] for f in required)
+    ]
+    return valid, len(items) - len(valid)
+
+
+class BatchDeduplicator:
+    """Signatures of records already ingested by one scrape"""
+
+    def __init__(self):
+        self._seen = set()
+        self.counts: Dict[str, int] = {kind: 0 for kind in RECORD_KINDS}
+        self.rejected = 0
+        self.duplicates = 0
+
+    @staticmethod
+    def _digest(kind: str, item: Dict) -> bytes:
+        return hashlib.blake2b(f"{kind}\0{record_signature(kind, item)}".encode("utf-8"), digest_size=16).digest()
+
+    def seen(self, kind: str, item: Dict) -> bool:
+        """True if this scrape ingested a record with the same signature"""
+        return self._digest(kind, item) in self._seen
+
+    def fresh(self, kind: str, items, expand: Optional[Callable[[List[Dict]], List[Dict]]] = None) -> List[Dict]:
+        """
+        Valid records of a batch not seen before in this scrape.
+
+        expand turns validated records into their stored shape before the
+        signature is taken (see scraper.expand_records).
+        """
+        valid, rejected = validate_records(kind, items)
+        self.rejected += rejected
+        if expand:
+            valid = expand(valid)
+
+        fresh = []
+        for item in valid:
+            digest = self._digest(kind, item)
+            if digest in self._seen:
+                self.duplicates += 1
+                continue
+            self._seen.add(digest)
+            fresh.append(item)
+        self.counts[kind] += len(fresh)
+        return fresh
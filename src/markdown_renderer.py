@@ -0,0 +1,184 @@
+"""Markdown rendering of scraped records (latest.md).
+
+The in-page scraper only returns structured records; the markdown view is
+produced here, one section per record kind. Records are streamed into
+storage while scraping, so after a scrape latest.md is rendered from the
+stored recent months (get_recent_months_data) rather than from one
+in-memory result. The rendered text of every
+section is cached in the child's directory together with a digest of the
+records it came from, so a new scrape only re-renders the sections whose
+records changed (grades and calendar are often identical between scrapes).
+"""
+import hashlib
+import pickle
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+
+from .storage import (
+    RECORD_KINDS, atomic_write_bytes, child_lock, extract_records, get_child_dir,
+    get_recent_months_data, save_scrape_result, with_message_bodies
+)
+
+
+SECTIONS_CACHE_FILE = "latest_sections.pkl"
+
+
+def _messages(messages: List[Dict]) -> str:
+    md = f"## Messages ({len(messages)})\n\n"
+    for i, m in enumerate(messages):
+        md += f"### {'[READ]' if m.get('isRead') else '[NEW]'} {i + 1}. {m.get('title', '')}\n"
+        md += f"- **From:** {m.get('sender', '')}\n"
+        md += f"- **Date:** {m.get('date', '')}\n"
+        if m.get('attachments'):
+            md += f"- **Attachments:** {', '.join(m['attachments'])}\n"
+        md += f"\n**Content:**\n{m.get('content', '')}\n\n---\n\n"
+    return md
+
+
+def _announcements(announcements: List[Dict]) -> str:
+    md = f"## Announcements ({len(announcements)})\n\n"
+    for i, a in enumerate(announcements):
+        md += f"### {i + 1}. {a.get('title', '')}\n"
+        md += f"- **Date:** {a.get('date', '')}\n"
+        md += f"- **Author:** {a.get('author', '')}\n\n"
+        md += f"{a.get('content', '')}\n\n---\n\n"
+    return md
+
+
+def _grades(grades: List[Dict]) -> str:
+    by_subject: Dict[str, List[Dict]] = OrderedDict()
+    for g in grades:
+        by_subject.setdefault(g.get('subject', ''), []).append(g)
+
+    md = f"## Grades ({len(grades)})\n\n"
+    for subject, subject_grades in by_subject.items():
+        md += f"### {subject}\n\n"
+        for g in subject_grades:
+            md += f"- **{g.get('grade', '')}** ({g.get('category', '')}, weight: {g.get('weight', '')}) - {g.get('date', '')}\n"
+        md += "\n"
+    return md
+
+
+def _calendar(events: List[Dict]) -> str:
+    md = f"## Calendar ({len(events)})\n\n"
+    for e in events:
+        md += f"- **{e.get('date', '')}** - {e.get('title', '')} ({e.get('category', '')})\n"
+    return md
+
+
+def _homework(homework: List[Dict]) -> str:
+    md = f"## Homework ({len(homework)})\n\n"
+    for i, h in enumerate(homework):
+        md += f"### {i + 1}. {h.get('subject', '')} - {h.get('title', '')}\n"
+        md += f"- **Teacher:** {h.get('teacher', '')}\n"
+        md += f"- **Category:** {h.get('category', '')}\n"
+        md += f"- **Added:** {h.get('dateAdded', '')}\n"
+        md += f"- **Due:** {h.get('dateDue', '')}\n\n"
+    return md
+
+
+def _remarks(remarks: List[Dict]) -> str:
+    md = f"## Remarks/Notes ({len(remarks)})\n\n"
+    for i, r in enumerate(remarks):
+        md += f"### {i + 1}. {r.get('category', '')}\n"
+        md += f"- **Date:** {r.get('date', '')}\n"
+        md += f"- **Teacher:** {r.get('teacher', '')}\n"
+        md += f"- **Content:** {r.get('content', '')}\n\n"
+    return md
+
+
+# Section name -> renderer, in document order
+SECTION_RENDERERS: List[Tuple[str, Callable[[List[Dict]], str]]] = [
+    ('messages', _messages),
+    ('announcements', _announcements),
+    ('grades', _grades),
+    ('calendar', _calendar),
+    ('homework', _homework),
+    ('remarks', _remarks),
+]
+
+
+def _section_records(result: Dict, name: str) -> List[Dict]:
+    if name == 'homework':
+        return result.get('homework') or []
+    return (result.get('rawData') or {}).get(name) or []
+
+
+def _digest(records: List[Dict]) -> str:
+    return hashlib.sha1(pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+def render_sections(result: Dict, cache: Dict[str, Tuple[str, str]]) -> Tuple[Dict[str, Tuple[str, str]], int]:
+    """
+    Render every section, reusing cached text for unchanged records.
+
+    Args:
+        result: Scrape result with rawData and homework
+        cache: {section: (digest, text)} from the previous render
+
+    Returns:
+        (new cache, number of sections actually re-rendered)
+    """
+    sections = {}
+    rendered = 0
+    for name, render in SECTION_RENDERERS:
+        records = _section_records(result, name)
+        digest = _digest(records)
+        cached = cache.get(name)
+        if cached and cached[0] == digest:
+            sections[name] = cached
+        else:
+            sections[name] = (digest, render(records))
+            rendered += 1
+    return sections, rendered
+
+
+def render_markdown(child_name: str, result: Dict, sections: Dict[str, Tuple[str, str]]) -> str:
+    """Assemble the document from rendered sections"""
+    collection_date = (result.get('rawData') or {}).get('collectionDate', '')
+    header = f"# Librus Data - {child_name}\n**Collection date:** {collection_date}\n\n"
+    return header + "".join(sections[name][1] for name, _ in SECTION_RENDERERS)
+
+
+def _load_cache(child_name: str) -> Dict[str, Tuple[str, str]]:
+    path = get_child_dir(child_name) / SECTIONS_CACHE_FILE
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # A damaged cache only costs a full render
+        return {}
+
+
+def write_latest(child_name: str, result: Dict) -> str:
+    """
+    Render latest.md for a scrape result, re-rendering only changed sections.
+
+    Returns:
+        The markdown document
+    """
+    cache_file = get_child_dir(child_name) / SECTIONS_CACHE_FILE
+    with child_lock(child_name):
+        sections, _ = render_sections(result, _load_cache(child_name))
+        markdown = render_markdown(child_name, result, sections)
+        save_scrape_result(child_name, markdown)
+        atomic_write_bytes(cache_file, pickle.dumps(sections, protocol=pickle.HIGHEST_PROTOCOL))
+    return markdown
+
+
+def stored_result(child_name: str, collection_date: str = '') -> Dict:
+    """Recent stored records in scrape-result shape, message bodies loaded"""
+    months = with_message_bodies(child_name, get_recent_months_data(child_name))
+    # Newest partitions first, as the inbox lists them
+    months = dict(sorted(months.items(), reverse=True))
+    raw = {kind: extract_records(months, kind) for kind in RECORD_KINDS if kind != 'homework'}
+    raw['collectionDate'] = collection_date
+    return {'rawData': raw, 'homework': extract_records(months, 'homework')}
+
+
+def write_latest_from_store(child_name: str, collection_date: str = '') -> str:
+    """Render latest.md from the child's recent stored months"""
+    with child_lock(child_name):
+        return write_latest(child_name, stored_result(child_name, collection_date))
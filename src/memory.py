@@ -1,6 +1,7 @@
 """Memory and trend tracking"""
-from typing import Dict
-from .storage import load_memory, save_memory
+from typing import Dict, List
+from .executor import run_io
+from .storage import child_lock, grade_identity, load_memory, save_memory
 
 
 async def update_memory(child_name: str, raw_data: Dict):
@@ -9,28 +10,65 @@ async def update_memory(child_name: str, raw_data: Dict):
     
     Tracks grade history and other trends.
     """
-    memory = load_memory(child_name)
-    
-    # Update grade history
-    grade_history = memory.setdefault("grade_history", {})
+    await run_io(merge_grade_history, child_name, raw_data)
+
+
+def merge_grade_history(child_name: str, raw_data: Dict):
+    """
+    Merge scraped grades into memory.json (blocking, run via executor).
     
-    for grade in raw_data.get("grades", []):
-        subject = grade["subject"]
-        if subject not in grade_history:
-            grade_history[subject] = []
+    Entries are keyed by grade_identity, so a corrected grade updates its
+    entry instead of adding a second one.
+    """
+    with child_lock(child_name):
+        memory = load_memory(child_name)
         
-        grade_entry = {
-            "grade": grade["grade"],
-            "date": grade["date"],
-            "category": grade["category"],
-            "weight": grade["weight"]
-        }
+        # Update grade history
+        grade_history = memory.setdefault("grade_history", {})
         
-        # Avoid duplicates
-        if grade_entry not in grade_history[subject]:
-            grade_history[subject].append(grade_entry)
-    
-    save_memory(child_name, memory)
+        for grade in raw_data.get("grades", []):
+            subject = grade["subject"]
+            if subject not in grade_history:
+                grade_history[subject] = []
+            
+            grade_entry = {
+                "grade": grade["grade"],
+                "date": grade["date"],
+                "category": grade["category"],
+                "weight": grade["weight"],
+                "key": grade_identity(grade)
+            }
+            
+            entries = grade_history[subject]
+            for i, entry in enumerate(entries):
+                # Entries written before keys existed match on their values
+                same = entry.get("key") == grade_entry["key"] if "key" in entry else \
+                    all(entry.get(f) == grade_entry[f] for f in ("grade", "date", "category"))
+                if same:
+                    entries[i] = grade_entry
+                    break
+            else:
+                entries.append(grade_entry)
+        
+        save_memory(child_name, memory)
+
+
+def forget_grade_history(child_name: str, grades: List[Dict]):
+    """Drop retracted grades from memory.json (blocking, run via executor)"""
+    keys = {grade_identity(grade) for grade in grades}
+    with child_lock(child_name):
+        memory = load_memory(child_name)
+        for subject, entries in memory.get("grade_history", {}).items():
+            entries[:] = [entry for entry in entries if entry.get("key") not in keys]
+        save_memory(child_name, memory)
+
+
+def add_memory_entry(child_name: str, key: str, entry: Dict):
+    """Append an entry to a memory list (issues, action_items, ...) under the child lock"""
+    with child_lock(child_name):
+        memory = load_memory(child_name)
+        memory.setdefault(key, []).append(entry)
+        save_memory(child_name, memory)
 
 
 def format_memory(memory: Dict) -> str:
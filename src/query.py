@@ -0,0 +1,103 @@
+"""Date-range queries over a child's stored records.
+
+Records are partitioned by their own date into YYYY-MM month files (see
+storage.save_scrape_data), so a query only opens the partitions its date
+range overlaps. Records are streamed from a generator with date bounds,
+filters and field projection applied while scanning each partition,
+so callers never hold more than one month in memory.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .classifier import classify_result
+from .storage import RECORD_KINDS, list_partitions, load_monthly_data, record_date
+
+
+def _bound_month(day: Optional[str]) -> Optional[Tuple[int, int]]:
+    if not day:
+        return None
+    return int(day[:4]), int(day[5:7])
+
+
+def prune_partitions(
+    partitions: Iterable[Tuple[int, int]],
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+) -> List[Tuple[int, int]]:
+    """Partitions (year, month) that can hold records between the bounds"""
+    low, high = _bound_month(date_from), _bound_month(date_to)
+    return [
+        key for key in partitions
+        if (low is None or key >= low) and (high is None or key <= high)
+    ]
+
+
+def _compile_filters(filters: Optional[Dict[str, Any]]) -> List[Callable[[Dict], bool]]:
+    """
+    Turn {field: condition} into predicates.
+
+    A condition is a value (equality), a list/tuple/set (membership) or a
+    callable taking the field value.
+    """
+    predicates = []
+    for field, condition in (filters or {}).items():
+        if callable(condition):
+            predicates.append(lambda item, f=field, c=condition: bool(c(item.get(f))))
+        elif isinstance(condition, (list, tuple, set, frozenset)):
+            allowed = frozenset(condition)
+            predicates.append(lambda item, f=field, a=allowed: item.get(f) in a)
+        else:
+            predicates.append(lambda item, f=field, v=condition: item.get(f) == v)
+    return predicates
+
+
+def query(
+    child_name: str,
+    kind: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None
+) -> Iterator[Dict]:
+    """
+    Stream records of one kind, oldest partition first.
+
+    Args:
+        child_name: Child name or alias
+        kind: One of storage.RECORD_KINDS
+        date_from: Inclusive lower bound on the record date, YYYY-MM-DD
+        date_to: Inclusive upper bound on the record date, YYYY-MM-DD
+        filters: {field: value | collection | callable} conditions, all must hold
+        fields: Only return these fields (default: whole records)
+
+    Yields:
+        Matching records (records without a date are skipped when bounds are given)
+    """
+    if kind not in RECORD_KINDS:
+        raise ValueError(f"Unknown record kind: {kind}")
+
+    predicates = _compile_filters(filters)
+    bounded = bool(date_from or date_to)
+
+    for year, month in prune_partitions(list_partitions(child_name), date_from, date_to):
+        month_data = load_monthly_data(child_name, year, month)
+        result = (month_data or {}).get('data')
+        if not result:
+            continue
+        if kind in ('messages', 'remarks'):
+            # Tags from an older keyword configuration are refreshed
+            classify_result(result, child_name=child_name)
+
+        items = result.get('homework') if kind == 'homework' else (result.get('rawData') or {}).get(kind)
+        for item in items or []:
+            if bounded:
+                day = record_date(kind, item)[:10]
+                if not day or (date_from and day < date_from) or (date_to and day > date_to):
+                    continue
+            if predicates and not all(p(item) for p in predicates):
+                continue
+            yield {f: item.get(f) for f in fields} if fields else item
+
+
+def query_all(*args, **kwargs) -> List[Dict]:
+    """query() collected into a list - for run_io() from async handlers"""
+    return list(query(*args, **kwargs))
@@ -0,0 +1,199 @@
+"""Process-wide adaptive rate limiting of requests to Librus.
+
+One token bucket per host, shared by every scrape in the process (all
+children), the in-page fetches (through the librusAcquire/librusObserve
+bindings, see scraper.py) and Python-side navigations (scrape_homework).
+
+The bucket adapts to how the server responds (AIMD):
+- a fast, successful response adds RATE_STEP requests/s, up to max_rps
+- a slow response (above target_latency_ms) shrinks the rate by SLOW_FACTOR
+- a failure (network error, 429/5xx, unexpected redirect) halves the rate
+  and pauses the host with exponential backoff, reset by the next success
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from .config import config
+
+
+RATE_STEP = 0.25
+SLOW_FACTOR = 0.8
+FAILURE_FACTOR = 0.5
+
+# Statuses that mean the server wants us to slow down (or is struggling)
+THROTTLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class AdaptiveTokenBucket:
+    """Token bucket whose refill rate follows observed latency and failures"""
+
+    def __init__(self, rate: float, burst: int, min_rate: float, max_rate: float,
+                 target_latency_ms: float, backoff_base_ms: float, backoff_max_ms: float,
+                 clock: Callable[[], float] = time.monotonic, sleep=asyncio.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency_ms = target_latency_ms
+        self.backoff_base_ms = backoff_base_ms
+        self.backoff_max_ms = backoff_max_ms
+        self._clock = clock
+        self._sleep = sleep
+
+        self.tokens = float(burst)
+        self.updated = clock()
+        self.failures = 0
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def configure(self, burst: int, min_rate: float, max_rate: float, target_latency_ms: float,
+                  backoff_base_ms: float, backoff_max_ms: float, **_ignored):
+        """Apply new limits, keeping the learned rate (clamped to them) and any backoff"""
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency_ms = target_latency_ms
+        self.backoff_base_ms = backoff_base_ms
+        self.backoff_max_ms = backoff_max_ms
+        self.rate = min(max_rate, max(min_rate, self.rate))
+        self.tokens = min(self.tokens, float(burst))
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait for a token (and for any backoff pause to end)"""
+        while True:
+            now = self._clock()
+            self._refill(now)
+            if now < self.blocked_until:
+                await self._sleep(self.blocked_until - now)
+                continue
+            if self.tokens >= 1:
+                # No await between the check and taking the token - safe across tasks
+                self.tokens -= 1
+                self.requests += 1
+                return
+            await self._sleep((1 - self.tokens) / self.rate)
+
+    def observe(self, latency_ms: float, ok: bool):
+        """Adapt the rate to one finished request"""
+        if not ok:
+            self.errors += 1
+            self.failures += 1
+            self.rate = max(self.min_rate, self.rate * FAILURE_FACTOR)
+            backoff_ms = min(self.backoff_max_ms, self.backoff_base_ms * 2 ** (self.failures - 1))
+            self.blocked_until = self._clock() + backoff_ms / 1000
+            self.tokens = 0.0
+            return
+
+        self.failures = 0
+        if latency_ms > self.target_latency_ms:
+            self.rate = max(self.min_rate, self.rate * SLOW_FACTOR)
+        else:
+            self.rate = min(self.max_rate, self.rate + RATE_STEP)
+
+    def snapshot(self) -> Dict:
+        return {
+            "rate_rps": round(self.rate, 2),
+            "requests": self.requests,
+            "errors": self.errors,
+            "backing_off": self.failures > 0
+        }
+
+
+def is_ok(status: int, redirected: bool = False) -> bool:
+    """Whether a response counts as a success for the limiter"""
+    return 0 < status < 400 and status not in THROTTLE_STATUSES and not redirected
+
+
+_buckets: Dict[str, AdaptiveTokenBucket] = {}
+
+
+def _settings() -> Dict:
+    settings = config.rate_limit
+    return dict(
+        rate=settings.get('initial_rps', 5.0),
+        burst=settings.get('burst', 4),
+        min_rate=settings.get('min_rps', 0.5),
+        max_rate=settings.get('max_rps', 15.0),
+        target_latency_ms=settings.get('target_latency_ms', 800),
+        backoff_base_ms=settings.get('backoff_base_ms', 500),
+        backoff_max_ms=settings.get('backoff_max_ms', 30000)
+    )
+
+
+def _new_bucket() -> AdaptiveTokenBucket:
+    return AdaptiveTokenBucket(**_settings())
+
+
+def apply_config(_config=None):
+    """Config reload subscriber: existing hosts take the new rate_limit settings"""
+    settings = _settings()
+    for bucket in _buckets.values():
+        bucket.configure(**settings)
+
+
+def limiter_for(url: str) -> AdaptiveTokenBucket:
+    """The shared bucket of a URL's host"""
+    host = urlparse(url).netloc or url
+    if host not in _buckets:
+        _buckets[host] = _new_bucket()
+    return _buckets[host]
+
+
+def snapshot() -> Dict[str, Dict]:
+    """Current rate and counters of every host"""
+    return {host: bucket.snapshot() for host, bucket in _buckets.items()}
+
+
+def reset():
+    """Forget all hosts (tests)"""
+    _buckets.clear()
+
+
+async def acquire_url(url: str):
+    """librusAcquire binding: wait until a request to url may start"""
+    await limiter_for(url).acquire()
+
+
+def observe_url(url: str, latency_ms: float, status: int, redirected: bool = False):
+    """librusObserve binding: report how a request to url went"""
+    limiter_for(url).observe(latency_ms, is_ok(status, redirected))
+
+
+class Request:
+    """Outcome of a request made inside request(); set status (and redirected)"""
+
+    def __init__(self):
+        self.status: Optional[int] = None
+        self.redirected = False
+
+
+@asynccontextmanager
+async def request(url: str):
+    """
+    Rate-limit one Python-side request (e.g. a page navigation).
+
+    The block's latency is observed on exit; an exception, a failing status
+    or a redirect count as failures.
+    """
+    bucket = limiter_for(url)
+    await bucket.acquire()
+    outcome = Request()
+    started = time.perf_counter()
+    try:
+        yield outcome
+    except Exception:
+        bucket.observe((time.perf_counter() - started) * 1000, False)
+        raise
+    status = outcome.status if outcome.status is not None else 200
+    bucket.observe((time.perf_counter() - started) * 1000, is_ok(status, outcome.redirected))
+
+
+config.subscribe(apply_config)
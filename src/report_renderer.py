@@ -0,0 +1,242 @@
+"""Markdown to PDF report rendering.
+
+reportlab, fonts and paragraph styles are set up once per process and
+reused by every render. Rendering itself is synchronous and CPU-bound, so
+async callers should use render_pdf_async() which runs it in the CPU executor
+(a worker thread, or a process if executor.cpu_workers is set).
+"""
+import functools
+import os
+import re
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Tuple
+
+
+SIGNATURE_PATH = Path(__file__).parent.parent / 'assets' / 'dumbledore_signature.png'
+
+# System fonts with Polish glyphs, tried in order: (name, regular path, bold path)
+PDF_FONT_CANDIDATES = [
+    ('TimesNewRoman',
+     '/System/Library/Fonts/Supplemental/Times New Roman.ttf',
+     '/System/Library/Fonts/Supplemental/Times New Roman Bold.ttf'),
+    ('Verdana',
+     '/System/Library/Fonts/Supplemental/Verdana.ttf',
+     '/System/Library/Fonts/Supplemental/Verdana Bold.ttf'),
+]
+
+# Block-level markup, matched once per line: "# ", "## ", "### ", "- "/"* ", "---"
+BLOCK_PATTERN = re.compile(r'(?P<heading>#{1,3}) |(?P<bullet>[-*]) |(?P<rule>---)')
+
+# Inline markup, handled in a single left-to-right scan: **bold** and *italic*
+INLINE_PATTERN = re.compile(r'\*\*(?P<bold>.*?)\*\*|\*(?P<italic>[^*]+?)\*')
+
+HEADING_TOKENS = {1: 'title', 2: 'heading1', 3: 'heading2'}
+
+Token = Tuple[str, str]
+
+
+def _inline_replacement(match: re.Match) -> str:
+    bold = match.group('bold')
+    if bold is not None:
+        return f'<b>{bold}</b>'
+    return f"<i>{match.group('italic')}</i>"
+
+
+def format_inline(text: str) -> str:
+    """Escape text for reportlab and convert **bold** / *italic* to tags"""
+    text = text.replace('&', '&amp;').replace('<br>', '<br/>')
+    return INLINE_PATTERN.sub(_inline_replacement, text)
+
+
+def tokenize_markdown(content: str) -> List[Token]:
+    """
+    Split markdown into block tokens in a single pass.
+
+    Returns:
+        List of (kind, text) where kind is one of: title, heading1, heading2,
+        bullet, rule, blank, text. Text is already inline-formatted.
+    """
+    tokens: List[Token] = []
+
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            tokens.append(('blank', ''))
+            continue
+
+        match = BLOCK_PATTERN.match(line)
+        if match is None:
+            tokens.append(('text', format_inline(line)))
+        elif match.group('heading'):
+            level = len(match.group('heading'))
+            tokens.append((HEADING_TOKENS[level], format_inline(line[match.end():])))
+        elif match.group('bullet'):
+            tokens.append(('bullet', format_inline(line[match.end():])))
+        else:
+            tokens.append(('rule', ''))
+
+    return tokens
+
+
+@functools.lru_cache(maxsize=None)
+def load_reportlab() -> SimpleNamespace:
+    """
+    Import reportlab, register fonts and build paragraph styles once per process.
+
+    Returns:
+        SimpleNamespace with the reportlab names we use, font names and styles
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image, Table
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    from reportlab.lib.colors import HexColor
+
+    # Last resort - use Helvetica but ensure UTF-8
+    font_name = 'Helvetica'
+    font_bold = 'Helvetica-Bold'
+
+    for name, regular_path, bold_path in PDF_FONT_CANDIDATES:
+        try:
+            pdfmetrics.registerFont(TTFont(name, regular_path))
+            pdfmetrics.registerFont(TTFont(f'{name}-Bold', bold_path))
+            font_name = name
+            font_bold = f'{name}-Bold'
+            break
+        except Exception:
+            continue
+
+    styles = {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            fontName=font_bold,
+            fontSize=18,
+            leading=22,
+            spaceAfter=24,
+            textColor=HexColor('#2C3E50'),
+            alignment=TA_CENTER
+        ),
+        'heading1': ParagraphStyle(
+            'CustomHeading1',
+            fontName=font_bold,
+            fontSize=14,
+            leading=18,
+            spaceAfter=12,
+            spaceBefore=16,
+            textColor=HexColor('#34495E')
+        ),
+        'heading2': ParagraphStyle(
+            'CustomHeading2',
+            fontName=font_bold,
+            fontSize=12,
+            leading=16,
+            spaceAfter=10,
+            spaceBefore=12,
+            textColor=HexColor('#7F8C8D')
+        ),
+        'text': ParagraphStyle(
+            'CustomNormal',
+            fontName=font_name,
+            fontSize=10,
+            leading=13,
+            spaceAfter=4,
+            alignment=TA_JUSTIFY
+        ),
+        'bullet': ParagraphStyle(
+            'CustomBullet',
+            fontName=font_name,
+            fontSize=10,
+            leading=13,
+            spaceAfter=3,
+            leftIndent=20,
+            bulletIndent=10
+        ),
+    }
+
+    return SimpleNamespace(
+        A4=A4, SimpleDocTemplate=SimpleDocTemplate, Paragraph=Paragraph,
+        Spacer=Spacer, PageBreak=PageBreak, Image=Image, Table=Table, inch=inch,
+        font_name=font_name, font_bold=font_bold, styles=styles
+    )
+
+
+def build_story(tokens: List[Token], rl: SimpleNamespace) -> list:
+    """Convert markdown tokens into reportlab flowables"""
+    story = []
+    skip_next_space = False
+
+    for kind, text in tokens:
+        # Skip empty lines after headers
+        if kind == 'blank':
+            if not skip_next_space:
+                story.append(rl.Spacer(1, 0.08*rl.inch))
+            skip_next_space = False
+        elif kind == 'rule':
+            story.append(rl.Spacer(1, 0.15*rl.inch))
+        elif kind == 'bullet':
+            story.append(rl.Paragraph(f'• {text}', rl.styles['bullet']))
+        else:
+            story.append(rl.Paragraph(text, rl.styles[kind]))
+            if kind in ('title', 'heading1', 'heading2'):
+                skip_next_space = True
+
+    return story
+
+
+def render_pdf(documents: List[str], output_path: str) -> str:
+    """
+    Render one or more markdown documents into a single PDF.
+
+    Each document (e.g. one child's report) starts on a new page.
+
+    Args:
+        documents: Markdown contents
+        output_path: Target PDF path (~ is expanded)
+
+    Returns:
+        Absolute output path
+    """
+    rl = load_reportlab()
+    output_path = str(Path(output_path).expanduser())
+
+    # Create PDF with margins
+    doc = rl.SimpleDocTemplate(
+        output_path,
+        pagesize=rl.A4,
+        leftMargin=0.75*rl.inch,
+        rightMargin=0.75*rl.inch,
+        topMargin=0.75*rl.inch,
+        bottomMargin=0.75*rl.inch
+    )
+
+    story = []
+    for i, content in enumerate(documents):
+        if i > 0:
+            story.append(rl.PageBreak())
+        story.extend(build_story(tokenize_markdown(content), rl))
+
+    # Add Dumbledore's signature at the end (right-aligned)
+    try:
+        if os.path.exists(SIGNATURE_PATH):
+            story.append(rl.Spacer(1, 0.3*rl.inch))
+            sig = rl.Image(str(SIGNATURE_PATH), width=2*rl.inch, height=1*rl.inch, hAlign='RIGHT')
+            # Create a table to right-align the signature
+            sig_table = rl.Table([[sig]], colWidths=[doc.width])
+            sig_table.setStyle([('ALIGN', (0, 0), (-1, -1), 'RIGHT')])
+            story.append(sig_table)
+    except Exception:
+        # If signature fails, just skip it
+        pass
+
+    doc.build(story)
+    return output_path
+
+
+async def render_pdf_async(documents: List[str], output_path: str) -> str:
+    """Render PDF in the CPU executor so the event loop keeps serving requests"""
+    from .executor import run_cpu
+    return await run_cpu(render_pdf, documents, output_path)
@@ -0,0 +1,76 @@
+"""Bounded concurrency and draining of tool calls.
+
+Every tool call passes through one RequestGate. At most limit calls run
+at once; the rest wait for a slot in arrival order. On shutdown the gate
+is closed - calls still waiting (or arriving) are refused with
+ShuttingDown - and drain() waits for the running ones to finish, so an
+HTTP server shared by several clients can stop without cutting a scrape
+in half.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict
+
+
+class ShuttingDown(Exception):
+    """Raised for tool calls that arrive or wait while the server stops"""
+    pass
+
+
+class RequestGate:
+    """Semaphore around tool calls that also knows when none are left"""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.closing = False
+        self.running = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(self.limit)
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the limit slots for the duration of a call"""
+        if self.closing:
+            raise ShuttingDown("Server is shutting down")
+        self.waiting += 1
+        self._idle.clear()
+        acquired = False
+        try:
+            await self._semaphore.acquire()
+            acquired = True
+        finally:
+            self.waiting -= 1
+            if not acquired:
+                self._settle()
+        try:
+            if self.closing:
+                raise ShuttingDown("Server is shutting down")
+            self.running += 1
+            try:
+                yield
+            finally:
+                self.running -= 1
+        finally:
+            self._semaphore.release()
+            self._settle()
+
+    def _settle(self):
+        if not self.running and not self.waiting:
+            self._idle.set()
+
+    def close(self):
+        """Refuse new and queued calls (safe to call from a signal handler)"""
+        self.closing = True
+
+    async def drain(self, timeout_s: float) -> bool:
+        """Wait for running calls to finish; False if some were still running at the timeout"""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout_s)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def snapshot(self) -> Dict:
+        return {"limit": self.limit, "running": self.running, "waiting": self.waiting, "closing": self.closing}
@@ -0,0 +1,183 @@
+"""Resource blocking for scraping navigations.
+
+The scraper only needs HTML (and the scripts Librus uses to build the
+grades page), yet every navigation also pulls images, fonts, stylesheets
+and analytics scripts. A ResourcePolicy installed on the browser context
+aborts those requests through Playwright request routing; URLs matching
+the allowlist in config.yaml always load.
+
+NetworkStats counts what was downloaded and blocked per scrape. Run
+
+    python -m src.resource_policy <child name>
+
+to benchmark the grades and homework pages with and without blocking
+(needs a saved login session).
+"""
+import sys
+import time
+from typing import Dict, Iterable, Optional
+
+from .config import config
+
+
+DEFAULT_BLOCKED_TYPES = ("image", "font", "stylesheet", "media")
+
+# Analytics/ads hosts blocked regardless of resource type
+TRACKER_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "hotjar.com", "facebook.net", "gemius.pl"
+)
+
+# Selectors the extractors need - waited for instead of networkidle
+GRADES_READY_JS = (
+    "() => document.querySelector('table.decorated.stretch') !== null"
+    " || document.body.textContent.includes('Brak dostępu')"
+)
+
+
+class ResourcePolicy:
+    """Decides which requests a scraping context aborts"""
+
+    def __init__(self, enabled: bool = True, blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES,
+                 allowlist: Iterable[str] = (), block_trackers: bool = True):
+        self.enabled = enabled
+        self.blocked_types = frozenset(blocked_types)
+        self.allowlist = tuple(allowlist)
+        self.block_trackers = block_trackers
+
+    @classmethod
+    def from_config(cls) -> "ResourcePolicy":
+        """Policy from the browser section of config.yaml"""
+        return cls(
+            enabled=config.block_resources,
+            blocked_types=config.blocked_resource_types,
+            allowlist=config.resource_allowlist
+        )
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """True if a request of this type/URL should be aborted"""
+        if not self.enabled or any(pattern in url for pattern in self.allowlist):
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        return self.block_trackers and any(host in url for host in TRACKER_HOSTS)
+
+
+class NetworkStats:
+    """Requests, bytes and blocked resources of one scrape"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.bytes = 0
+        self.blocked: Dict[str, int] = {}
+
+    def record_blocked(self, resource_type: str):
+        self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+
+    async def record_finished(self, request):
+        self.requests += 1
+        try:
+            sizes = await request.sizes()
+            self.bytes += sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+        except Exception:
+            # Sizes are unavailable for some requests (e.g. served from cache)
+            pass
+
+    def report(self) -> Dict:
+        return {
+            "elapsed_ms": round((time.perf_counter() - self.started) * 1000),
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "blocked": dict(self.blocked),
+            "blocked_total": sum(self.blocked.values())
+        }
+
+
+async def install(context, policy: Optional[ResourcePolicy] = None) -> NetworkStats:
+    """Apply the policy to a browser context and start collecting stats"""
+    policy = policy or ResourcePolicy.from_config()
+    stats = NetworkStats()
+
+    if policy.enabled:
+        async def handle_route(route):
+            request = route.request
+            if policy.should_block(request.resource_type, request.url):
+                stats.record_blocked(request.resource_type)
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route("**/*", handle_route)
+
+    context.on("requestfinished", stats.record_finished)
+    return stats
+
+
+async def wait_for_grades_page(page):
+    """Wait until the grades table (or the 'Brak dostępu' page) is in the DOM"""
+    await page.wait_for_function(GRADES_READY_JS, timeout=config.page_timeout_ms)
+
+
+async def benchmark(child_name: str) -> Dict:
+    """
+    Load the grades page and one homework filter with and without blocking.
+
+    Returns:
+        Per-run network reports plus time and bytes saved by blocking
+    """
+    from datetime import datetime
+    from playwright.async_api import async_playwright
+    from .storage import get_context_dir
+
+    cookies_file = get_context_dir(child_name) / "cookies.json"
+    if not cookies_file.exists():
+        raise RuntimeError(f"No saved session for {child_name}, run manual_login first")
+
+    runs = {}
+    async with async_playwright() as p:
+        browser = await p.webkit.launch(headless=True)
+        for label, enabled in (("unblocked", False), ("blocked", True)):
+            policy = ResourcePolicy.from_config()
+            policy.enabled = enabled
+            context = await browser.new_context(storage_state=str(cookies_file))
+            stats = await install(context, policy)
+            page = await context.new_page()
+
+            if enabled:
+                await page.goto('https://synergia.librus.pl/przegladaj_oceny/uczen', wait_until='domcontentloaded')
+                await wait_for_grades_page(page)
+            else:
+                await page.goto('https://synergia.librus.pl/przegladaj_oceny/uczen', wait_until='networkidle')
+
+            await page.goto('https://synergia.librus.pl/moje_zadania', wait_until='domcontentloaded')
+            await page.fill('#dateFrom', datetime.now().strftime('%Y-%m-01'))
+            await page.fill('#dateTo', datetime.now().strftime('%Y-%m-%d'))
+            if enabled:
+                async with page.expect_navigation(wait_until='domcontentloaded'):
+                    await page.click('input[name="submitFiltr"]')
+            else:
+                await page.click('input[name="submitFiltr"]')
+                await page.wait_for_load_state('networkidle')
+
+            runs[label] = stats.report()
+            await context.close()
+        await browser.close()
+
+    return {
+        **runs,
+        "saved": {
+            "ms": runs["unblocked"]["elapsed_ms"] - runs["blocked"]["elapsed_ms"],
+            "bytes": runs["unblocked"]["bytes"] - runs["blocked"]["bytes"]
+        }
+    }
+
+
+if __name__ == "__main__":
+    import asyncio
+    import json
+
+    if len(sys.argv) != 2:
+        print("Usage: python -m src.resource_policy <child name>", file=sys.stderr)
+        sys.exit(2)
+    print(json.dumps(asyncio.run(benchmark(sys.argv[1])), indent=2))
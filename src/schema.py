@@ -0,0 +1,128 @@
+"""Precompiled JSON-schema validation for MCP tool arguments"""
+import re
+from typing import Any, Callable, Dict, List
+
+
+class ToolArgumentError(ValueError):
+    """Raised when tool arguments do not match the tool's input schema"""
+    pass
+
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+}
+
+
+def _compile_property(name: str, schema: Dict) -> Callable[[Any], None]:
+    """Compile checks for a single property into one closure"""
+    checks: List[Callable[[Any], None]] = []
+
+    expected_type = schema.get("type")
+    if expected_type:
+        type_check = _TYPE_CHECKS[expected_type]
+
+        def check_type(value):
+            if not type_check(value):
+                raise ToolArgumentError(
+                    f"Argument '{name}' must be of type {expected_type}, got {type(value).__name__}"
+                )
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = frozenset(schema["enum"])
+
+        def check_enum(value):
+            if value not in allowed:
+                raise ToolArgumentError(
+                    f"Argument '{name}' must be one of {sorted(allowed)}, got {value!r}"
+                )
+        checks.append(check_enum)
+
+    if "items" in schema:
+        item_validator = _compile_property(f"{name}[]", schema["items"])
+
+        def check_items(value):
+            for item in value:
+                item_validator(item)
+        checks.append(check_items)
+
+    if "pattern" in schema:
+        pattern = re.compile(schema["pattern"])
+
+        def check_pattern(value):
+            if not pattern.search(value):
+                raise ToolArgumentError(
+                    f"Argument '{name}' must match {schema['pattern']}, got {value!r}"
+                )
+        checks.append(check_pattern)
+
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+
+        def check_minimum(value):
+            if value < minimum:
+                raise ToolArgumentError(f"Argument '{name}' must be >= {minimum}, got {value}")
+        checks.append(check_minimum)
+
+    def validate(value):
+        for check in checks:
+            check(value)
+
+    return validate
+
+
+def compile_schema(schema: Dict) -> Callable[[Dict], Dict]:
+    """
+    Compile an object input schema into a validator function.
+
+    Supports the subset of JSON schema used by our tools: property types,
+    enums, patterns, minimum, array items, required properties and defaults. The
+    returned function validates arguments and returns a copy with defaults
+    applied.
+
+    Args:
+        schema: JSON schema with "type": "object"
+
+    Returns:
+        Function taking an arguments dict and returning validated arguments
+
+    Raises:
+        ToolArgumentError: From the returned function, on invalid arguments
+    """
+    properties = schema.get("properties", {})
+    required = tuple(schema.get("required", []))
+    validators = {
+        name: _compile_property(name, prop_schema)
+        for name, prop_schema in properties.items()
+    }
+    defaults = {
+        name: prop_schema["default"]
+        for name, prop_schema in properties.items()
+        if "default" in prop_schema
+    }
+
+    def validate(arguments: Dict) -> Dict:
+        if arguments is None:
+            arguments = {}
+        if not isinstance(arguments, dict):
+            raise ToolArgumentError("Arguments must be an object")
+
+        for name in required:
+            if name not in arguments:
+                raise ToolArgumentError(f"Missing required argument: '{name}'")
+
+        for name, value in arguments.items():
+            validator = validators.get(name)
+            if validator is not None:
+                validator(value)
+
+        if not defaults:
+            return dict(arguments)
+        return {**defaults, **arguments}
+
+    return validate
@@ -0,0 +1,111 @@
+"""Fair scheduling of scrapes across tenants.
+
+Scrapes share one browser (see browser_pool) and one rate limit towards
+Librus, so only max_concurrent_scrapes run at once. When a slot frees
+up, it goes to the waiting tenant that was served least recently - so
+tenants take turns - and a tenant never runs more than its quota. A
+household queueing a full scrape of every child therefore can't starve
+the others; it only gets its turn like everyone else.
+"""
+import asyncio
+import itertools
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Deque, Dict, Optional
+
+from . import tenants
+from .config import config
+
+
+class _Ticket:
+    """A waiting scrape; granted is set by _dispatch when it gets a slot"""
+    __slots__ = ("future", "granted")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.granted = False
+
+
+class FairScheduler:
+    """Global capacity, per-tenant quotas and turn-taking between tenants"""
+
+    def __init__(self, capacity: Callable[[], int], quota: Callable[[str], int]):
+        self._capacity = capacity
+        self._quota = quota
+        self.running: Dict[str, int] = {}
+        # Waiting scrapes per tenant, in tenant arrival order
+        self._queues: Dict[str, Deque[_Ticket]] = {}
+        self._grants = itertools.count()
+        self._last_served: Dict[str, int] = {}
+
+    @property
+    def total_running(self) -> int:
+        return sum(self.running.values())
+
+    @asynccontextmanager
+    async def slot(self, tenant_id: str):
+        """Wait for this tenant's turn and hold a scrape slot for the block"""
+        ticket = _Ticket(asyncio.get_running_loop().create_future())
+        self._queues.setdefault(tenant_id, deque()).append(ticket)
+        self._dispatch()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.granted:
+                self._release(tenant_id)  # granted just as the waiter was cancelled
+            else:
+                self._discard(tenant_id, ticket)
+            raise
+        try:
+            yield
+        finally:
+            self._release(tenant_id)
+
+    def _release(self, tenant_id: str):
+        self.running[tenant_id] -= 1
+        if not self.running[tenant_id]:
+            del self.running[tenant_id]
+        self._dispatch()
+
+    def _discard(self, tenant_id: str, ticket: _Ticket):
+        """Drop a cancelled waiter (_dispatch may have dropped it already)"""
+        queue = self._queues.get(tenant_id)
+        if queue is not None and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del self._queues[tenant_id]
+
+    def _dispatch(self):
+        """Start waiting scrapes while there is capacity"""
+        while self.total_running < self._capacity():
+            tenant_id = self._next_tenant()
+            if tenant_id is None:
+                return
+            queue = self._queues[tenant_id]
+            ticket = queue.popleft()
+            if not queue:
+                del self._queues[tenant_id]
+            if ticket.future.done():
+                continue  # cancelled before its turn, its waiter is unwinding
+            ticket.granted = True
+            self.running[tenant_id] = self.running.get(tenant_id, 0) + 1
+            self._last_served[tenant_id] = next(self._grants)
+            ticket.future.set_result(None)
+
+    def _next_tenant(self) -> Optional[str]:
+        """Least recently served tenant with waiting scrapes and free quota"""
+        candidates = [tenant_id for tenant_id in self._queues
+                      if self.running.get(tenant_id, 0) < self._quota(tenant_id)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda tenant_id: self._last_served.get(tenant_id, -1))
+
+    def snapshot(self) -> Dict:
+        return {
+            "capacity": self._capacity(),
+            "running": dict(self.running),
+            "waiting": {tenant_id: len(queue) for tenant_id, queue in self._queues.items()}
+        }
+
+
+scheduler = FairScheduler(lambda: config.max_concurrent_scrapes, tenants.max_concurrent_scrapes)
@@ -1,24 +1,68 @@
 """Librus scraping logic"""
 from typing import Dict, Optional, List
-from .scraper_js import get_scraper_js
+from . import rate_limiter
+from .config import config
+from .scraper_js import get_scraper_js, get_scraper_params
 
 
-async def scrape_homework(page, last_scrape: Optional[str] = None) -> List[Dict]:
-    """Scrape homework using POST form submission, iterating by month"""
+LIBRUS_URL = 'https://synergia.librus.pl'
+
+# Fields the in-page scraper drops when empty, restored after page.evaluate()
+RECORD_DEFAULTS = {
+    'messages': {'title': '', 'sender': '', 'date': '', 'isRead': False, 'content': '', 'attachments': None},
+    'announcements': {'title': '', 'content': '', 'author': '', 'date': ''},
+    'grades': {'subject': '', 'grade': '', 'date': '', 'category': '', 'weight': '', 'teacher': ''},
+    'calendar': {'date': '', 'title': '', 'category': ''},
+    'remarks': {'date': '', 'teacher': '', 'category': '', 'content': ''},
+}
+
+
+def expand_records(raw: Dict) -> Dict:
+    """Restore the record shape of compact record lists (in place, kinds present only)"""
+    for kind, defaults in RECORD_DEFAULTS.items():
+        if kind in raw:
+            raw[kind] = [{**defaults, **item} for item in raw[kind] or []]
+    for message in raw.get('messages', []):
+        href = message.pop('href', None)
+        if href:
+            message['link'] = LIBRUS_URL + href
+    return raw
+
+
+def expand_result(result: Dict) -> Dict:
+    """Restore the record shape from the compact evaluate() payload and count records"""
+    raw = result['rawData']
+    for kind in RECORD_DEFAULTS:
+        raw.setdefault(kind, [])
+    expand_records(raw)
+    
+    result['stats'] = {kind: len(raw[kind]) for kind in RECORD_DEFAULTS}
+    result['stats']['homework'] = len(result.get('homework') or [])
+    return result
+
+
+async def scrape_homework(page, last_scrape: Optional[str] = None, checkpointer=None) -> List[Dict]:
+    """
+    Scrape homework using POST form submission, iterating by month.
+    
+    With a checkpointer, months it already holds are skipped and every
+    finished month is streamed to it instead of being collected.
+    """
     from datetime import datetime, timedelta
     from dateutil.relativedelta import relativedelta
     
     today = datetime.now()
+    days_ahead = config.homework_days_ahead
     
     if last_scrape:
-        # Delta mode: from last scrape to +30 days
+        # Delta mode: from last scrape to +homework_days_ahead
         start_date = datetime.fromisoformat(last_scrape.replace('Z', '+00:00'))
-        end_date = today + timedelta(days=30)
+        end_date = today + timedelta(days=days_ahead)
     else:
-        # Full mode: from Sept 1 of school year to today +30 days
+        # Full mode: from Sept 1 of school year to today +homework_days_ahead
         school_year_start = datetime(today.year if today.month >= 9 else today.year - 1, 9, 1)
         start_date = school_year_start
-        end_date = today + timedelta(days=30)
+        end_date = today + timedelta(days=days_ahead)
     
     homework = []
     current = start_date
@@ -32,11 +76,17 @@ async def scrape_homework(page, last_scrape: Optional[str] = None) -> List[Dict]
         date_from = current.strftime('%Y-%m-%d')
         date_to = month_end.strftime('%Y-%m-%d')
         
-        await page.goto('https://synergia.librus.pl/moje_zadania')
+        if checkpointer and date_from in checkpointer.homework_done:
+            current = month_end + timedelta(days=1)
+            continue
+        
+        async with rate_limiter.request(f'{LIBRUS_URL}/moje_zadania') as outcome:
+            response = await page.goto(f'{LIBRUS_URL}/moje_zadania', wait_until='domcontentloaded')
+            outcome.status = response.status if response else None
         
         # Wait for form to load
         try:
-            await page.wait_for_selector('#dateFrom', timeout=5000)
+            await page.wait_for_selector('#dateFrom', timeout=config.homework_form_timeout_ms)
         except:
             # No homework form - skip this month
             current = month_end + timedelta(days=1)
@@ -44,10 +94,15 @@ async def scrape_homework(page, last_scrape: Optional[str] = None) -> List[Dict]
         
         await page.fill('#dateFrom', date_from)
         await page.fill('#dateTo', date_to)
-        await page.click('input[name="submitFiltr"]')
-        await page.wait_for_load_state('networkidle')
+        # The results table is server-rendered - DOM-ready is enough
+        async with rate_limiter.request(f'{LIBRUS_URL}/moje_zadania') as outcome:
+            async with page.expect_navigation(wait_until='domcontentloaded') as navigation:
+                await page.click('input[name="submitFiltr"]')
+            response = await navigation.value
+            outcome.status = response.status if response else None
         
         # Extract homework data
+        month_homework = []
         row_count = await page.locator("table.decorated tbody tr").count()
         
         for i in range(row_count):
@@ -64,7 +119,7 @@ async def scrape_homework(page, last_scrape: Optional[str] = None) -> List[Dict]
             date_due = (await cells[6].text_content() or "").strip()
             
             if title and subject:
-                homework.append({
+                month_homework.append({
                     "subject": subject,
                     "teacher": teacher,
                     "title": title,
@@ -73,12 +128,16 @@ async def scrape_homework(page, last_scrape: Optional[str] = None) -> List[Dict]
                     "dateDue": date_due
                 })
         
+        if checkpointer:
+            await checkpointer.homework_month(date_from, month_homework)
+        else:
+            homework.extend(month_homework)
         current = month_end + timedelta(days=1)
     
     return homework
 
 
-async def scrape_librus_data(page, last_scrape: Optional[str], is_first: bool) -> Dict:
+async def scrape_librus_data(page, last_scrape: Optional[str], is_first: bool, checkpointer=None) -> Dict:
     """
     Execute JavaScript scraper in browser context.
     
@@ -86,20 +145,30 @@ async def scrape_librus_data(page, last_scrape: Optional[str], is_first: bool) -
         page: Playwright page object
         last_scrape: ISO datetime string of last scrape, or None
         is_first: True for full scrape, False for delta
+        checkpointer: checkpoints.Checkpointer that records are streamed to
+            while scraping (they are then not in the returned result), and
+            the cursor of an interrupted scrape to resume from
         
     Returns:
-        Dict with markdown, rawData, and stats
+        Dict with rawData, homework, sections and stats (markdown is
+        rendered separately, see markdown_renderer)
     """
     js_code = get_scraper_js()
     
-    result = await page.evaluate(js_code, {
-        "previousScanDate": last_scrape,
-        "isFirstTime": is_first
-    })
+    # In-page fetches share the process-wide adaptive rate limiter
+    await page.expose_function("librusAcquire", rate_limiter.acquire_url)
+    await page.expose_function("librusObserve", rate_limiter.observe_url)
+    
+    resume = None
+    if checkpointer:
+        await page.expose_function("librusIngest", checkpointer.ingest_batch)
+        resume = checkpointer.js_resume()
+    result = await page.evaluate(js_code, get_scraper_params(last_scrape, is_first, resume))
     
     # Add homework scraped via Python (POST form)
-    homework = await scrape_homework(page, None if is_first else last_scrape)
-    result['homework'] = homework
-    result['stats']['homework'] = len(homework)
+    result['homework'] = await scrape_homework(page, None if is_first else last_scrape, checkpointer)
     
+    expand_result(result)
+    if checkpointer:
+        result['stats'] = checkpointer.stats()
     return result
@@ -1,4 +1,31 @@
 """JavaScript scraper code for Librus"""
+from typing import Dict, Optional
+
+from .config import config
+
+
+def get_scraper_params(last_scrape: Optional[str], is_first: bool, resume: Optional[Dict] = None) -> Dict:
+    """
+    Build the params object passed to the get_scraper_js() function.
+    
+    Tunables are read from config on every call, so a reloaded config.yaml
+    applies to the next scrape without restarting the server. resume is the
+    cursor of an interrupted scrape (checkpoints.js_resume()).
+    """
+    return {
+        "previousScanDate": last_scrape,
+        "isFirstTime": is_first,
+        "resume": resume,
+        "config": {
+            "MAX_MESSAGES": config.max_messages,
+            "MAX_ANNOUNCEMENTS": config.max_announcements,
+            "FETCH_DELAY_MS": config.fetch_delay_ms,
+            "CALENDAR_MONTHS_AHEAD": config.calendar_months_ahead,
+            "MAX_CONCURRENT_REQUESTS": config.max_concurrent_requests,
+            "STREAM_BATCH_SIZE": config.stream_batch_size,
+            "FETCH_RETRIES": config.fetch_retries
+        }
+    }
 
 
 def get_scraper_js() -> str:
@@ -10,15 +37,23 @@ def get_scraper_js() -> str:
     - Announcements
     - Grades
     - Calendar events
+    - Remarks
+    
+    Sections run concurrently (Promise.allSettled) and share one request
+    limiter; the result's `sections` maps each section to its status,
+    duration in ms and error message if it failed.
+    
+    If the page exposes `librusIngest(cursor, records)` (see checkpoints.py),
+    records are streamed to it in batches as every inbox page and section
+    finishes, instead of being returned. `params.resume` skips work an
+    interrupted scrape already checkpointed.
+    
+    The script takes the object built by get_scraper_params().
     """
     return """
     async (params) => {
-        const CONFIG = {
-            MAX_MESSAGES: 200,
-            MAX_ANNOUNCEMENTS: 150,
-            FETCH_DELAY_MS: 150,
-            CALENDAR_MONTHS_AHEAD: 2
-        };
+        // Tunables come from config.yaml via get_scraper_params()
+        const CONFIG = params.config;
         
         console.log("LIBRUS SCRAPER");
         
@@ -39,12 +74,67 @@ def get_scraper_js() -> str:
             console.log("Mode: FULL CONTEXT");
         }
         
-        const fetchPage = async (url) => {
-            const response = await fetch(url);
+        // Shared by all sections: at most MAX_CONCURRENT_REQUESTS in flight and
+        // request starts spaced by FETCH_DELAY_MS, so running sections in
+        // parallel doesn't hit Librus harder than the old sequential loop.
+        // With the librusAcquire/librusObserve bindings the spacing comes from
+        // the process-wide adaptive limiter in Python (rate_limiter.py) instead.
+        const createLimiter = (maxConcurrent, minIntervalMs) => {
+            let active = 0;
+            let nextStart = 0;
+            const waiting = [];
+            
+            return async (task) => {
+                while (active >= maxConcurrent) {
+                    await new Promise(resolve => waiting.push(resolve));
+                }
+                active++;
+                try {
+                    const wait = nextStart - Date.now();
+                    nextStart = Math.max(Date.now(), nextStart) + minIntervalMs;
+                    if (wait > 0) await new Promise(r => setTimeout(r, wait));
+                    return await task();
+                } finally {
+                    active--;
+                    if (waiting.length) waiting.shift()();
+                }
+            };
+        };
+        const sharedLimiter = typeof globalThis.librusAcquire === 'function';
+        const limit = createLimiter(CONFIG.MAX_CONCURRENT_REQUESTS, sharedLimiter ? 0 : CONFIG.FETCH_DELAY_MS);
+        
+        const fetchOnce = async (url) => {
+            if (sharedLimiter) await globalThis.librusAcquire(url);
+            const started = performance.now();
+            let response;
+            try {
+                response = await fetch(url);
+            } catch (e) {
+                if (sharedLimiter) await globalThis.librusObserve(url, performance.now() - started, 0, false);
+                throw e;
+            }
+            if (sharedLimiter) {
+                await globalThis.librusObserve(url, performance.now() - started, response.status, !!response.redirected);
+            }
+            return response;
+        };
+        
+        // Throttled responses are retried; the limiter's backoff spaces the retries.
+        // A failing or redirected response (e.g. to the login page) throws, so its
+        // section errors out instead of parsing as an empty page.
+        const fetchPage = (url) => limit(async () => {
+            let response;
+            for (let attempt = 0; ; attempt++) {
+                response = await fetchOnce(url);
+                const throttled = response.status === 429 || response.status >= 500;
+                if (!throttled || !sharedLimiter || attempt >= CONFIG.FETCH_RETRIES) break;
+            }
+            if (response.redirected) throw new Error(`Redirected fetching ${url}`);
+            if (!response.ok) throw new Error(`HTTP ${response.status} fetching ${url}`);
             const html = await response.text();
             const parser = new DOMParser();
             return parser.parseFromString(html, 'text/html');
-        };
+        });
         
         const parsePolishDate = (dateStr) => {
             const parts = dateStr.match(/(\\d{4})-(\\d{2})-(\\d{2}) (\\d{2}):(\\d{2}):(\\d{2})/);
@@ -52,6 +142,29 @@ def get_scraper_js() -> str:
             return new Date(parts[1], parts[2] - 1, parts[3], parts[4], parts[5], parts[6]);
         };
         
+        // Records cross page.evaluate without empty fields (restored in scraper.py)
+        const compact = (records) => (records || []).map(r => Object.fromEntries(
+            Object.entries(r).filter(([, v]) => v !== '' && v !== null && v !== undefined)
+        ));
+        
+        // With librusIngest exposed, records are streamed to Python in batches
+        // as each unit (inbox page, section) finishes and dropped here; the
+        // unit's cursor rides on its last batch, so a scrape that dies can
+        // resume from there. Awaiting each batch keeps the page from running
+        // ahead of Python. Without it, records are returned at the end.
+        const streaming = typeof globalThis.librusIngest === 'function';
+        const resume = params.resume || { sectionsDone: [], messagesPage: 0, messagesCollected: 0 };
+        const ingest = async (kind, records, cursor, extra = {}) => {
+            const size = CONFIG.STREAM_BATCH_SIZE;
+            for (let i = 0; i === 0 || i < records.length; i += size) {
+                const last = i + size >= records.length;
+                await globalThis.librusIngest(
+                    last ? cursor : null,
+                    { [kind]: compact(records.slice(i, i + size)), ...(last ? extra : {}) }
+                );
+            }
+        };
+        
         const now = new Date();
         const data = {
             collectionDate: now.toLocaleString('pl-PL'),
@@ -64,14 +177,61 @@ def get_scraper_js() -> str:
         };
         
         // ====== 1. MESSAGES ======
-        try {
+        const fetchMessage = async ({ title, href, sender, dateStr, isRead }) => {
+            let content = "", attachments = [];
+            
+            try {
+                const msgDoc = await fetchPage(`https://synergia.librus.pl${href}`);
+                const contentDiv = msgDoc.querySelector(".container-message-content");
+                if (contentDiv) {
+                    content = contentDiv.innerHTML
+                        .replace(/<br\\s*\\/?>/gi, '\\n')
+                        .replace(/<a\\s+href="([^"]+)"[^>]*>([^<]+)<\\/a>/gi, '[$2]($1)')
+                        .replace(/<[^>]+>/g, '')
+                        .trim();
+                }
+                
+                const fileRows = msgDoc.querySelectorAll("table tr");
+                let lookingForFiles = false;
+                
+                for (const fileRow of fileRows) {
+                    const td = fileRow.querySelector("td");
+                    if (td && td.textContent.includes("Pliki:")) {
+                        lookingForFiles = true;
+                        continue;
+                    }
+                    if (lookingForFiles && td) {
+                        const img = td.querySelector("img[src*='filetype_icons']");
+                        if (img) {
+                            const fileName = td.textContent.trim();
+                            if (fileName) attachments.push(fileName);
+                        }
+                    }
+                }
+            } catch (e) {
+                content = "[Error fetching content]";
+            }
+            
+            return {
+                title, sender, date: dateStr, isRead,
+                content, attachments: attachments.length > 0 ? attachments : null,
+                href
+            };
+        };
+        
+        const scrapeMessages = async () => {
             console.log("Fetching messages...");
             
             let allMessages = [];
-            let currentPage = 0;
-            let totalPages = 1;
+            let collected = 0;
+            let currentPage = resume.messagesPage;
+            let totalPages = currentPage + 1;
+            let pagesKnown = false;
+            // Messages collected by the interrupted run count towards MAX_MESSAGES
+            const maxMessages = CONFIG.MAX_MESSAGES - resume.messagesCollected;
+            if (currentPage > 0) console.log(`Resuming messages at page ${currentPage + 1}`);
             
-            while (currentPage < totalPages && allMessages.length < CONFIG.MAX_MESSAGES) {
+            while (currentPage < totalPages && collected < maxMessages) {
                 const url = currentPage === 0 
                     ? 'https://synergia.librus.pl/wiadomosci'
                     : `https://synergia.librus.pl/wiadomosci?numer_strony105=${currentPage}&porcjowanie_pojemnik105=105`;
@@ -79,7 +239,8 @@ def get_scraper_js() -> str:
                 console.log(`Page ${currentPage + 1}...`);
                 const doc = await fetchPage(url);
                 
-                if (currentPage === 0) {
+                if (!pagesKnown) {
+                    pagesKnown = true;
                     const paginationText = doc.querySelector('.pagination span')?.textContent || '';
                     const match = paginationText.match(/Strona\\s+\\d+\\s+z\\s+(\\d+)/);
                     if (match) {
@@ -91,8 +252,9 @@ def get_scraper_js() -> str:
                 const rows = doc.querySelectorAll("#formWiadomosci > div > div > table > tbody > tr > td:nth-child(2) > table.decorated.stretch > tbody > tr");
                 console.log(`Found ${rows.length} messages on page`);
                 
+                const pending = [];
                 for (let i = 0; i < rows.length; i++) {
-                    if (allMessages.length >= CONFIG.MAX_MESSAGES) break;
+                    if (collected + pending.length >= maxMessages) break;
                     
                     const row = rows[i];
                     const linkElement = row.querySelector("td:nth-child(4) > a");
@@ -113,62 +275,29 @@ def get_scraper_js() -> str:
                             }
                         }
                         
-                        let content = "", attachments = [];
-                        
-                        try {
-                            const msgDoc = await fetchPage(`https://synergia.librus.pl${href}`);
-                            
-                            const contentDiv = msgDoc.querySelector(".container-message-content");
-                            if (contentDiv) {
-                                content = contentDiv.innerHTML
-                                    .replace(/<br\\s*\\/?>/gi, '\\n')
-                                    .replace(/<a\\s+href="([^"]+)"[^>]*>([^<]+)<\\/a>/gi, '[$2]($1)')
-                                    .replace(/<[^>]+>/g, '')
-                                    .trim();
-                            }
-                            
-                            const fileRows = msgDoc.querySelectorAll("table tr");
-                            let lookingForFiles = false;
-                            
-                            for (const fileRow of fileRows) {
-                                const td = fileRow.querySelector("td");
-                                if (td && td.textContent.includes("Pliki:")) {
-                                    lookingForFiles = true;
-                                    continue;
-                                }
-                                if (lookingForFiles && td) {
-                                    const img = td.querySelector("img[src*='filetype_icons']");
-                                    if (img) {
-                                        const fileName = td.textContent.trim();
-                                        if (fileName) attachments.push(fileName);
-                                    }
-                                }
-                            }
-                        } catch (e) {
-                            content = "[Error fetching content]";
-                        }
-                        
-                        allMessages.push({
-                            title, sender, date: dateStr, isRead,
-                            content, attachments: attachments.length > 0 ? attachments : null,
-                            link: `https://synergia.librus.pl${href}`
-                        });
-                        
-                        await new Promise(r => setTimeout(r, CONFIG.FETCH_DELAY_MS));
+                        pending.push({ title, href, sender, dateStr, isRead });
                     }
                 }
                 
+                // Bodies of one page are fetched concurrently (through the shared limiter), order kept
+                const pageMessages = await Promise.all(pending.map(fetchMessage));
+                collected += pageMessages.length;
                 currentPage++;
+                
+                if (streaming) {
+                    await ingest('messages', pageMessages,
+                        { section: 'messages', page: currentPage, collected: resume.messagesCollected + collected });
+                } else {
+                    allMessages = allMessages.concat(pageMessages);
+                }
             }
             
             data.messages = allMessages;
-            console.log(`Messages: ${data.messages.length} total`);
-        } catch (e) {
-            console.error("Error fetching messages:", e.message);
-        }
+            console.log(`Messages: ${collected} total`);
+        };
         
         // ====== 2. ANNOUNCEMENTS ======
-        try {
+        const scrapeAnnouncements = async () => {
             console.log("Fetching announcements...");
             const doc = await fetchPage('https://synergia.librus.pl/ogloszenia');
             const tables = doc.querySelectorAll("table.decorated.big.center.printable");
@@ -210,12 +339,17 @@ def get_scraper_js() -> str:
             }
             
             console.log(`Announcements: ${data.announcements.length}`);
-        } catch (e) {
-            console.error("Error fetching announcements:", e.message);
-        }
+        };
         
         // ====== 3. GRADES ======
-        try {
+        // Stable grade identity: the id at the end of the grade's details link
+        const gradeId = (element) => {
+            const link = element?.matches?.('a') ? element : element?.querySelector('a');
+            const match = (link?.getAttribute('href') || '').match(/(\\d+)\\/?$/);
+            return match ? match[1] : undefined;
+        };
+        
+        const scrapeGrades = async () => {
             console.log("Fetching grades...");
             // Use current page document (already on grades page)
             const doc = document;
@@ -259,6 +393,7 @@ def get_scraper_js() -> str:
                                 if (grade && grade !== 'Brak ocen' && category && (category.startsWith('Edukacja') || category.startsWith('Rozwój'))) {
                                     hasNestedGrades = true;
                                     data.grades.push({
+                                        id: gradeId(gradeCells[0]),
                                         subject: category,
                                         grade,
                                         date: date || "",
@@ -295,6 +430,7 @@ def get_scraper_js() -> str:
                                 const grade = gradeLink.textContent.trim();
                                 if (grade && grade !== '-') {
                                     data.grades.push({
+                                        id: gradeId(gradeLink),
                                         subject,
                                         grade,
                                         date: "",
@@ -316,11 +452,13 @@ def get_scraper_js() -> str:
                                 const grade = link.textContent.trim();
                                 const title = link.getAttribute('title') || '';
                                 
-                                // Parse title for category, date, teacher
+                                // Parse title for category, date, teacher, weight
                                 let category = '';
                                 let date = '';
                                 let teacher = '';
                                 let comment = '';
+                                let weight = '';
+                                let counted = true;
                                 
                                 if (title) {
                                     const lines = title.split('<br>').map(l => l.replace('<br/>', '').trim());
@@ -333,17 +471,23 @@ def get_scraper_js() -> str:
                                             teacher = line.substring(11).trim();
                                         } else if (line.startsWith('Komentarz:')) {
                                             comment = line.substring(10).trim();
+                                        } else if (line.startsWith('Waga:')) {
+                                            weight = line.substring(5).trim();
+                                        } else if (line.startsWith('Licz do średniej:')) {
+                                            counted = !line.substring(17).trim().startsWith('nie');
                                         }
                                     }
                                 }
                                 
                                 if (grade) {
                                     data.grades.push({
+                                        id: gradeId(link),
                                         subject,
                                         grade,
                                         date,
                                         category,
-                                        weight: "",
+                                        // Grades left out of the average weigh nothing
+                                        weight: counted ? weight : "0",
                                         teacher,
                                         comment
                                     });
@@ -354,6 +498,15 @@ def get_scraper_js() -> str:
                 }
             }
             
+            // Grades without a link are told apart from lookalikes (same subject,
+            // teacher, date and category) by their position on the page
+            const slots = {};
+            for (const grade of data.grades) {
+                if (grade.id) continue;
+                const key = [grade.subject, grade.teacher, grade.date, grade.category].join('|');
+                grade.slot = slots[key] = (slots[key] || 0) + 1;
+            }
+            
             // Extract descriptive grade (ocena opisowa) - for primary school
             const descriptiveTables = doc.querySelectorAll("table.decorated.stretch");
             for (const table of descriptiveTables) {
@@ -379,65 +532,64 @@ def get_scraper_js() -> str:
                     }
                 }
             }
-        } catch (e) {
-            console.error("Error fetching grades:", e.message);
-        }
+        };
         
         // ====== 4. CALENDAR ======
-        try {
+        const fetchCalendarMonth = async (offset) => {
             const today = new Date();
+            const date = new Date(today.getFullYear(), today.getMonth() + offset, 1);
+            const year = date.getFullYear();
+            const month = String(date.getMonth() + 1).padStart(2, '0');
+            const events = [];
             
-            for (let offset = 0; offset <= CONFIG.CALENDAR_MONTHS_AHEAD; offset++) {
-                const date = new Date(today.getFullYear(), today.getMonth() + offset, 1);
-                const year = date.getFullYear();
-                const month = String(date.getMonth() + 1).padStart(2, '0');
-                
-                const doc = await fetchPage(`https://synergia.librus.pl/terminarz?rok=${year}&miesiac=${month}`);
-                const rows = doc.querySelectorAll(".line0, .line1");
+            const doc = await fetchPage(`https://synergia.librus.pl/terminarz?rok=${year}&miesiac=${month}`);
+            const rows = doc.querySelectorAll(".line0, .line1");
+            
+            for (const row of rows) {
+                const cells = row.querySelectorAll("td");
                 
-                for (const row of rows) {
-                    const cells = row.querySelectorAll("td");
+                for (const cell of cells) {
+                    const text = cell.textContent.trim();
+                    if (!text) continue;
                     
-                    for (const cell of cells) {
-                        const text = cell.textContent.trim();
-                        if (!text) continue;
-                        
-                        // Extract day number (first digits)
-                        const dayMatch = text.match(/^(\d{1,2})/);
-                        if (!dayMatch) continue;
+                    // Extract day number (first digits)
+                    const dayMatch = text.match(/^(\\d{1,2})/);
+                    if (!dayMatch) continue;
+                    
+                    const day = dayMatch[1];
+                    const eventText = text.substring(day.length).trim();
+                    
+                    if (eventText) {
+                        const eventDate = `${year}-${month}-${day.padStart(2, '0')}`;
                         
-                        const day = dayMatch[1];
-                        const eventText = text.substring(day.length).trim();
+                        // Parse event text (format: "Title: Category" or just "Title")
+                        const parts = eventText.split(':');
+                        const title = parts.length > 1 ? parts.slice(0, -1).join(':').trim() : eventText;
+                        const category = parts.length > 1 ? parts[parts.length - 1].trim() : '';
                         
-                        if (eventText) {
-                            const eventDate = `${year}-${month}-${day.padStart(2, '0')}`;
-                            
-                            // Parse event text (format: "Title: Category" or just "Title")
-                            const parts = eventText.split(':');
-                            const title = parts.length > 1 ? parts.slice(0, -1).join(':').trim() : eventText;
-                            const category = parts.length > 1 ? parts[parts.length - 1].trim() : '';
-                            
-                            data.calendar.push({
-                                date: eventDate,
-                                title,
-                                category
-                            });
-                        }
+                        events.push({
+                            date: eventDate,
+                            title,
+                            category
+                        });
                     }
                 }
-                
-                await new Promise(r => setTimeout(r, CONFIG.FETCH_DELAY_MS));
             }
-        } catch (e) {
-            console.error("Error fetching calendar:", e.message);
-        }
+            return events;
+        };
+        
+        const scrapeCalendar = async () => {
+            const offsets = Array.from({ length: CONFIG.CALENDAR_MONTHS_AHEAD + 1 }, (_, i) => i);
+            const months = await Promise.all(offsets.map(fetchCalendarMonth));
+            data.calendar = months.flat();
+        };
         
         // ====== 5. HOMEWORK ======
         // NOTE: Homework is scraped via Python (POST form) - see scraper.py
         console.log("Homework will be scraped via Python");
         
         // ====== 6. REMARKS/NOTES ======
-        try {
+        const scrapeRemarks = async () => {
             console.log("Fetching remarks...");
             const doc = await fetchPage('https://synergia.librus.pl/uwagi');
             const rows = doc.querySelectorAll("table.decorated tbody tr");
@@ -462,79 +614,66 @@ def get_scraper_js() -> str:
                 }
             }
             console.log(`Remarks: ${data.remarks?.length || 0}`);
-        } catch (e) {
-            console.error("Error fetching remarks:", e.message);
-        }
-        
-        // ====== GENERATE MARKDOWN ======
-        let md = `# Librus Data - ${data.messages[0]?.sender.split(' ')[0] || 'Student'}\\n`;
-        md += `**Collection date:** ${data.collectionDate}\\n\\n`;
-        
-        md += `## Messages (${data.messages.length})\\n\\n`;
-        data.messages.forEach((m, i) => {
-            md += `### ${m.isRead ? '[READ]' : '[NEW]'} ${i + 1}. ${m.title}\\n`;
-            md += `- **From:** ${m.sender}\\n`;
-            md += `- **Date:** ${m.date}\\n`;
-            if (m.attachments) md += `- **Attachments:** ${m.attachments.join(', ')}\\n`;
-            md += `\\n**Content:**\\n${m.content}\\n\\n---\\n\\n`;
-        });
-        
-        md += `## Announcements (${data.announcements.length})\\n\\n`;
-        data.announcements.forEach((a, i) => {
-            md += `### ${i + 1}. ${a.title}\\n`;
-            md += `- **Date:** ${a.date}\\n`;
-            md += `- **Author:** ${a.author}\\n\\n`;
-            md += `${a.content}\\n\\n---\\n\\n`;
-        });
-        
-        md += `## Grades (${data.grades.length})\\n\\n`;
-        const gradesBySubject = {};
-        data.grades.forEach(g => {
-            if (!gradesBySubject[g.subject]) gradesBySubject[g.subject] = [];
-            gradesBySubject[g.subject].push(g);
-        });
-        
-        for (const [subject, grades] of Object.entries(gradesBySubject)) {
-            md += `### ${subject}\\n\\n`;
-            grades.forEach(g => {
-                md += `- **${g.grade}** (${g.category}, weight: ${g.weight}) - ${g.date}\\n`;
-            });
-            md += `\\n`;
-        }
+        };
         
-        md += `## Calendar (${data.calendar.length})\\n\\n`;
-        data.calendar.forEach(e => {
-            md += `- **${e.date}** - ${e.title} (${e.category})\\n`;
-        });
+        // ====== RUN SECTIONS ======
+        // Independent sections run concurrently; a failing or slow section
+        // doesn't hold back or lose the others
+        const sectionTasks = {
+            messages: scrapeMessages,
+            announcements: scrapeAnnouncements,
+            grades: scrapeGrades,
+            calendar: scrapeCalendar,
+            remarks: scrapeRemarks
+        };
+        const sectionNames = Object.keys(sectionTasks);
+        const sections = {};
         
-        md += `## Homework (${data.homework?.length || 0})\\n\\n`;
-        (data.homework || []).forEach((h, i) => {
-            md += `### ${i + 1}. ${h.subject} - ${h.title}\\n`;
-            md += `- **Teacher:** ${h.teacher}\\n`;
-            md += `- **Category:** ${h.category}\\n`;
-            md += `- **Added:** ${h.dateAdded}\\n`;
-            md += `- **Due:** ${h.dateDue}\\n\\n`;
-        });
+        const settled = await Promise.allSettled(sectionNames.map(async (name) => {
+            const started = performance.now();
+            if (resume.sectionsDone.includes(name)) {
+                sections[name] = { ms: 0, resumed: true };
+                return;
+            }
+            try {
+                await sectionTasks[name]();
+                if (streaming) {
+                    // Section key = record kind; messages were streamed page by page
+                    await ingest(name, data[name] || [], { section: name, done: true },
+                        name === 'grades' ? { descriptiveGrade: data.descriptiveGrade } : {});
+                    data[name] = [];
+                }
+            } finally {
+                sections[name] = { ms: Math.round(performance.now() - started) };
+            }
+        }));
         
-        md += `## Remarks/Notes (${data.remarks?.length || 0})\\n\\n`;
-        (data.remarks || []).forEach((r, i) => {
-            md += `### ${i + 1}. ${r.category}\\n`;
-            md += `- **Date:** ${r.date}\\n`;
-            md += `- **Teacher:** ${r.teacher}\\n`;
-            md += `- **Content:** ${r.content}\\n\\n`;
+        settled.forEach((outcome, i) => {
+            const name = sectionNames[i];
+            if (outcome.status === 'fulfilled') {
+                sections[name].status = 'ok';
+            } else {
+                sections[name].status = 'error';
+                sections[name].error = outcome.reason?.message || String(outcome.reason);
+                console.error(`Error fetching ${name}:`, sections[name].error);
+            }
         });
         
+        // ====== COMPACT PAYLOAD ======
+        // Only structured records cross the IPC boundary (none left when
+        // streaming). Markdown and stats are produced in Python (see scraper.py).
         return {
-            markdown: md,
-            rawData: data,
-            stats: {
-                messages: data.messages.length,
-                announcements: data.announcements.length,
-                grades: data.grades.length,
-                calendar: data.calendar.length,
-                homework: data.homework?.length || 0,
-                remarks: data.remarks?.length || 0
-            }
+            rawData: {
+                collectionDate: data.collectionDate,
+                isFirstTime: data.isFirstTime,
+                descriptiveGrade: data.descriptiveGrade,
+                messages: compact(data.messages),
+                announcements: compact(data.announcements),
+                grades: compact(data.grades),
+                calendar: compact(data.calendar),
+                remarks: compact(data.remarks)
+            },
+            sections
         };
     }
     """
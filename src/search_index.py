@@ -0,0 +1,320 @@
+"""Full-text search over messages, announcements, remarks and homework.
+
+Each child has an SQLite FTS5 index (search.sqlite in the child directory)
+maintained incrementally at ingest time by storage.save_monthly_data().
+Text is normalized Polish-aware before indexing and querying: lowercased,
+diacritics folded (ą->a, ł->l, ...) and common inflection suffixes
+stripped, so "wycieczka", "wycieczki" and "wycieczkę" match each other.
+"""
+import functools
+import hashlib
+import re
+import sqlite3
+import unicodedata
+from contextlib import closing
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .blob_store import resolve_content
+from .child_registry import child_registry
+
+
+INDEX_FILE = "search.sqlite"
+
+SEARCHABLE_KINDS = ("messages", "announcements", "remarks", "homework")
+
+# Suffixes stripped once (longest first), keeping at least MIN_STEM_LENGTH chars
+POLISH_SUFFIXES = frozenset([
+    "owania", "owanie", "owaniu", "ami", "ach", "ego", "emu", "ymi", "imi",
+    "ych", "ich", "owi", "om", "ow", "em", "ie", "ia", "y", "i", "a", "e", "o", "u",
+])
+
+_SUFFIX_LENGTHS = sorted({len(suffix) for suffix in POLISH_SUFFIXES}, reverse=True)
+
+MIN_STEM_LENGTH = 4
+
+# bm25 column weights: (title, body)
+TITLE_WEIGHT = 3.0
+BODY_WEIGHT = 1.0
+
+SNIPPET_WORDS = 12
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# ł/Ł have no Unicode decomposition, fold them explicitly
+_FOLD_TABLE = str.maketrans({"ł": "l", "Ł": "L"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_key TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    date TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_kind_date ON documents(kind, date);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(title, body, tokenize='unicode61');
+"""
+
+
+def fold_diacritics(text: str) -> str:
+    """Lowercase and strip diacritics ('Wycieczkę' -> 'wycieczke')"""
+    decomposed = unicodedata.normalize("NFKD", text.translate(_FOLD_TABLE).lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+@functools.lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """Strip one common Polish inflection suffix from a folded token"""
+    for length in _SUFFIX_LENGTHS:
+        if len(token) - length >= MIN_STEM_LENGTH and token[-length:] in POLISH_SUFFIXES:
+            return token[:-length]
+    return token
+
+
+def analyze(text: str) -> List[str]:
+    """Tokenize, fold and stem text for indexing/querying"""
+    return [stem(word) for word in WORD_PATTERN.findall(fold_diacritics(text or ""))]
+
+
+def _record_fields(kind: str, item: Dict) -> Tuple[str, str, str]:
+    """Map a stored record to (date, title, body) for indexing"""
+    if kind == "messages":
+        return item.get("date", ""), item.get("title", ""), item.get("content", "")
+    if kind == "announcements":
+        return item.get("date", ""), item.get("title", ""), item.get("content", "")
+    if kind == "remarks":
+        return item.get("date", ""), item.get("category", ""), item.get("content", "")
+    # homework
+    date = item.get("dateDue") or item.get("dateAdded", "")
+    return date, f"{item.get('subject', '')} - {item.get('title', '')}", item.get("category", "")
+
+
+def _doc_key(kind: str, item: Dict) -> str:
+    if kind == "messages":
+        parts = (item.get("date"), item.get("sender"), item.get("title"))
+    elif kind == "homework":
+        parts = (item.get("subject"), item.get("title"), item.get("dateAdded"), item.get("dateDue"))
+    elif kind == "remarks":
+        parts = (item.get("date"), item.get("teacher"), item.get("content"))
+    else:
+        parts = (item.get("date"), item.get("title"))
+    return kind + ":" + hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+def _connect(child_name: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(child_registry.child_dir(child_name) / INDEX_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def iter_searchable_records(result: Dict) -> Iterator[Tuple[str, Dict]]:
+    """Yield (kind, record) pairs from a scrape result ({'rawData': ..., 'homework': ...})"""
+    raw = result.get("rawData") or {}
+    for kind in SEARCHABLE_KINDS:
+        items = result.get("homework") if kind == "homework" else raw.get(kind)
+        for item in items or []:
+            yield kind, item
+
+
+def index_records(child_name: str, records: Iterable[Tuple[str, Dict]]) -> int:
+    """
+    Add or update records in the child's index.
+
+    Unchanged records (same key and content) are skipped.
+
+    Returns:
+        Number of documents inserted or updated
+    """
+    changed = 0
+    with closing(_connect(child_name)) as conn, conn:
+        for kind, item in records:
+            if "content_ref" in item and "content" not in item:
+                # Stored message - body lives in the blob store
+                item = dict(item, content=resolve_content(child_name, item))
+            date, title, body = _record_fields(kind, item)
+            date = (date or "")[:10]
+            doc_key = _doc_key(kind, item)
+            content_hash = hashlib.sha1(f"{date}\x1f{title}\x1f{body}".encode("utf-8")).hexdigest()
+
+            row = conn.execute(
+                "SELECT id, content_hash FROM documents WHERE doc_key = ?", (doc_key,)
+            ).fetchone()
+            if row and row[1] == content_hash:
+                continue
+
+            if row:
+                doc_id = row[0]
+                conn.execute(
+                    "UPDATE documents SET date = ?, title = ?, body = ?, content_hash = ? WHERE id = ?",
+                    (date, title, body, content_hash, doc_id)
+                )
+            else:
+                doc_id = conn.execute(
+                    "INSERT INTO documents (doc_key, kind, date, title, body, content_hash) VALUES (?, ?, ?, ?, ?, ?)",
+                    (doc_key, kind, date, title, body, content_hash)
+                ).lastrowid
+
+            conn.execute(
+                "INSERT OR REPLACE INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)",
+                (doc_id, " ".join(analyze(title)), " ".join(analyze(body)))
+            )
+            changed += 1
+    return changed
+
+
+def forget(child_name: str, kind: str, items: Iterable[Dict]) -> int:
+    """Drop records deleted from storage from the index"""
+    if kind not in SEARCHABLE_KINDS or not has_index(child_name):
+        return 0
+    removed = 0
+    with closing(_connect(child_name)) as conn, conn:
+        for item in items:
+            row = conn.execute("SELECT id FROM documents WHERE doc_key = ?", (_doc_key(kind, item),)).fetchone()
+            if row:
+                conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (row[0],))
+                conn.execute("DELETE FROM documents WHERE id = ?", (row[0],))
+                removed += 1
+    return removed
+
+
+def index_scrape_result(child_name: str, result: Dict) -> int:
+    """Index everything searchable in one scrape result"""
+    return index_records(child_name, iter_searchable_records(result))
+
+
+def rebuild_index(child_name: str) -> int:
+    """Index all stored months for a child (used when the index doesn't exist yet)"""
+    from .storage import iter_stored_months
+
+    count = 0
+    for month_data in iter_stored_months(child_name):
+        count += index_scrape_result(child_name, month_data.get("data") or {})
+    return count
+
+
+def has_index(child_name: str) -> bool:
+    """True if the child already has a search index file"""
+    return (child_registry.child_dir(child_name) / INDEX_FILE).exists()
+
+
+def ingest(child_name: str, result: Dict) -> int:
+    """
+    Update the index after a month was saved.
+
+    The first ingest for a child backfills every stored month (including
+    the one just written); later ingests only index the new scrape result.
+    """
+    if not has_index(child_name):
+        return rebuild_index(child_name)
+    return index_scrape_result(child_name, result)
+
+
+def _snippet(text: str, query_stems: List[str]) -> str:
+    """Window of words around the first query match, matches in **bold**"""
+    words = WORD_PATTERN.findall(text)
+    if not words:
+        return ""
+
+    hits = [i for i, word in enumerate(words) if any(stem(fold_diacritics(word)).startswith(q) for q in query_stems)]
+    first = hits[0] if hits else 0
+    start = max(0, first - SNIPPET_WORDS // 2)
+    end = min(len(words), start + SNIPPET_WORDS)
+    hit_set = set(hits)
+
+    parts = [f"**{words[i]}**" if i in hit_set else words[i] for i in range(start, end)]
+    prefix = "… " if start > 0 else ""
+    suffix = " …" if end < len(words) else ""
+    return prefix + " ".join(parts) + suffix
+
+
+def _filters(query_stems: List[str], kinds: Optional[List[str]], date_from: Optional[str],
+             date_to: Optional[str]) -> Tuple[str, List]:
+    """WHERE clause (and its parameters) shared by search and count_matches"""
+    match = " ".join(f'"{term}"*' for term in query_stems)
+    sql = ["WHERE documents_fts MATCH ?"]
+    params: List = [match]
+    if kinds:
+        sql.append(f"AND d.kind IN ({', '.join('?' for _ in kinds)})")
+        params.extend(kinds)
+    if date_from:
+        sql.append("AND d.date >= ?")
+        params.append(date_from)
+    if date_to:
+        sql.append("AND d.date <= ?")
+        params.append(date_to)
+    return " ".join(sql), params
+
+
+def search(
+    child_name: str,
+    query: str,
+    kinds: Optional[List[str]] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: int = 20
+) -> List[Dict]:
+    """
+    BM25-ranked search in one child's index.
+
+    Args:
+        child_name: Child name or alias
+        query: Free text, all terms must match (prefix match on stems)
+        kinds: Restrict to these record kinds (default: all searchable)
+        date_from: Inclusive lower bound, YYYY-MM-DD
+        date_to: Inclusive upper bound, YYYY-MM-DD
+        limit: Max results
+
+    Returns:
+        List of dicts with kind, date, title, snippet and score (lower is better)
+    """
+    query_stems = analyze(query)
+    if not query_stems:
+        return []
+    if not has_index(child_name):
+        rebuild_index(child_name)
+
+    where, params = _filters(query_stems, kinds, date_from, date_to)
+    sql = [
+        "SELECT d.kind, d.date, d.title, d.body, bm25(documents_fts, ?, ?) AS score",
+        "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid",
+        where,
+        "ORDER BY score LIMIT ?"
+    ]
+    params = [TITLE_WEIGHT, BODY_WEIGHT, *params, limit]
+
+    with closing(_connect(child_name)) as conn:
+        rows = conn.execute(" ".join(sql), params).fetchall()
+
+    return [
+        {
+            "kind": kind,
+            "date": date,
+            "title": title,
+            "snippet": _snippet(body, query_stems) or _snippet(title, query_stems),
+            "score": round(score, 4)
+        }
+        for kind, date, title, body, score in rows
+    ]
+
+
+def count_matches(
+    child_name: str,
+    query: str,
+    kinds: Optional[List[str]] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+) -> int:
+    """Number of records search() would find without a limit"""
+    query_stems = analyze(query)
+    if not query_stems:
+        return 0
+    if not has_index(child_name):
+        rebuild_index(child_name)
+
+    where, params = _filters(query_stems, kinds, date_from, date_to)
+    sql = f"SELECT COUNT(*) FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid {where}"
+    with closing(_connect(child_name)) as conn:
+        return conn.execute(sql, params).fetchone()[0]
@@ -1,27 +1,101 @@
 """File storage management"""
 import json
+import os
 import pickle
+import re
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
-from .config import config
+from typing import Dict, Iterator, List, Optional, Tuple
 from .credentials import resolve_child_name
+from .child_registry import child_registry, BROWSER_CONTEXT_DIR
+from .blob_store import put_many, with_content
+from .change_log import append as append_changes, content_fingerprint
+from .classifier import classify_result
+
+try:
+    import fcntl
+except ImportError:  # Windows - no advisory locks, atomic rename still applies
+    fcntl = None
+
+
+# Lock files held by the current thread (makes child_lock reentrant)
+_held_locks = threading.local()
 
 
 def get_child_dir(child_name: str) -> Path:
-    """Get storage directory for a child"""
-    canonical_name = resolve_child_name(child_name)
-    safe_name = canonical_name.lower().replace(" ", "-")
-    child_dir = config.data_dir / safe_name
-    child_dir.mkdir(parents=True, exist_ok=True)
-    return child_dir
+    """Get storage directory for a child (memoized, created once)"""
+    return child_registry.child_dir(child_name)
+
+
+@contextmanager
+def child_lock(child_name: str) -> Iterator[None]:
+    """
+    Exclusive advisory lock on a child's data directory.
+    
+    Held around every write (and read-modify-write) so parallel scrapes,
+    background jobs and other server processes sharing the data directory
+    don't interleave updates. Reentrant within a thread, so a caller can
+    hold it around load + save_* calls.
+    """
+    lock_file = get_child_dir(child_name) / ".lock"
+    held = _held_locks.__dict__.setdefault("paths", set())
+    if lock_file in held:
+        yield
+        return
+    
+    with open(lock_file, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        held.add(lock_file)
+        try:
+            yield
+        finally:
+            held.discard(lock_file)
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """
+    Write file atomically: temp file in the same directory, fsync, rename.
+    
+    Readers see either the old or the new content, never a truncated file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    
+    # Persist the rename itself
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def atomic_write_json(path: Path, data, indent: Optional[int] = 2):
+    """Atomically write data as UTF-8 JSON"""
+    atomic_write_bytes(path, json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8'))
 
 
 def get_context_dir(child_name: str) -> Path:
     """Get browser context directory for a child"""
-    context_dir = get_child_dir(child_name) / "browser_context"
-    context_dir.mkdir(exist_ok=True)
-    return context_dir
+    return child_registry.child_dir(child_name, BROWSER_CONTEXT_DIR)
 
 
 def load_state(child_name: str) -> Dict:
@@ -41,15 +115,15 @@ def load_state(child_name: str) -> Dict:
 def save_state(child_name: str, state: Dict):
     """Save scraping state for a child"""
     state_file = get_child_dir(child_name) / "state.json"
-    with open(state_file, 'w', encoding='utf-8') as f:
-        json.dump(state, f, indent=2, ensure_ascii=False)
+    with child_lock(child_name):
+        atomic_write_json(state_file, state)
 
 
 def save_scrape_result(child_name: str, markdown: str):
     """Save scraped data as markdown"""
     output_file = get_child_dir(child_name) / "latest.md"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(markdown)
+    with child_lock(child_name):
+        atomic_write_bytes(output_file, markdown.encode('utf-8'))
 
 
 def load_memory(child_name: str) -> Dict:
@@ -71,8 +145,8 @@ def load_memory(child_name: str) -> Dict:
 def save_memory(child_name: str, memory: Dict):
     """Save memory/trends for a child"""
     memory_file = get_child_dir(child_name) / "memory.json"
-    with open(memory_file, 'w', encoding='utf-8') as f:
-        json.dump(memory, f, indent=2, ensure_ascii=False)
+    with child_lock(child_name):
+        atomic_write_json(memory_file, memory)
 
 
 def get_last_scan_date(child_name: str) -> Optional[str]:
@@ -81,65 +155,401 @@ def get_last_scan_date(child_name: str) -> Optional[str]:
     return state.get("last_scrape_iso")
 
 
+# Record lists stored per partition (homework next to the JS result, the rest in rawData)
+RECORD_KINDS = ['messages', 'announcements', 'grades', 'calendar', 'remarks', 'homework']
+
+_MONTH_PATTERN = re.compile(r'^(\d{4})-(\d{2})')
+
+
+def grade_identity(item: Dict) -> str:
+    """
+    Stable identity of a grade, independent of its value.
+    
+    The id of the grade's details link when the page had one, otherwise
+    subject/teacher/date/category plus the grade's position among grades
+    sharing those (slot) - so a corrected grade replaces the old value.
+    """
+    if item.get('id'):
+        return f"id:{item['id']}"
+    return f"{item.get('subject')}_{item.get('teacher')}_{item.get('date')}_{item.get('category')}_{item.get('slot')}"
+
+
+def _legacy_grade_key(item: Dict) -> str:
+    """Signature grades were stored under before grade_identity"""
+    return f"{item.get('subject')}_{item.get('grade')}_{item.get('date')}_{item.get('category')}"
+
+
+def _is_legacy_grade(item: Dict) -> bool:
+    return not (item.get('id') or item.get('slot'))
+
+
+def record_signature(kind: str, item: Dict) -> str:
+    """Identity of a record used to deduplicate merges (same fields as the search index keys)"""
+    if kind == 'grades':
+        return grade_identity(item)
+    if kind == 'messages':
+        return f"{item.get('date')}_{item.get('sender')}_{item.get('title') or item.get('subject')}"
+    if kind == 'calendar':
+        return f"{item.get('date')}_{item.get('title')}_{item.get('category')}"
+    if kind == 'remarks':
+        return f"{item.get('date')}_{item.get('teacher')}_{item.get('content')}"
+    if kind == 'homework':
+        return f"{item.get('subject')}_{item.get('title')}_{item.get('dateAdded')}_{item.get('dateDue')}"
+    # announcements
+    return f"{item.get('date')}_{item.get('title')}"
+
+
+def record_date(kind: str, item: Dict) -> str:
+    """The date a record is about: due date for homework, event/grade/message date otherwise"""
+    if kind == 'homework':
+        return item.get('dateDue') or item.get('dateAdded') or ''
+    return item.get('date') or ''
+
+
+def record_month(kind: str, item: Dict) -> Optional[Tuple[int, int]]:
+    """(year, month) partition of a record, None if it has no parseable date"""
+    match = _MONTH_PATTERN.match(record_date(kind, item))
+    if not match:
+        return None
+    year, month = int(match.group(1)), int(match.group(2))
+    return (year, month) if 1 <= month <= 12 else None
+
+
+def _get_records(result: Dict, kind: str) -> list:
+    if kind == 'homework':
+        return result.get('homework') or []
+    return (result.get('rawData') or {}).get(kind) or []
+
+
+def _set_records(result: Dict, kind: str, records: list):
+    if kind == 'homework':
+        result['homework'] = records
+    else:
+        result.setdefault('rawData', {})[kind] = records
+
+
+def _get_or_create(result: Dict, kind: str) -> list:
+    records = _get_records(result, kind)
+    if not records:
+        records = []
+        _set_records(result, kind, records)
+    return records
+
+
+def partition_result(result: Dict, fallback: Tuple[int, int]) -> Dict[Tuple[int, int], Dict]:
+    """
+    Split a scrape result into per-month results keyed by each record's own date.
+    
+    Records without a usable date (e.g. semester grades) and everything that
+    isn't a record list (stats, descriptive grade) go to the fallback month -
+    the month of the scrape.
+    """
+    partitions: Dict[Tuple[int, int], Dict] = {}
+    
+    # markdown repeats every message body and is kept in latest.md instead
+    base = {k: v for k, v in result.items() if k not in ('rawData', 'homework', 'markdown')}
+    base['rawData'] = {k: v for k, v in (result.get('rawData') or {}).items() if k not in RECORD_KINDS}
+    partitions[fallback] = base
+    
+    for kind in RECORD_KINDS:
+        for item in _get_records(result, kind):
+            key = record_month(kind, item) or fallback
+            part = partitions.setdefault(key, {'rawData': {}})
+            _get_or_create(part, kind).append(item)
+    return partitions
+
+
+def save_scrape_data(child_name: str, result: Dict, mode: str, scraped_at: datetime,
+                     refresh_views: bool = True) -> list:
+    """
+    Store a scrape result partitioned by record date.
+    
+    Every record lands in the month it is about (homework by due date,
+    calendar by event date, grades/messages/remarks by their date) and is
+    upserted there, so each record is stored exactly once no matter how
+    many scrapes saw it. Checkpoints of a running scrape pass
+    refresh_views=False and leave the views to the final save.
+    
+    Returns:
+        Sorted list of (year, month) partitions written
+    """
+    partitions = partition_result(result, (scraped_at.year, scraped_at.month))
+    with child_lock(child_name):
+        for (year, month), part in sorted(partitions.items()):
+            _save_monthly_data_locked(child_name, year, month, {
+                "timestamp": scraped_at.isoformat(),
+                "data": part,
+                "mode": mode
+            }, merge=True)
+        _update_search_index(child_name, result)
+        if refresh_views:
+            _update_views(child_name)
+    return sorted(partitions)
+
+
 def save_monthly_data(child_name: str, year: int, month: int, data: Dict) -> None:
     """Save data for specific month in pickle format. For DELTA mode, merge with existing data."""
+    with child_lock(child_name):
+        _save_monthly_data_locked(child_name, year, month, data)
+        _update_search_index(child_name, data.get('data') or {})
+        _update_views(child_name)
+
+
+def _update_search_index(child_name: str, result: Dict) -> None:
+    """Index newly scraped records; a broken index must not fail the ingest"""
+    from .search_index import ingest
+    try:
+        ingest(child_name, result)
+    except Exception as e:
+        print(f"Search index update failed for {child_name}: {e}", file=sys.stderr)
+
+
+def _forget_in_search_index(child_name: str, kind: str, items: list) -> None:
+    from .search_index import forget
+    try:
+        forget(child_name, kind, items)
+    except Exception as e:
+        print(f"Search index update failed for {child_name}: {e}", file=sys.stderr)
+
+
+def _update_views(child_name: str) -> None:
+    """Rematerialize summary views; on failure they are rebuilt on next read"""
+    from .views import invalidate, materialize
+    try:
+        materialize(child_name)
+    except Exception as e:
+        invalidate(child_name)
+        print(f"Views update failed for {child_name}: {e}", file=sys.stderr)
+
+
+def _merge_results(existing: Dict, new: Dict, changes: Optional[list] = None):
+    """
+    Upsert new records into an existing month result (in place).
+    
+    A record with the same signature replaces the stored one (newest
+    scrape wins), others are appended. Non-record fields (stats,
+    descriptive grade) are taken from the new result when present.
+    Added and modified records are appended to changes as
+    (kind, op, signature, record) for the change log.
+    """
+    for kind in RECORD_KINDS:
+        new_items = _get_records(new, kind)
+        if not new_items:
+            continue
+        
+        existing_items = list(_get_records(existing, kind))
+        positions = {record_signature(kind, item): i for i, item in enumerate(existing_items)}
+        # Grades stored before grade_identity take the identity of their rescrape
+        legacy = {_legacy_grade_key(item): i for i, item in enumerate(existing_items)
+                  if kind == 'grades' and _is_legacy_grade(item)}
+        for item in new_items:
+            sig = record_signature(kind, item)
+            if sig not in positions and legacy:
+                position = legacy.pop(_legacy_grade_key(item), None)
+                if position is not None:
+                    positions[sig] = position
+            if sig in positions:
+                old = existing_items[positions[sig]]
+                if changes is not None and content_fingerprint(old) != content_fingerprint(item):
+                    changes.append((kind, 'modified', sig, item))
+                existing_items[positions[sig]] = item
+            else:
+                if changes is not None:
+                    changes.append((kind, 'added', sig, item))
+                positions[sig] = len(existing_items)
+                existing_items.append(item)
+        _set_records(existing, kind, existing_items)
+    
+    for key, value in new.items():
+        if key not in ('rawData', 'homework'):
+            existing[key] = value
+    existing_raw = existing.setdefault('rawData', {})
+    for key, value in (new.get('rawData') or {}).items():
+        if key not in RECORD_KINDS and value:
+            existing_raw[key] = value
+
+
+def _save_monthly_data_locked(child_name: str, year: int, month: int, data: Dict, merge: bool = False) -> None:
+    """Merge and write month pickle - caller holds child_lock"""
     child_dir = get_child_dir(child_name)
     monthly_file = child_dir / f"{year}-{month:02d}.pkl"
     
-    # For DELTA mode, merge with existing data
-    if data.get('mode') == 'delta' and monthly_file.exists():
+    existing = None
+    if monthly_file.exists():
         with open(monthly_file, 'rb') as f:
             existing = pickle.load(f)
-        
-        # Merge rawData arrays with deduplication
+    
+    changes = []
+    # DELTA mode (and partitioned ingest) merge with existing data
+    if (merge or data.get('mode') == 'delta') and existing is not None:
         if 'data' in existing and 'data' in data:
-            existing_raw = existing['data'].get('rawData', {})
-            new_raw = data['data'].get('rawData', {})
-            
-            # Merge arrays (messages, announcements, grades, calendar) with deduplication
-            for key in ['messages', 'announcements', 'grades', 'calendar']:
-                if key in new_raw and new_raw[key]:
-                    existing_items = existing_raw.get(key, [])
-                    new_items = new_raw[key]
-                    
-                    # Deduplicate based on content
-                    # Create set of existing item signatures
-                    existing_sigs = set()
-                    for item in existing_items:
-                        # Create signature from key fields
-                        if key == 'grades':
-                            sig = f"{item.get('subject')}_{item.get('grade')}_{item.get('date')}_{item.get('category')}"
-                        elif key == 'messages':
-                            sig = f"{item.get('date')}_{item.get('sender')}_{item.get('subject')}"
-                        elif key == 'calendar':
-                            sig = f"{item.get('date')}_{item.get('title')}_{item.get('category')}"
-                        else:  # announcements
-                            sig = f"{item.get('date')}_{item.get('title')}"
-                        existing_sigs.add(sig)
-                    
-                    # Add only new items
-                    for item in new_items:
-                        if key == 'grades':
-                            sig = f"{item.get('subject')}_{item.get('grade')}_{item.get('date')}_{item.get('category')}"
-                        elif key == 'messages':
-                            sig = f"{item.get('date')}_{item.get('sender')}_{item.get('subject')}"
-                        elif key == 'calendar':
-                            sig = f"{item.get('date')}_{item.get('title')}_{item.get('category')}"
-                        else:  # announcements
-                            sig = f"{item.get('date')}_{item.get('title')}"
-                        
-                        if sig not in existing_sigs:
-                            existing_items.append(item)
-                            existing_sigs.add(sig)
-                    
-                    existing_raw[key] = existing_items
+            _merge_results(existing['data'], data['data'], changes)
             
             # Update timestamp
             existing['timestamp'] = data['timestamp']
             data = existing
+    elif data.get('data'):
+        # Whole month replaced - diff against what it replaces
+        previous = (existing or {}).get('data') or {}
+        replaced = {'rawData': {}}
+        _merge_results(replaced, previous)
+        _merge_results(replaced, data['data'], changes)
+        changes.extend(_removed_records(previous, data['data']))
+    
+    # Tag messages/remarks once at ingest (merged months get new records too)
+    if data.get('data'):
+        classify_result(data['data'], force=True, child_name=child_name)
+        data = _externalize_bodies(child_name, data)
+    
+    atomic_write_bytes(monthly_file, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    _log_changes(child_name, changes)
+
+
+def _removed_records(previous: Dict, current: Dict) -> list:
+    """(kind, 'removed', signature, record) for records of previous missing from current"""
+    removed = []
+    for kind in RECORD_KINDS:
+        kept = {record_signature(kind, item) for item in _get_records(current, kind)}
+        for item in _get_records(previous, kind):
+            sig = record_signature(kind, item)
+            if sig not in kept:
+                removed.append((kind, 'removed', sig, item))
+    return removed
+
+
+def _log_changes(child_name: str, changes: list) -> None:
+    """Append to the change log; a broken log must not fail the ingest"""
+    try:
+        append_changes(child_name, changes)
+    except Exception as e:
+        print(f"Change log update failed for {child_name}: {e}", file=sys.stderr)
+
+
+def relocate_undated_records(child_name: str, kind: str, items: List[Dict],
+                             partitions: List[Tuple[int, int]], home: Tuple[int, int]) -> int:
+    """
+    Move stored copies of undated records (semester grades) into home.
+    
+    Undated records go to the month of the scrape that saw them, so a
+    rescrape in a later month would store them again. Moving the earlier
+    copy first lets the merge match it - unchanged records aren't logged
+    as added, nor kept twice.
+    
+    Returns:
+        Number of records moved
+    """
+    wanted = {record_signature(kind, item) for item in items if record_month(kind, item) is None}
+    if kind == 'grades':
+        wanted |= {_legacy_grade_key(item) for item in items if record_month(kind, item) is None}
+    if not wanted:
+        return 0
+    
+    def is_wanted(item):
+        if record_month(kind, item) is not None:
+            return False
+        if record_signature(kind, item) in wanted:
+            return True
+        return kind == 'grades' and _is_legacy_grade(item) and _legacy_grade_key(item) in wanted
+    
+    moved = []
+    with child_lock(child_name):
+        for year, month in partitions:
+            if (year, month) == home:
+                continue
+            month_data = load_monthly_data(child_name, year, month)
+            result = (month_data or {}).get('data')
+            if not result:
+                continue
+            items_here = _get_records(result, kind)
+            kept = [item for item in items_here if not is_wanted(item)]
+            if len(kept) == len(items_here):
+                continue
+            moved.extend(item for item in items_here if is_wanted(item))
+            _set_records(result, kind, kept)
+            atomic_write_bytes(
+                get_child_dir(child_name) / f"{year}-{month:02d}.pkl",
+                pickle.dumps(month_data, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        if moved:
+            year, month = home
+            month_data = load_monthly_data(child_name, year, month) or {
+                "timestamp": datetime.now().isoformat(), "data": {'rawData': {}}, "mode": "full"
+            }
+            relocated = {'rawData': {}}
+            _set_records(relocated, kind, moved)
+            _merge_results(month_data.setdefault('data', {'rawData': {}}), relocated)
+            atomic_write_bytes(
+                get_child_dir(child_name) / f"{year}-{month:02d}.pkl",
+                pickle.dumps(month_data, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+    return len(moved)
+
+
+def remove_missing_records(child_name: str, kind: str, partitions: List[Tuple[int, int]], seen) -> List[Dict]:
+    """
+    Delete stored records of one kind that a complete scrape no longer returned.
     
-    with open(monthly_file, 'wb') as f:
-        pickle.dump(data, f)
+    Only for sections scraped completely every time (see checkpoints), and
+    only within the partitions that scrape covers. Grades stored before
+    grade_identity that no rescrape claimed are dropped without being
+    logged - they can't be told apart from stale copies.
+    
+    Args:
+        partitions: (year, month) partitions the scrape covered
+        seen: predicate telling whether the scrape returned a stored record
+    
+    Returns:
+        Records removed (each logged as 'removed')
+    """
+    removed = []
+    with child_lock(child_name):
+        for year, month in partitions:
+            month_data = load_monthly_data(child_name, year, month)
+            result = (month_data or {}).get('data')
+            if not result:
+                continue
+            kept, gone, legacy = [], [], []
+            for item in _get_records(result, kind):
+                if seen(item):
+                    kept.append(item)
+                elif kind == 'grades' and _is_legacy_grade(item):
+                    legacy.append(item)
+                else:
+                    gone.append(item)
+            if not gone and not legacy:
+                continue
+            removed.extend(gone)
+            _set_records(result, kind, kept)
+            _forget_in_search_index(child_name, kind, gone)
+            atomic_write_bytes(
+                get_child_dir(child_name) / f"{year}-{month:02d}.pkl",
+                pickle.dumps(month_data, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        _log_changes(child_name, [(kind, 'removed', record_signature(kind, item), item) for item in removed])
+    return removed
+
+
+def _externalize_bodies(child_name: str, data: Dict) -> Dict:
+    """
+    Move inline message bodies to the blob store, keeping only content_ref.
+    
+    Returns a copy of the month data - the caller's records (still used for
+    search indexing) keep their content.
+    """
+    raw = data['data'].get('rawData') or {}
+    messages = raw.get('messages') or []
+    inline = [i for i, msg in enumerate(messages) if 'content' in msg]
+    if not inline:
+        return data
+    
+    keys = put_many(child_name, (messages[i]['content'] or '' for i in inline))
+    stored = list(messages)
+    for i, key in zip(inline, keys):
+        record = {k: v for k, v in messages[i].items() if k != 'content'}
+        record['content_ref'] = key
+        stored[i] = record
+    
+    return dict(data, data=dict(data['data'], rawData=dict(raw, messages=stored)))
 
 
 def load_monthly_data(child_name: str, year: int, month: int) -> Optional[Dict]:
@@ -154,11 +564,42 @@ def load_monthly_data(child_name: str, year: int, month: int) -> Optional[Dict]:
         return pickle.load(f)
 
 
+_PARTITION_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9].pkl"
+
+
+def list_partitions(child_name: str) -> List[Tuple[int, int]]:
+    """Sorted (year, month) keys of a child's stored month partitions"""
+    return sorted(
+        (int(f.stem[:4]), int(f.stem[5:]))
+        for f in get_child_dir(child_name).glob(_PARTITION_GLOB)
+    )
+
+
+def iter_stored_months(child_name: str) -> Iterator[Dict]:
+    """Yield every stored month for a child, oldest first"""
+    for year, month in list_partitions(child_name):
+        month_data = load_monthly_data(child_name, year, month)
+        if month_data:
+            yield month_data
+
+
 def get_recent_months_data(child_name: str, months_back: int = 2) -> Dict:
-    """Get data from recent months (current + previous)"""
+    """
+    Get data from recent months (current + previous) plus future months.
+    
+    Records are partitioned by their own date, so homework due and calendar
+    events ahead live in later partitions - those are always included.
+    """
     now = datetime.now()
     data = {}
     
+    for year, month in reversed(list_partitions(child_name)):
+        if (year, month) <= (now.year, now.month):
+            break
+        month_data = load_monthly_data(child_name, year, month)
+        if month_data:
+            data[f"{year}-{month:02d}"] = month_data
+    
     for i in range(months_back):
         year = now.year
         month = now.month - i
@@ -178,8 +619,8 @@ def save_analysis_summary(child_name: str, summary: Dict) -> None:
     """Save agent's analysis summary"""
     child_dir = get_child_dir(child_name)
     summary_file = child_dir / "summary.json"
-    with open(summary_file, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, ensure_ascii=False, indent=2)
+    with child_lock(child_name):
+        atomic_write_json(summary_file, summary)
 
 
 def load_analysis_summary(child_name: str) -> Optional[Dict]:
@@ -198,8 +639,8 @@ def save_tasks(child_name: str, tasks: Dict) -> None:
     """Save parent tasks/checkoffs"""
     child_dir = get_child_dir(child_name)
     tasks_file = child_dir / "tasks.json"
-    with open(tasks_file, 'w', encoding='utf-8') as f:
-        json.dump(tasks, f, ensure_ascii=False, indent=2)
+    with child_lock(child_name):
+        atomic_write_json(tasks_file, tasks)
 
 
 def load_tasks(child_name: str) -> Optional[Dict]:
@@ -212,3 +653,35 @@ def load_tasks(child_name: str) -> Optional[Dict]:
         
     with open(tasks_file, 'r', encoding='utf-8') as f:
         return json.load(f)
+
+
+def extract_records(months_data: Dict, key: str) -> list:
+    """
+    Collect records of one kind from get_recent_months_data() output.
+    
+    Homework is stored next to the JS scraper result, everything else
+    (messages, announcements, grades, calendar, remarks) inside rawData.
+    """
+    records = []
+    for month_data in months_data.values():
+        result = month_data.get('data')
+        if not result:
+            continue
+        if key == 'homework':
+            records.extend(result.get('homework', []))
+        elif 'rawData' in result:
+            records.extend(result['rawData'].get(key) or [])
+    return records
+
+
+def with_message_bodies(child_name: str, months_data: Dict) -> Dict:
+    """Copy of get_recent_months_data() output with message bodies loaded from the blob store"""
+    loaded = {}
+    for key, month_data in months_data.items():
+        result = month_data.get('data') or {}
+        raw = result.get('rawData') or {}
+        if raw.get('messages'):
+            raw = dict(raw, messages=with_content(child_name, raw['messages']))
+            month_data = dict(month_data, data=dict(result, rawData=raw))
+        loaded[key] = month_data
+    return loaded
@@ -0,0 +1,136 @@
+"""Tenants - several households served by one server instance.
+
+Without a `tenants` section config.yaml describes one family: the
+top-level `children` under `storage.data_dir`. That family is the
+default tenant, and nothing changes for single-family setups.
+
+Each entry of `tenants` is another family with its own children, its
+own storage root (child names, aliases and data never mix across
+tenants), a bearer token for the shared HTTP server and a quota of
+concurrent scrapes:
+
+    tenants:
+      kowalscy:
+        token: "..."                # Authorization: Bearer ... selects the tenant
+        data_dir: ".librus_scraper/kowalscy"   # default: <data_dir>/tenants/<id>
+        max_concurrent_scrapes: 1
+        children:
+          - name: "Ola"
+
+The tenant of the running tool call is held in a context variable, set
+by the server for each call (use_tenant) and carried into the I/O
+thread pool by executor.run_io, so storage and the child registry
+resolve names and paths in the caller's tenant without threading it
+through every function.
+"""
+import hmac
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .config import config
+
+
+DEFAULT_TENANT = "default"
+
+_current: ContextVar[str] = ContextVar("librus_tenant", default=DEFAULT_TENANT)
+
+
+class UnknownTenant(Exception):
+    """Raised for a tenant id that config.yaml doesn't define"""
+    pass
+
+
+def current_tenant() -> str:
+    return _current.get()
+
+
+@contextmanager
+def use_tenant(tenant_id: Optional[str]) -> Iterator[str]:
+    """Run the block in a tenant (None = the default tenant)"""
+    tenant_id = tenant_id or DEFAULT_TENANT
+    if tenant_id != DEFAULT_TENANT:
+        _settings(tenant_id)
+    token = _current.set(tenant_id)
+    try:
+        yield tenant_id
+    finally:
+        _current.reset(token)
+
+
+def _tenants() -> Dict[str, Dict]:
+    return config._config.get('tenants') or {}
+
+
+def is_multi_tenant() -> bool:
+    return bool(_tenants())
+
+
+def tenant_ids() -> List[str]:
+    """Configured tenants, the default one first if it has children"""
+    ids = [DEFAULT_TENANT] if config._config.get('children') else []
+    return ids + [tenant_id for tenant_id in _tenants() if tenant_id != DEFAULT_TENANT]
+
+
+def _settings(tenant_id: str) -> Dict:
+    settings = _tenants().get(tenant_id)
+    if settings is None:
+        raise UnknownTenant(f"Unknown tenant: {tenant_id}")
+    return settings
+
+
+def children(tenant_id: Optional[str] = None) -> Optional[List[Dict]]:
+    """Children configured for a tenant (None if the section is missing)"""
+    tenant_id = tenant_id or current_tenant()
+    if tenant_id == DEFAULT_TENANT:
+        return config._config.get('children')
+    return _settings(tenant_id).get('children')
+
+
+def data_dir(tenant_id: Optional[str] = None) -> Path:
+    """Storage root of a tenant (child directories under it are created by child_registry)"""
+    tenant_id = tenant_id or current_tenant()
+    if tenant_id == DEFAULT_TENANT:
+        return config.data_dir
+    configured = _settings(tenant_id).get('data_dir')
+    if configured and 'data_dir' not in config._test_overrides:
+        return Path.home() / configured
+    return config.data_dir / "tenants" / tenant_id
+
+
+def max_concurrent_scrapes(tenant_id: str) -> int:
+    """Scrapes a tenant may run at once (its share of the browser pool)"""
+    if not is_multi_tenant():
+        # One family: the whole pool is theirs
+        return config.max_concurrent_scrapes
+    default = config.tenant_max_concurrent_scrapes
+    if tenant_id == DEFAULT_TENANT:
+        return default
+    return _tenants().get(tenant_id, {}).get('max_concurrent_scrapes', default)
+
+
+def tenant_for_authorization(header: Optional[str]) -> Optional[str]:
+    """
+    Tenant of an HTTP call from its Authorization header.
+
+    Without tenants configured every call is the default tenant. With
+    tenants, the bearer token must match one of them - None means refuse.
+    """
+    if not is_multi_tenant():
+        return DEFAULT_TENANT
+    scheme, _, token = (header or '').partition(' ')
+    if scheme.lower() != 'bearer':
+        return None
+    return tenant_for_token(token.strip())
+
+
+def tenant_for_token(token: Optional[str]) -> Optional[str]:
+    """Tenant whose bearer token this is (None if none matches)"""
+    if not token:
+        return None
+    for tenant_id, settings in _tenants().items():
+        expected = settings.get('token')
+        if expected and hmac.compare_digest(str(expected), token):
+            return tenant_id
+    return None
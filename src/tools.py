@@ -0,0 +1,401 @@
+"""MCP tool registry - tool definitions, argument validation and dispatch"""
+import importlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .schema import compile_schema
+
+
+CHILD_NAME_SCHEMA = {
+    "type": "string",
+    "description": "Child name or alias"
+}
+
+
+DATE_SCHEMA = {
+    "type": "string",
+    "pattern": r"^\d{4}-\d{2}-\d{2}$"
+}
+
+
+def _child_range_schema() -> Dict:
+    """Input schema for read tools: child name plus optional date range"""
+    return {
+        "type": "object",
+        "properties": {
+            "child_name": CHILD_NAME_SCHEMA,
+            "date_from": dict(DATE_SCHEMA, description="Only records dated on or after this day (YYYY-MM-DD)"),
+            "date_to": dict(DATE_SCHEMA, description="Only records dated on or before this day (YYYY-MM-DD)")
+        },
+        "required": ["child_name"]
+    }
+
+
+def _child_only_schema() -> Dict:
+    """Input schema for tools that take only a child name"""
+    return {
+        "type": "object",
+        "properties": {
+            "child_name": CHILD_NAME_SCHEMA
+        },
+        "required": ["child_name"]
+    }
+
+
+class ToolSpec:
+    """Single registered tool: metadata, compiled validator and lazy handler"""
+
+    def __init__(self, name: str, description: str, input_schema: Dict, handler: str):
+        self.name = name
+        self.description = description
+        self.input_schema = input_schema
+        self.handler_path = handler
+        self.validate = compile_schema(input_schema)
+        self._handler: Optional[Callable[[Dict], Awaitable[Any]]] = None
+
+    @property
+    def handler(self) -> Callable[[Dict], Awaitable[Any]]:
+        """Import handler module on first use and cache the function"""
+        if self._handler is None:
+            module_name, func_name = self.handler_path.split(":")
+            module = importlib.import_module(module_name)
+            self._handler = getattr(module, func_name)
+        return self._handler
+
+
+class ToolRegistry:
+    """Tools keyed by name for constant-time dispatch"""
+
+    def __init__(self):
+        self._tools: Dict[str, ToolSpec] = {}
+
+    def register(self, name: str, description: str, input_schema: Dict, handler: str) -> ToolSpec:
+        """Register a tool. Handler is a 'module:function' path imported lazily."""
+        if name in self._tools:
+            raise ValueError(f"Tool already registered: {name}")
+        spec = ToolSpec(name, description, input_schema, handler)
+        self._tools[name] = spec
+        return spec
+
+    def get(self, name: str) -> ToolSpec:
+        """Get tool spec by name"""
+        spec = self._tools.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown tool: {name}")
+        return spec
+
+    def specs(self) -> List[ToolSpec]:
+        """All registered tools in registration order"""
+        return list(self._tools.values())
+
+    async def dispatch(self, name: str, arguments: Optional[Dict]) -> Any:
+        """Validate arguments and call the tool handler"""
+        spec = self.get(name)
+        validated = spec.validate(arguments)
+        return await spec.handler(validated)
+
+
+registry = ToolRegistry()
+
+registry.register(
+    "scrape_librus",
+    "Scrape Librus data for a child. Returns messages, announcements, grades, and calendar events.",
+    {
+        "type": "object",
+        "properties": {
+            "child_name": {
+                "type": "string",
+                "description": "Child name or alias (e.g., 'Jakub' or 'Kuba')"
+            },
+            "force_full": {
+                "type": "boolean",
+                "description": "Force full scan instead of delta (default: false)",
+                "default": False
+            }
+        },
+        "required": ["child_name"]
+    },
+    "src.handlers.scraping:handle_scrape_librus"
+)
+
+registry.register(
+    "get_memory",
+    "Get stored memory and trends for a child",
+    _child_only_schema(),
+    "src.handlers.memory:handle_get_memory"
+)
+
+registry.register(
+    "get_analysis_summary",
+    "Get agent's previous analysis summary for a child",
+    _child_only_schema(),
+    "src.handlers.memory:handle_get_analysis_summary"
+)
+
+registry.register(
+    "save_analysis_summary",
+    "Save agent's analysis summary for a child",
+    {
+        "type": "object",
+        "properties": {
+            "child_name": CHILD_NAME_SCHEMA,
+            "summary_text": {
+                "type": "string",
+                "description": "Analysis summary (JSON or text)"
+            }
+        },
+        "required": ["child_name", "summary_text"]
+    },
+    "src.handlers.memory:handle_save_analysis_summary"
+)
+
+registry.register(
+    "get_recent_data",
+    "Get recent months data for analysis",
+    {
+        "type": "object",
+        "properties": {
+            "child_name": CHILD_NAME_SCHEMA,
+            "months_back": {
+                "type": "integer",
+                "description": "Number of months to look back (default: 2)",
+                "default": 2,
+                "minimum": 1
+            }
+        },
+        "required": ["child_name"]
+    },
+    "src.handlers.summaries:handle_get_recent_data"
+)
+
+registry.register(
+    "mark_task_done",
+    "Mark a task as completed by parent",
+    {
+        "type": "object",
+        "properties": {
+            "child_name": CHILD_NAME_SCHEMA,
+            "task_id": {
+                "type": "string",
+                "description": "Task identifier"
+            },
+            "notes": {
+                "type": "string",
+                "description": "Optional completion notes"
+            }
+        },
+        "required": ["child_name", "task_id"]
+    },
+    "src.handlers.tasks:handle_mark_task_done"
+)
+
+registry.register(
+    "get_pending_tasks",
+    "Get pending tasks for a child",
+    _child_only_schema(),
+    "src.handlers.tasks:handle_get_pending_tasks"
+)
+
+registry.register(
+    "save_analysis",
+    "Save an insight or note to child's memory",
+    {
+        "type": "object",
+        "properties": {
+            "child_name": CHILD_NAME_SCHEMA,
+            "analysis_type": {
+                "type": "string",
+                "enum": ["issue", "action_item", "parent_note"],
+                "description": "Type of analysis to save"
+            },
+            "content": {
+                "type": "string",
+                "description": "Content of the note or analysis"
+            }
+        },
+        "required": ["child_name", "analysis_type", "content"]
+    },
+    "src.handlers.memory:handle_save_analysis"
+)
+
+registry.register(
+    "get_homework_summary",
+    "Get homework assignments and deadlines for a child",
+    _child_range_schema(),
+    "src.handlers.summaries:handle_get_homework_summary"
+)
+
+registry.register(
+    "get_remarks_summary",
+    "Get teacher remarks and notes for a child",
+    _child_range_schema(),
+    "src.handlers.summaries:handle_get_remarks_summary"
+)
+
+registry.register(
+    "get_messages_summary",
+    "Get messages from teachers for a child",
+    _child_range_schema(),
+    "src.handlers.summaries:handle_get_messages_summary"
+)
+
+registry.register(
+    "analyze_grade_trends",
+    "Weighted averages, trends and semester projections per subject (default: this school year)",
+    {
+        "type": "object",
+        "properties": {
+            "child_name": {
+                "type": "string",
+                "description": "Child name or alias (default: all children)"
+            },
+            "date_from": dict(DATE_SCHEMA, description="Only grades dated on or after this day (default: start of the school year)"),
+            "date_to": dict(DATE_SCHEMA, description="Only grades dated on or before this day (YYYY-MM-DD)")
+        },
+        "required": []
+    },
+    "src.handlers.grades:handle_analyze_grade_trends"
+)
+
+registry.register(
+    "generate_pdf_report",
+    "Generate PDF report from markdown content (or several reports) and save to file",
+    {
+        "type": "object",
+        "properties": {
+            "content": {
+                "type": "string",
+                "description": "Markdown content to convert to PDF"
+            },
+            "reports": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Several markdown reports (e.g. one per child), each starting on a new page"
+            },
+            "output_path": {
+                "type": "string",
+                "description": "Path where to save PDF file",
+                "default": "~/Desktop/family_report.pdf"
+            }
+        },
+        "required": []
+    },
+    "src.handlers.reports:handle_generate_pdf_report"
+)
+
+registry.register(
+    "generate_family_report",
+    "Generate comprehensive family report with all children",
+    {
+        "type": "object",
+        "properties": {
+            "report_type": {
+                "type": "string",
+                "enum": ["weekly", "monthly"],
+                "description": "Type of report to generate",
+                "default": "weekly"
+            }
+        },
+        "required": []
+    },
+    "src.handlers.reports:handle_generate_family_report"
+)
+
+registry.register(
+    "get_grades_summary",
+    "Get grades summary for a child (recent grades, averages, trends)",
+    _child_range_schema(),
+    "src.handlers.grades:handle_get_grades_summary"
+)
+
+registry.register(
+    "get_calendar_events",
+    "Get upcoming calendar events for a child",
+    _child_range_schema(),
+    "src.handlers.summaries:handle_get_calendar_events"
+)
+
+registry.register(
+    "manual_login",
+    "Trigger manual login for a child when auto-login fails",
+    _child_only_schema(),
+    "src.handlers.scraping:handle_manual_login"
+)
+
+registry.register(
+    "search",
+    "Full-text search in messages, announcements, remarks and homework (Polish-aware, ranked by relevance)",
+    {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Words to search for, e.g. 'wycieczka'"
+            },
+            "child_name": {
+                "type": "string",
+                "description": "Child name or alias (default: all children)"
+            },
+            "kinds": {
+                "type": "array",
+                "items": {
+                    "type": "string",
+                    "enum": ["messages", "announcements", "remarks", "homework"]
+                },
+                "description": "Restrict to these record kinds"
+            },
+            "date_from": dict(DATE_SCHEMA, description="Only records dated on or after this day (YYYY-MM-DD)"),
+            "date_to": dict(DATE_SCHEMA, description="Only records dated on or before this day (YYYY-MM-DD)"),
+            "limit": {
+                "type": "integer",
+                "description": "Maximum number of results (default: 20)",
+                "default": 20,
+                "minimum": 1
+            }
+        },
+        "required": ["query"]
+    },
+    "src.handlers.search:handle_search"
+)
+
+registry.register(
+    "get_changes",
+    "Get what was added, modified or removed since the last check (pass back next_seq)",
+    {
+        "type": "object",
+        "properties": {
+            "child_name": CHILD_NAME_SCHEMA,
+            "since_seq": {
+                "type": "integer",
+                "description": "next_seq from the previous call (default: 0, the whole log)",
+                "default": 0,
+                "minimum": 0
+            },
+            "kinds": {
+                "type": "array",
+                "items": {
+                    "type": "string",
+                    "enum": ["messages", "announcements", "grades", "calendar", "remarks", "homework"]
+                },
+                "description": "Restrict to these record kinds"
+            },
+            "limit": {
+                "type": "integer",
+                "description": "Maximum number of changes (default: 200)",
+                "default": 200,
+                "minimum": 1
+            }
+        },
+        "required": ["child_name"]
+    },
+    "src.handlers.changes:handle_get_changes"
+)
+
+registry.register(
+    "list_children",
+    "List all configured children with their last scan dates",
+    {
+        "type": "object",
+        "properties": {}
+    },
+    "src.handlers.children:handle_list_children"
+)
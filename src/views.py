@@ -0,0 +1,306 @@
+"""Materialized per-child views, computed at ingest time.
+
+save_monthly_data() rebuilds a child's views (views.pkl in the child
+directory) after every write, so the summary tools read one precomputed
+structure instead of re-bucketing the raw month data on each call:
+
+- homework sorted by due date (date-relative buckets are cut with bisect)
+- current grades by subject and semester grades by subject
+- remarks split by polarity
+- calendar events sorted by date
+
+Each rebuild bumps the views' generation number. Views cover the same
+window the tools always used (current + previous month, plus future
+partitions holding homework due dates and events ahead) and are rebuilt
+lazily when that window moves or the file is missing.
+"""
+import pickle
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .child_registry import child_registry
+from .classifier import classify_months, current_fingerprint
+
+
+VIEWS_FILE = "views.pkl"
+
+# Months covered by the views (same window as the summary tools)
+VIEW_MONTHS = 2
+
+# Record kinds the views are built from
+VIEW_KINDS = ('homework', 'grades', 'remarks', 'calendar')
+
+SEMESTER_CATEGORY_MARKERS = ['śródroczn', 'roczn', 'końcow', 'przewidywan']
+
+# views file path (tenant-specific) -> (views file mtime_ns, views)
+_cache: Dict[str, Tuple[int, Dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def is_semester_category(category: str) -> bool:
+    """True for semester/final/predicted grade categories"""
+    category = category.lower()
+    return any(x in category for x in SEMESTER_CATEGORY_MARKERS)
+
+
+def recent_month_keys(today: Optional[date] = None, months_back: int = VIEW_MONTHS) -> List[str]:
+    """'YYYY-MM' keys for the current month and months_back - 1 before it"""
+    today = today or date.today()
+    keys = []
+    for i in range(months_back):
+        year, month = today.year, today.month - i
+        if month <= 0:
+            month += 12
+            year -= 1
+        keys.append(f"{year}-{month:02d}")
+    return keys
+
+
+def _is_iso_date(value: str) -> bool:
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+        return True
+    except ValueError:
+        return False
+
+
+def _sorted_by_date(records: List[Dict], field: str) -> Tuple[List[str], List[Dict], List[Dict]]:
+    """
+    Split records into a date-sorted index and records with unparseable dates.
+
+    Records without the date field are dropped (the tools never listed them).
+
+    Returns:
+        (sorted dates, records in the same order, undated records)
+    """
+    dated = []
+    undated = []
+    for record in records:
+        value = record.get(field, '')
+        if not value:
+            continue
+        if _is_iso_date(value):
+            dated.append((value, record))
+        else:
+            undated.append(record)
+    dated.sort(key=lambda pair: pair[0])
+    return [d for d, _ in dated], [r for _, r in dated], undated
+
+
+def _descriptive_grade(months_data: Dict) -> Optional[str]:
+    for month_data in months_data.values():
+        raw = month_data.get('data', {}).get('rawData', {})
+        if raw.get('descriptiveGrade'):
+            return raw['descriptiveGrade']
+    return None
+
+
+def _grade_views(all_grades: List[Dict], descriptive_grade: Optional[str]) -> Dict:
+    current_grades = []
+    semester_grades: Dict[str, List[Dict]] = {}
+    subjects: Dict[str, List[Dict]] = {}
+    for grade in all_grades:
+        subject = grade.get('subject', 'Unknown')
+        if is_semester_category(grade.get('category', '')):
+            semester_grades.setdefault(subject, []).append(grade)
+        else:
+            current_grades.append(grade)
+            subjects.setdefault(subject, []).append(grade)
+
+    return {
+        "current": current_grades,
+        "semester": semester_grades,
+        "subjects": subjects,
+        "descriptive_grade": descriptive_grade
+    }
+
+
+def _remark_views(all_remarks: List[Dict]) -> Dict:
+    # Polarity is tagged at ingest by the classifier
+    by_polarity: Dict[str, List[Dict]] = {"positive": [], "negative": [], "neutral": []}
+    for remark in all_remarks:
+        by_polarity[remark.get('polarity', 'neutral')].append(remark)
+
+    return {
+        "total": len(all_remarks),
+        "recent": all_remarks[-5:],
+        **by_polarity
+    }
+
+
+def _views_from_records(records: Dict[str, List[Dict]], descriptive_grade: Optional[str]) -> Dict:
+    due_dates, homework_by_due, homework_undated = _sorted_by_date(records['homework'], 'dateDue')
+    event_dates, events_by_date, events_undated = _sorted_by_date(records['calendar'], 'date')
+
+    return {
+        "homework": {
+            "total": len(records['homework']),
+            "due_dates": due_dates,
+            "by_due": homework_by_due,
+            "undated": homework_undated
+        },
+        "grades": _grade_views(records['grades'], descriptive_grade),
+        "remarks": _remark_views(records['remarks']),
+        "calendar": {
+            "total": len(records['calendar']),
+            "dates": event_dates,
+            "by_date": events_by_date,
+            "undated": events_undated
+        }
+    }
+
+
+def build_views(months_data: Dict, month_keys: List[str], generation: int = 1,
+                child_name: Optional[str] = None) -> Dict:
+    """
+    Compute all views from get_recent_months_data() output.
+
+    Pure function of its input so it's easy to test and to run off-loop.
+    """
+    from .storage import extract_records
+
+    classify_months(months_data, child_name)
+    records = {kind: extract_records(months_data, kind) for kind in VIEW_KINDS}
+    return {
+        "generation": generation,
+        "built_at": datetime.now().isoformat(),
+        "months": month_keys,
+        "classifier": current_fingerprint(),
+        "has_data": bool(months_data),
+        **_views_from_records(records, _descriptive_grade(months_data))
+    }
+
+
+def build_range_views(child_name: str, date_from: Optional[str], date_to: Optional[str]) -> Dict:
+    """
+    Views over an explicit date range, built from query() and not persisted.
+
+    The descriptive grade isn't a dated record, it comes from the stored views.
+    """
+    from .query import query
+
+    records = {kind: list(query(child_name, kind, date_from, date_to)) for kind in VIEW_KINDS}
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "has_data": any(records.values()),
+        **_views_from_records(records, get_views(child_name)["grades"]["descriptive_grade"])
+    }
+
+
+def _views_path(child_name: str):
+    return child_registry.child_dir(child_name) / VIEWS_FILE
+
+
+def _read_views_file(child_name: str) -> Optional[Dict]:
+    path = _views_path(child_name)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    with _cache_lock:
+        cached = _cache.get(str(path))
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+    with open(path, 'rb') as f:
+        views = pickle.load(f)
+    with _cache_lock:
+        _cache[str(path)] = (mtime_ns, views)
+    return views
+
+
+def materialize(child_name: str) -> Dict:
+    """Rebuild and persist a child's views (called after every month save)"""
+    from .storage import atomic_write_bytes, child_lock, get_recent_months_data
+
+    with child_lock(child_name):
+        previous = _read_views_file(child_name)
+        generation = (previous or {}).get("generation", 0) + 1
+
+        month_keys = recent_month_keys()
+        months_data = get_recent_months_data(child_name, VIEW_MONTHS)
+        views = build_views(months_data, month_keys, generation, child_name)
+
+        atomic_write_bytes(_views_path(child_name), pickle.dumps(views, protocol=pickle.HIGHEST_PROTOCOL))
+        with _cache_lock:
+            _cache.pop(str(_views_path(child_name)), None)
+    return views
+
+
+def invalidate(child_name: str) -> None:
+    """Drop stored views so the next get_views() rebuilds them"""
+    with _cache_lock:
+        _cache.pop(str(_views_path(child_name)), None)
+    try:
+        _views_path(child_name).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def get_views(child_name: str, date_from: Optional[str] = None, date_to: Optional[str] = None) -> Dict:
+    """
+    Current views for a child, or ad-hoc views over a date range.
+
+    A cached lookup unless the views are missing (legacy data), the
+    month window moved or the classification keywords changed since they
+    were built.
+    """
+    if date_from or date_to:
+        return build_range_views(child_name, date_from, date_to)
+
+    views = _read_views_file(child_name)
+    if (views is None or views.get("months") != recent_month_keys()
+            or views.get("classifier") != current_fingerprint()):
+        views = materialize(child_name)
+    return views
+
+
+def data_generation(child_name: str) -> Tuple[int, str]:
+    """(generation, build time) of a child's views - changes whenever stored data does"""
+    views = get_views(child_name)
+    return views.get("generation", 0), views.get("built_at", "")
+
+
+def homework_due_on(views: Dict, day: str) -> List[Dict]:
+    """Homework due on one day (YYYY-MM-DD), from the sorted due-date index"""
+    dates = views["homework"]["due_dates"]
+    return views["homework"]["by_due"][bisect_left(dates, day):bisect_right(dates, day)]
+
+
+def homework_buckets(views: Dict, now: Optional[datetime] = None) -> Dict:
+    """
+    Cut date-relative homework buckets from the sorted due-date index.
+
+    Same boundaries as comparing the due date (midnight) to now: due today
+    or earlier is overdue, due tomorrow is urgent, then up to 7 and 14 days.
+    """
+    now = now or datetime.now()
+    hw = views["homework"]
+    dates, records = hw["due_dates"], hw["by_due"]
+
+    def cut(days: int) -> int:
+        return bisect_right(dates, (now + timedelta(days=days)).strftime('%Y-%m-%d'))
+
+    overdue_end, urgent_end, week_end, two_weeks_end = cut(0), cut(1), cut(7), cut(14)
+
+    return {
+        "total_homework": hw["total"],
+        "overdue": records[:overdue_end],
+        "urgent_today_tomorrow": records[overdue_end:urgent_end],
+        "upcoming_this_week": records[urgent_end:week_end] + hw["undated"],
+        "upcoming_14_days": records[week_end:two_weeks_end]
+    }
+
+
+def upcoming_events(views: Dict, now: Optional[datetime] = None, days: int = 14) -> List[Dict]:
+    """Events after today up to `days` ahead, plus events with unparseable dates"""
+    now = now or datetime.now()
+    cal = views["calendar"]
+    dates = cal["dates"]
+    start = bisect_left(dates, (now + timedelta(days=1)).strftime('%Y-%m-%d'))
+    end = bisect_right(dates, (now + timedelta(days=days)).strftime('%Y-%m-%d'))
+    return sorted(cal["by_date"][start:end] + cal["undated"], key=lambda x: x.get('date', ''))
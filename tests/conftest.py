@@ -0,0 +1,15 @@
+"""Shared fixtures"""
+import tempfile
+from pathlib import Path
+import pytest
+
+
+@pytest.fixture
+def temp_data_dir():
+    """Create temporary data directory"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        temp_path = Path(tmpdir)
+        import src.config
+        src.config.config.set_test_override('data_dir', temp_path)
+        yield temp_path
+        src.config.config.clear_test_overrides()
@@ -0,0 +1,5 @@
+"""Handler module used by registry tests to check lazy imports"""
+
+
+async def handle_echo(arguments):
+    return arguments["text"]
@@ -0,0 +1,29 @@
+// Runs get_scraper_js() under node with a fake DOM and fetch (see tests/test_scraper_js.py)
+const scraper = eval(process.argv[2]);
+const params = JSON.parse(process.argv[3]);
+let inFlight = 0, maxInFlight = 0;
+const fetched = {};
+const emptyDoc = { querySelectorAll: () => [], querySelector: () => null, body: { textContent: "" } };
+globalThis.document = emptyDoc;
+globalThis.DOMParser = class { parseFromString() { return emptyDoc; } };
+globalThis.fetch = async (url) => {
+    inFlight++; maxInFlight = Math.max(maxInFlight, inFlight);
+    await new Promise(r => setTimeout(r, 20));
+    inFlight--;
+    fetched[url] = (fetched[url] || 0) + 1;
+    if (url.includes('uwagi')) throw new Error('boom');
+    // The announcements page is throttled once (retried only with the shared limiter)
+    const status = process.env.SHARED_LIMITER && url.includes('ogloszenia') && fetched[url] === 1 ? 503 : 200;
+    // REDIRECT=<substring>: that page redirects (e.g. to the login page)
+    const redirected = !!process.env.REDIRECT && url.includes(process.env.REDIRECT);
+    return { status, ok: status < 400, redirected, text: async () => "" };
+};
+const observed = [];
+if (process.env.SHARED_LIMITER) {
+    globalThis.librusAcquire = async (url) => {};
+    globalThis.librusObserve = async (url, ms, status, redirected) => { observed.push(status); };
+}
+const checkpoints = [];
+globalThis.librusIngest = async (cursor, records) => { if (cursor) checkpoints.push(cursor); };
+console.log = () => {}; console.error = () => {};
+scraper(params).then(r => process.stdout.write(JSON.stringify({ sections: r.sections, maxInFlight, keys: Object.keys(r), rawData: r.rawData, checkpoints, observed, fetched })));
@@ -0,0 +1,96 @@
+"""Unit tests for the message body blob store"""
+import pickle
+from src import blob_store
+from src.storage import get_child_dir, load_monthly_data, save_monthly_data, with_message_bodies
+
+
+BOILERPLATE = (
+    "Szanowni Państwo, uprzejmie informuję, że {topic}. "
+    "Proszę o zapoznanie się z informacją. Z poważaniem, wychowawca klasy 5b."
+)
+
+
+def message(i, topic="zebranie odbędzie się w czwartek"):
+    return {
+        "title": f"Wiadomość {i}", "sender": "Wychowawca",
+        "date": f"2026-03-{1 + i % 28:02d} 08:00:00",
+        "content": BOILERPLATE.format(topic=f"{topic} ({i})")
+    }
+
+
+def save_messages(messages, mode="delta"):
+    save_monthly_data("Jakub", 2026, 3, {
+        "timestamp": "2026-03-30T10:00:00", "mode": mode,
+        "data": {"rawData": {"messages": messages}, "homework": []}
+    })
+
+
+def test_compress_round_trip_with_dictionary():
+    """Test blobs decompress with and without a preset dictionary"""
+    data = BOILERPLATE.format(topic="wycieczka").encode("utf-8")
+    dictionary = blob_store.build_dictionary([message(i)["content"].encode("utf-8") for i in range(80)])
+
+    plain = blob_store.compress(data)
+    with_dict = blob_store.compress(data, dictionary, "abcd1234")
+
+    assert blob_store.decompress(plain) == data
+    assert blob_store.decompress(with_dict, lambda dict_id: dictionary) == data
+    assert len(with_dict) < len(plain)
+
+
+def test_bodies_stored_once_and_loaded_lazily(temp_data_dir):
+    """Test month pickles hold only content_ref and re-scrapes don't duplicate blobs"""
+    messages = [message(i) for i in range(3)]
+    save_messages(messages)
+    save_messages([dict(m) for m in messages])
+
+    stored = load_monthly_data("Jakub", 2026, 3)["data"]["rawData"]["messages"]
+    assert len(stored) == 3
+    assert all("content" not in m and len(m["content_ref"]) == 64 for m in stored)
+    assert len(list((get_child_dir("Jakub") / "blobs").glob("??/*"))) == 3
+
+    months = with_message_bodies("Jakub", {"2026-03": load_monthly_data("Jakub", 2026, 3)})
+    assert [m["content"] for m in months["2026-03"]["data"]["rawData"]["messages"]] == [m["content"] for m in messages]
+
+
+def test_classification_uses_blob_bodies_after_merge(temp_data_dir):
+    """Test stored messages keep requires_response when a later delta merges in"""
+    save_messages([dict(message(1), content="Proszę o podpisanie zgody.")])
+    save_messages([message(2)])
+
+    stored = load_monthly_data("Jakub", 2026, 3)["data"]["rawData"]["messages"]
+    assert [m["requires_response"] for m in stored] == [True, False]
+
+
+def test_dictionary_built_after_enough_samples(temp_data_dir):
+    """Test a dictionary is created and used for later blobs"""
+    save_messages([message(i) for i in range(blob_store.DICTIONARY_MIN_SAMPLES)], mode="full")
+    blobs_dir = get_child_dir("Jakub") / "blobs"
+    dict_id = (blobs_dir / "current_dict").read_text()
+
+    save_messages([message(100, topic="jutro lekcje skrócone")])
+    stored = load_monthly_data("Jakub", 2026, 3)["data"]["rawData"]["messages"]
+    ref = [m for m in stored if m["title"] == "Wiadomość 100"][0]["content_ref"]
+
+    blob = (blobs_dir / ref[:2] / ref).read_bytes()
+    assert blob[4:12].decode("ascii") == dict_id
+    assert blob_store.get("Jakub", ref) == message(100, topic="jutro lekcje skrócone")["content"]
+    assert len(blob) < len(pickle.dumps(message(100)["content"]))
+
+
+def test_failed_dictionary_training_waits_for_more_samples(temp_data_dir, monkeypatch):
+    """Test a failed training isn't retried (re-reading every blob) on each new body"""
+    attempts = []
+
+    def failing_build(samples):
+        attempts.append(len(samples))
+        raise ValueError("training failed")
+    monkeypatch.setattr(blob_store, "build_dictionary", failing_build)
+
+    save_messages([message(i) for i in range(blob_store.DICTIONARY_MIN_SAMPLES)], mode="full")
+    for i in range(3):
+        save_messages([message(200 + i)])
+    assert attempts == [blob_store.DICTIONARY_MIN_SAMPLES]
+
+    save_messages([message(300 + i) for i in range(blob_store.DICTIONARY_RETRY_SAMPLES)])
+    assert len(attempts) == 2
@@ -0,0 +1,87 @@
+"""Unit tests for the append-only change log"""
+import asyncio
+from datetime import datetime
+import pytest
+from src.change_log import changes_since, latest_seq
+from src.child_registry import UnknownChild
+from src.checkpoints import Checkpointer, start_progress
+from src.query import query_all
+from src.scraper import expand_result
+from src.storage import load_state, save_scrape_data
+
+
+SCRAPED_AT = datetime(2026, 10, 19, 8, 0, 0)
+
+
+def scrape(messages=(), grades=()):
+    return expand_result({"rawData": {"messages": list(messages), "grades": list(grades)}})
+
+
+def test_added_and_modified_logged_in_order(temp_data_dir):
+    """Test new and changed records get increasing sequence numbers, unchanged ones none"""
+    message = {"title": "Zebranie", "sender": "Wychowawca", "date": "2026-10-18 08:00:00", "content": "O 17:00"}
+    save_scrape_data("Jakub", scrape([message], [{"subject": "Matematyka", "grade": "5", "date": "2026-10-10"}]),
+                     "full", SCRAPED_AT)
+    first = changes_since("Jakub")
+    assert [(c["kind"], c["op"]) for c in first["changes"]] == [("messages", "added"), ("grades", "added")]
+    assert first["changes"][0]["title"] == "Zebranie" and "content" not in first["changes"][0]
+
+    save_scrape_data("Jakub", scrape([message]), "delta", SCRAPED_AT)
+    assert changes_since("Jakub", first["next_seq"])["changes"] == []
+
+    save_scrape_data("Jakub", scrape([dict(message, content="O 18:00")]), "delta", SCRAPED_AT)
+    delta = changes_since("Jakub", first["next_seq"])
+    assert [(c["kind"], c["op"]) for c in delta["changes"]] == [("messages", "modified")]
+    assert delta["changes"][0]["seq"] > first["changes"][-1]["seq"]
+    assert delta["next_seq"] == latest_seq("Jakub")
+
+
+def test_read_state_is_not_a_change(temp_data_dir):
+    """Test a message turning read does not show up as modified"""
+    message = {"title": "Zebranie", "date": "2026-10-18 08:00:00", "content": "O 17:00"}
+    save_scrape_data("Jakub", scrape([message]), "full", SCRAPED_AT)
+    seq = latest_seq("Jakub")
+    save_scrape_data("Jakub", scrape([dict(message, isRead=True)]), "delta", SCRAPED_AT)
+    assert latest_seq("Jakub") == seq
+
+
+def test_pagination_and_kind_filter(temp_data_dir):
+    """Test limit/has_more paging and that a kind filter still advances next_seq"""
+    grades = [{"subject": "Matematyka", "grade": str(g), "date": f"2026-10-{g:02d}"} for g in range(1, 6)]
+    save_scrape_data("Jakub", scrape([{"title": "Zebranie", "date": "2026-10-18 08:00:00"}], grades),
+                     "full", SCRAPED_AT)
+
+    page = changes_since("Jakub", 0, limit=4)
+    assert len(page["changes"]) == 4 and page["has_more"]
+    rest = changes_since("Jakub", page["next_seq"], limit=4)
+    assert len(rest["changes"]) == 2 and not rest["has_more"]
+
+    only_messages = changes_since("Jakub", 0, kinds=["messages"])
+    assert len(only_messages["changes"]) == 1
+    assert only_messages["next_seq"] == latest_seq("Jakub")
+    with pytest.raises(UnknownChild):
+        changes_since("Nobody", 7)
+
+
+def test_completed_calendar_drops_cancelled_events(temp_data_dir):
+    """Test an event missing from a finished calendar section is removed and logged"""
+    events = [{"date": "2026-10-22", "title": "Sprawdzian"}, {"date": "2026-10-25", "title": "Wycieczka"}]
+
+    def calendar_scrape(items):
+        state = load_state("Jakub")
+        checkpointer = Checkpointer("Jakub", state, start_progress(state, True, None, SCRAPED_AT), "full")
+        asyncio.run(checkpointer.ingest_batch({"section": "calendar", "done": True}, {"calendar": items}))
+
+    calendar_scrape(events)
+    seq = latest_seq("Jakub")
+    calendar_scrape(events[:1])
+
+    assert [e["title"] for e in query_all("Jakub", "calendar")] == ["Sprawdzian"]
+    removed = changes_since("Jakub", seq)["changes"]
+    assert [(c["op"], c["title"]) for c in removed] == [("removed", "Wycieczka")]
+
+    # A finished section that came back empty (e.g. a failed page) removes nothing
+    seq = latest_seq("Jakub")
+    calendar_scrape([])
+    assert [e["title"] for e in query_all("Jakub", "calendar")] == ["Sprawdzian"]
+    assert latest_seq("Jakub") == seq
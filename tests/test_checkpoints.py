@@ -0,0 +1,177 @@
+"""Unit tests for streaming ingest and resumable scrape checkpoints"""
+import asyncio
+from datetime import datetime, timedelta
+from src.checkpoints import PROGRESS_KEY, Checkpointer, is_resumed, start_progress
+from src.query import query_all
+from src.memory import load_memory
+from src.storage import load_state
+
+
+STARTED = datetime(2026, 10, 19, 8, 0, 0)
+
+
+def interrupted_scrape():
+    """A FULL scrape that stored one inbox page, one section and one homework month"""
+    state = load_state("Jakub")
+    progress = start_progress(state, True, None, STARTED)
+    checkpointer = Checkpointer("Jakub", state, progress, "full")
+
+    async def scenario():
+        await checkpointer.ingest_batch(
+            {"section": "messages", "page": 1, "collected": 1},
+            {"messages": [{"title": "Zebranie", "date": "2026-10-18 08:00:00", "content": "W czwartek",
+                           "href": "/wiadomosci/1/5/123"}]}
+        )
+        await checkpointer.ingest_batch(
+            {"section": "announcements", "done": True},
+            {"announcements": [{"title": "Dzień otwarty", "date": "2026-10-10"}]}
+        )
+        await checkpointer.homework_month("2026-09-01", [
+            {"subject": "Polski", "title": "Wypracowanie", "dateAdded": "2026-09-20", "dateDue": "2026-09-27"}
+        ])
+
+    asyncio.run(scenario())
+
+
+def test_checkpoints_store_records_and_cursor(temp_data_dir):
+    """Test finished units are stored immediately and the cursor survives a crash"""
+    interrupted_scrape()
+
+    state = load_state("Jakub")
+    assert state["last_scrape_iso"] is None
+    assert state[PROGRESS_KEY]["sections_done"] == ["announcements"]
+    assert state[PROGRESS_KEY]["messages_page"] == 1
+    assert state[PROGRESS_KEY]["homework_done"] == ["2026-09-01"]
+
+    messages = query_all("Jakub", "messages")
+    assert messages[0]["link"] == "https://synergia.librus.pl/wiadomosci/1/5/123"
+    assert [h["title"] for h in query_all("Jakub", "homework")] == ["Wypracowanie"]
+
+
+def test_retry_resumes_cursor(temp_data_dir):
+    """Test a retry of the same kind resumes, a different kind or stale cursor starts over"""
+    interrupted_scrape()
+
+    state = load_state("Jakub")
+    progress = start_progress(state, True, None, STARTED + timedelta(minutes=5))
+    assert is_resumed(progress)
+    assert Checkpointer("Jakub", state, progress, "full").js_resume() == {
+        "sectionsDone": ["announcements"], "messagesPage": 1, "messagesCollected": 1
+    }
+
+    assert not is_resumed(start_progress(load_state("Jakub"), False, "2026-10-18 23:59:59", STARTED))
+    assert not is_resumed(start_progress(load_state("Jakub"), True, None, STARTED + timedelta(days=2)))
+
+
+def test_finish_moves_watermark_to_start(temp_data_dir):
+    """Test a completed scrape drops the cursor and uses its start time as watermark"""
+    interrupted_scrape()
+
+    state = load_state("Jakub")
+    progress = start_progress(state, True, None, STARTED + timedelta(minutes=5))
+    Checkpointer("Jakub", state, progress, "full").finish({
+        "rawData": {"messages": [], "descriptiveGrade": None}, "homework": [], "stats": {"messages": 0}
+    })
+
+    state = load_state("Jakub")
+    assert PROGRESS_KEY not in state
+    assert state["last_scrape_iso"] == "2026-10-19 08:00:00"
+    assert len(query_all("Jakub", "messages")) == 1
+
+
+def test_failed_section_keeps_cursor_and_watermark(temp_data_dir):
+    """Test a scrape with a failed section is resumed next time instead of moving the watermark past it"""
+    interrupted_scrape()
+    result = {"rawData": {}, "homework": [], "stats": {}, "sections": {
+        "messages": {"status": "error", "error": "Timeout"}, "announcements": {"status": "ok", "resumed": True}
+    }}
+
+    state = load_state("Jakub")
+    progress = start_progress(state, True, None, STARTED + timedelta(minutes=5))
+    assert Checkpointer("Jakub", state, progress, "full").finish(result) is False
+
+    state = load_state("Jakub")
+    assert state["last_scrape_iso"] is None
+    progress = start_progress(state, True, None, STARTED + timedelta(minutes=10))
+    retry = Checkpointer("Jakub", state, progress, "full")
+    assert retry.js_resume() == {"sectionsDone": ["announcements"], "messagesPage": 1, "messagesCollected": 1}
+
+    result["sections"]["messages"] = {"status": "ok"}
+    assert retry.finish(result) is True
+    assert load_state("Jakub")["last_scrape_iso"] == "2026-10-19 08:00:00"
+
+
+def test_batches_validated_and_deduplicated(temp_data_dir):
+    """Test malformed and repeated records are dropped and grades reach grade_history"""
+    state = load_state("Jakub")
+    checkpointer = Checkpointer("Jakub", state, start_progress(state, True, None, STARTED), "full")
+    message = {"title": "Zebranie", "sender": "Wychowawca", "date": "2026-10-18 08:00:00", "content": "W czwartek"}
+
+    async def scenario():
+        await checkpointer.ingest_batch(None, {"messages": [message, {"title": "bez daty"}, "junk"]})
+        # The inbox shifted between pages - the same message arrives again
+        await checkpointer.ingest_batch({"section": "messages", "page": 2, "collected": 2}, {"messages": [message]})
+        await checkpointer.ingest_batch({"section": "grades", "done": True}, {
+            "grades": [{"subject": "Matematyka", "grade": "5", "date": "2026-10-10"}],
+            "descriptiveGrade": None
+        })
+
+    asyncio.run(scenario())
+
+    assert checkpointer.dedup.rejected == 2 and checkpointer.dedup.duplicates == 1
+    assert checkpointer.stats()["messages"] == 1 and checkpointer.stats()["grades"] == 1
+    assert len(query_all("Jakub", "messages")) == 1
+    assert load_memory("Jakub")["grade_history"]["Matematyka"][0]["grade"] == "5"
+    assert load_state("Jakub")[PROGRESS_KEY]["messages_page"] == 2
+
+
+def grades_scrape(started, grades):
+    state = load_state("Jakub")
+    checkpointer = Checkpointer("Jakub", state, start_progress(state, True, None, started), "full")
+    asyncio.run(checkpointer.ingest_batch({"section": "grades", "done": True}, {"grades": grades}))
+    return checkpointer
+
+
+def test_grade_corrections_and_retractions(temp_data_dir):
+    """Test grades keep their identity across scrapes: corrected in place, retracted removed"""
+    quiz = {"id": "101", "subject": "Matematyka", "grade": "3", "date": "2026-10-10", "category": "Kartkówka"}
+    test = {"id": "102", "subject": "Matematyka", "grade": "5", "date": "2026-10-12", "category": "Sprawdzian"}
+    midterm = {"id": "103", "subject": "Matematyka", "grade": "4", "category": "przewidywana śródroczna"}
+    grades_scrape(STARTED, [quiz, test, midterm])
+
+    later = grades_scrape(STARTED + timedelta(days=31), [dict(quiz, grade="3+"), midterm])
+
+    stored = sorted((g["id"], g["grade"]) for g in query_all("Jakub", "grades"))
+    assert stored == [("101", "3+"), ("103", "4")]
+    assert later.grade_changes() == {"modified": 1, "removed": 1}
+    history = load_memory("Jakub")["grade_history"]["Matematyka"]
+    assert sorted((g["key"], g["grade"]) for g in history) == [("id:101", "3+"), ("id:103", "4")]
+
+
+def test_empty_grades_section_keeps_history(temp_data_dir):
+    """Test a blank grades page retracts nothing and leaves grade_history intact"""
+    quiz = {"id": "101", "subject": "Matematyka", "grade": "3", "date": "2026-10-10", "category": "Kartkówka"}
+    grades_scrape(STARTED, [quiz])
+
+    later = grades_scrape(STARTED + timedelta(days=1), [])
+
+    assert [g["id"] for g in query_all("Jakub", "grades")] == ["101"]
+    assert later.grade_changes() == {}
+    assert [g["key"] for g in load_memory("Jakub")["grade_history"]["Matematyka"]] == ["id:101"]
+
+
+def test_grades_without_links_and_legacy_records(temp_data_dir):
+    """Test linkless grades are told apart by slot and pre-identity grades are adopted silently"""
+    from src.change_log import latest_seq
+    from src.scraper import expand_result
+    from src.storage import save_scrape_data
+
+    legacy = {"subject": "Polski", "grade": "5", "date": "2026-10-05", "category": "Odpowiedź"}
+    save_scrape_data("Jakub", expand_result({"rawData": {"grades": [legacy]}}), "full", STARTED)
+    seq = latest_seq("Jakub")
+
+    checkpointer = grades_scrape(STARTED, [dict(legacy, slot=1), dict(legacy, grade="4", slot=2)])
+
+    assert sorted(g["grade"] for g in query_all("Jakub", "grades")) == ["4", "5"]
+    assert checkpointer.grade_changes() == {"added": 1}
+    assert latest_seq("Jakub") == seq + 1
@@ -0,0 +1,62 @@
+"""Unit tests for child registry"""
+import tempfile
+from pathlib import Path
+import pytest
+import src.config
+from src.child_registry import ChildRegistry
+
+
+@pytest.fixture
+def registry_env():
+    """Temporary data dir and two configured children"""
+    original_children = src.config.config._config.get('children', [])
+    src.config.config._config['children'] = [
+        {"name": "Jakub", "aliases": ["Kuba", "KUBUŚ"]},
+        {"name": "Anna Maria", "aliases": []}
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src.config.config.set_test_override('data_dir', Path(tmpdir))
+        yield Path(tmpdir)
+        src.config.config.clear_test_overrides()
+    src.config.config._config['children'] = original_children
+
+
+def test_resolve_uses_casefolded_aliases(registry_env):
+    """Test alias lookup is case-insensitive"""
+    registry = ChildRegistry()
+    assert registry.resolve("kuba") == "Jakub"
+    assert registry.resolve("kubuś") == "Jakub"
+    assert registry.resolve("ANNA MARIA") == "Anna Maria"
+    assert registry.resolve("Unknown") == "Unknown"
+
+
+def test_resolve_has_no_filesystem_side_effects(registry_env, monkeypatch):
+    """Test resolving names never touches the data directory"""
+    def fail_mkdir(*args, **kwargs):
+        raise AssertionError("mkdir called while resolving a name")
+    monkeypatch.setattr(Path, "mkdir", fail_mkdir)
+    
+    assert ChildRegistry().resolve("Kuba") == "Jakub"
+
+
+def test_child_dir_is_created_once(registry_env, monkeypatch):
+    """Test directories are memoized after the first call"""
+    registry = ChildRegistry()
+    path = registry.child_dir("Kuba")
+    assert path == registry_env / "jakub"
+    assert path.is_dir()
+    
+    def fail_mkdir(*args, **kwargs):
+        raise AssertionError("mkdir called for a cached directory")
+    monkeypatch.setattr(Path, "mkdir", fail_mkdir)
+    
+    assert registry.child_dir("Kuba") == path
+
+
+def test_rebuilds_when_children_change(registry_env):
+    """Test replacing children config rebuilds the alias map"""
+    registry = ChildRegistry()
+    assert registry.resolve("Zosia") == "Zosia"
+    
+    src.config.config._config['children'] = [{"name": "Zofia", "aliases": ["Zosia"]}]
+    assert registry.resolve("Zosia") == "Zofia"
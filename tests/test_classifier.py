@@ -0,0 +1,47 @@
+"""Unit tests for ingest-time message/remark classification"""
+import pytest
+from src.classifier import classify_months, classify_result
+
+
+@pytest.fixture
+def keywords(monkeypatch):
+    """Override classification keyword lists in config"""
+    import src.config
+    overrides = {}
+    monkeypatch.setitem(src.config.config._config, 'classification', overrides)
+    return overrides
+
+
+def result(messages=(), remarks=()):
+    return {"rawData": {"messages": list(messages), "remarks": list(remarks)}}
+
+
+def test_messages_and_remarks_tagged(keywords):
+    """Test requires_response and polarity tags with default keywords"""
+    data = classify_result(result(
+        messages=[
+            {"title": "Wycieczka", "content": "Proszę o podpisanie ZGODY do piątku."},
+            {"title": "Zgoda na wyjście", "content": "W załączniku."},
+            {"title": "Informacja", "content": "Zebranie w czwartek."}
+        ],
+        remarks=[
+            {"content": "Nie odrobił zadania, ale świetnie pracował na lekcji"},
+            {"content": "Brak stroju na WF"},
+            {"content": "Reprezentował szkołę w konkursie"}
+        ]
+    ))
+
+    assert [m["requires_response"] for m in data["rawData"]["messages"]] == [True, True, False]
+    assert [r["polarity"] for r in data["rawData"]["remarks"]] == ["positive", "negative", "neutral"]
+
+
+def test_keyword_change_reclassifies(keywords):
+    """Test configured keywords replace defaults and stale tags are refreshed"""
+    months = {"2026-03": {"data": result(messages=[{"title": "Info", "content": "Prosimy o zwrot książek"}])}}
+    classify_months(months)
+    message = months["2026-03"]["data"]["rawData"]["messages"][0]
+    assert message["requires_response"] is False
+
+    keywords["response_keywords"] = ["prosimy o zwrot"]
+    classify_months(months)
+    assert message["requires_response"] is True
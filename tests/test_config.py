@@ -0,0 +1,70 @@
+"""Unit tests for config hot reload"""
+import copy
+import os
+import pytest
+import yaml
+import src.config
+from src.config import config
+from src.scraper_js import get_scraper_params
+
+
+@pytest.fixture
+def temp_config_file(tmp_path, monkeypatch):
+    """Point config at a temporary config.yaml with known scraping settings"""
+    settings = copy.deepcopy(config._config)
+    settings['scraping'].update(max_messages=200, fetch_delay_ms=150)
+    temp_file = tmp_path / "config.yaml"
+    temp_file.write_text(yaml.safe_dump(settings, allow_unicode=True))
+    monkeypatch.setattr(src.config, "CONFIG_FILE", temp_file)
+    config._load_config()
+    yield temp_file
+    monkeypatch.undo()
+    config._load_config()
+
+
+def rewrite(path, old, new):
+    """Replace text in file and bump mtime so the change is detected"""
+    path.write_text(path.read_text().replace(old, new))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_if_changed_notifies_subscribers(temp_config_file):
+    """Test changed config.yaml is reloaded and subscribers are called"""
+    calls = []
+    def subscriber(cfg):
+        calls.append(cfg.max_messages)
+    config.subscribe(subscriber)
+    
+    try:
+        assert config.reload_if_changed() is False
+        
+        rewrite(temp_config_file, "max_messages: 200", "max_messages: 50")
+        generation = config.generation
+        assert config.reload_if_changed() is True
+        assert config.generation == generation + 1
+        assert calls == [50]
+    finally:
+        config.unsubscribe(subscriber)
+
+
+def test_invalid_config_keeps_previous(temp_config_file):
+    """Test a broken config.yaml does not replace the running config"""
+    before = config.max_messages
+    temp_config_file.write_text("scraping: [unclosed")
+    stat = os.stat(temp_config_file)
+    os.utime(temp_config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    assert config.reload_if_changed() is False
+    assert config.max_messages == before
+
+
+def test_scraper_params_follow_config(temp_config_file):
+    """Test JS scraper tunables are read from config on each call"""
+    rewrite(temp_config_file, "fetch_delay_ms: 150", "fetch_delay_ms: 400")
+    config.reload_if_changed()
+    
+    params = get_scraper_params(None, True)
+    assert params["isFirstTime"] is True
+    assert params["config"]["FETCH_DELAY_MS"] == 400
+    assert params["config"]["MAX_MESSAGES"] == config.max_messages
@@ -0,0 +1,64 @@
+"""Latency tests for the executor layer"""
+import asyncio
+import time
+from datetime import datetime
+import pytest
+from src import executor
+from src.storage import save_monthly_data
+from src.tools import registry
+
+
+@pytest.fixture
+def temp_data_dir(temp_data_dir):
+    """Shared temporary data directory, with the executor pools shut down afterwards"""
+    yield temp_data_dir
+    executor.shutdown()
+
+
+@pytest.fixture
+def large_month(temp_data_dir):
+    """Store a month with a few thousand long messages for the first configured child"""
+    import src.config
+    child_name = src.config.config._config['children'][0]['name']
+    now = datetime.now()
+    messages = [
+        {
+            "title": f"Wiadomość {i}",
+            "sender": "Nauczyciel",
+            "date": f"{now:%Y-%m-%d} 08:00:00",
+            "content": "Szanowni Państwo, " * 60,
+            "attachments": None
+        }
+        for i in range(4000)
+    ]
+    save_monthly_data(child_name, now.year, now.month, {
+        "timestamp": now.isoformat(),
+        "data": {"rawData": {"messages": messages}, "homework": [], "stats": {}},
+        "mode": "full"
+    })
+    return child_name
+
+
+@pytest.mark.slow
+def test_list_children_stays_fast_during_large_recent_data(large_month):
+    """Test a concurrent list_children is not blocked behind get_recent_data"""
+    async def scenario():
+        big_started = time.perf_counter()
+        big = asyncio.create_task(registry.dispatch("get_recent_data", {"child_name": large_month}))
+        await asyncio.sleep(0.01)
+        
+        small_started = time.perf_counter()
+        listing = await registry.dispatch("list_children", {})
+        small_elapsed = time.perf_counter() - small_started
+        small_done_first = not big.done()
+        
+        payload = await big
+        big_elapsed = time.perf_counter() - big_started
+        return listing, payload, small_elapsed, big_elapsed, small_done_first
+    
+    listing, payload, small_elapsed, big_elapsed, small_done_first = asyncio.run(scenario())
+    
+    assert large_month in listing
+    assert len(payload) > 1_000_000
+    assert small_done_first
+    assert small_elapsed < big_elapsed / 2
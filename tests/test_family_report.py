@@ -0,0 +1,48 @@
+"""Unit tests for the memoized family report"""
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from src.handlers import reports
+from src.storage import save_scrape_data
+
+
+@pytest.fixture
+def temp_data_dir(temp_data_dir, monkeypatch):
+    """Temporary data directory with two children configured"""
+    import src.config
+    monkeypatch.setitem(src.config.config._config, 'children', [
+        {"name": "Jakub", "aliases": [], "login": "j", "password": "p"},
+        {"name": "Anna", "aliases": [], "login": "a", "password": "p"}
+    ])
+    reports._family_reports.clear()
+    return temp_data_dir
+
+
+def save_homework(child_name, title, now):
+    due = (now + timedelta(days=1)).strftime('%Y-%m-%d')
+    save_scrape_data(child_name, {"rawData": {}, "homework": [
+        {"subject": "Polski", "title": title, "dateAdded": now.strftime('%Y-%m-%d'), "dateDue": due}
+    ]}, "delta", now)
+
+
+def test_family_report_memoized_until_data_changes(temp_data_dir, monkeypatch):
+    """Test sections come from the views and a repeat call on the same day is served from memory"""
+    now = datetime.now()
+    save_homework("Jakub", "Wypracowanie", now)
+
+    calls = []
+    section = reports.child_section
+    monkeypatch.setattr(reports, "child_section", lambda name, at: calls.append(name) or section(name, at))
+
+    report = asyncio.run(reports.build_family_report("weekly", now))
+    assert "- ZADANIE JUTRO: Polski - Wypracowanie" in report
+    assert report.index("## JAKUB") < report.index("## ANNA")
+    assert sorted(calls) == ["Anna", "Jakub"]
+
+    assert asyncio.run(reports.build_family_report("weekly", now)) is report
+    assert len(calls) == 2
+
+    save_homework("Anna", "Czytanka", now)
+    report = asyncio.run(reports.build_family_report("weekly", now))
+    assert "[ANNA]** - ZADANIE JUTRO! Polski - Czytanka" in report
+    assert len(calls) == 4
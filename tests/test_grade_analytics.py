@@ -0,0 +1,84 @@
+"""Unit tests for batched grade analytics"""
+import asyncio
+from datetime import date, datetime
+import pytest
+from src import grade_analytics
+from src.grade_analytics import analyze, compute_analytics, parse_weight, semester_bounds
+from src.scraper import expand_result
+from src.storage import save_scrape_data
+
+
+@pytest.fixture
+def temp_data_dir(temp_data_dir):
+    """Temporary data directory and no cached analytics"""
+    grade_analytics.clear_cache()
+    return temp_data_dir
+
+
+TODAY = date(2026, 10, 19)
+
+GRADES = [
+    {"subject": "Matematyka", "grade": "3", "date": "2026-09-10", "category": "Kartkówka", "weight": "1"},
+    {"subject": "Matematyka", "grade": "4", "date": "2026-09-24", "category": "Odpowiedź", "weight": "2"},
+    {"subject": "Matematyka", "grade": "5", "date": "2026-10-08", "category": "Sprawdzian", "weight": "3"},
+    {"subject": "Matematyka", "grade": "1", "date": "2026-10-09", "category": "Zadanie", "weight": "0"},
+    {"subject": "Matematyka", "grade": "4", "date": "", "category": "przewidywana śródroczna", "weight": ""},
+    {"subject": "Polski", "grade": "5-", "date": "2026-10-01", "category": "Wypracowanie", "weight": ""},
+]
+
+
+def test_weighted_statistics():
+    """Test weights, rolling average, trend and projection of one subject"""
+    math = compute_analytics({"Jakub": GRADES}, TODAY)["Jakub"]["Matematyka"]
+
+    assert math["total_grades"] == 3  # weight 0 and semester grades left out
+    assert math["average"] == 4.0
+    assert math["weighted_average"] == pytest.approx(26 / 6, abs=0.01)
+    assert math["rolling_average"] == math["weighted_average"]
+    assert math["slope_per_month"] > 0 and math["trend_direction"] == "IMPROVING"
+    assert math["weighted_average"] < math["projected_semester_average"] <= 6
+    assert math["semester_ends"] == "2027-01-31"
+    assert math["grade_sequence"] == "3 → 4 → 5"
+
+
+def test_weights_and_semesters():
+    """Test weight parsing and semester boundaries"""
+    assert parse_weight("3") == 3 and parse_weight("0") == 0 and parse_weight("") == 1
+    assert semester_bounds(date(2027, 1, 31)) == (date(2026, 9, 1), date(2027, 1, 31))
+    assert semester_bounds(date(2027, 3, 1)) == (date(2027, 2, 1), date(2027, 6, 30))
+
+
+def test_children_batched_and_subjects_need_two_grades():
+    """Test several children are analysed in one pass, single-grade subjects skipped"""
+    analysis = compute_analytics({"Jakub": GRADES, "Zosia": GRADES[:2], "Nowy": []}, TODAY)
+    assert set(analysis["Jakub"]) == {"Matematyka"}
+    assert analysis["Zosia"]["Matematyka"]["weighted_average"] == pytest.approx(11 / 3, abs=0.01)
+    assert analysis["Nowy"] == {}
+
+
+def test_numpy_and_python_sums_agree(monkeypatch):
+    """Test the NumPy path and the pure-Python fallback give the same results"""
+    pytest.importorskip("numpy")
+    with_numpy = compute_analytics({"Jakub": GRADES, "Zosia": GRADES[:3]}, TODAY)
+    monkeypatch.setattr(grade_analytics, "np", None)
+    assert compute_analytics({"Jakub": GRADES, "Zosia": GRADES[:3]}, TODAY) == with_numpy
+
+
+def test_results_cached_until_new_scrape(temp_data_dir, monkeypatch):
+    """Test repeated calls reuse the result until a save bumps the views generation"""
+    calls = []
+
+    async def counting_run_cpu(func, *args):
+        calls.append(func)
+        return func(*args)
+
+    monkeypatch.setattr(grade_analytics, "run_cpu", counting_run_cpu)
+    save_scrape_data("Jakub", expand_result({"rawData": {"grades": GRADES[:3]}}), "full", datetime(2026, 10, 19))
+
+    first = asyncio.run(analyze(["Jakub"], today=TODAY))
+    assert asyncio.run(analyze(["Jakub"], today=TODAY)) == first
+    assert len(calls) == 1
+
+    save_scrape_data("Jakub", expand_result({"rawData": {"grades": GRADES[5:]}}), "delta", datetime(2026, 10, 19))
+    asyncio.run(analyze(["Jakub"], today=TODAY))
+    assert len(calls) == 2
@@ -0,0 +1,72 @@
+"""Unit tests for Python-side markdown rendering of scrape results"""
+from datetime import datetime
+from src.markdown_renderer import render_sections, write_latest, write_latest_from_store
+from src.scraper import expand_result
+from src.storage import get_child_dir, save_scrape_data
+
+
+def compact_result():
+    """Payload as returned by the in-page scraper"""
+    return {
+        "rawData": {
+            "collectionDate": "19.10.2026, 08:00:00",
+            "messages": [{"title": "Zebranie", "sender": "Wychowawca", "date": "2026-10-18 08:00:00",
+                          "content": "W czwartek o 17:00.", "href": "/wiadomosci/1/5/123"}],
+            "announcements": [],
+            "grades": [{"subject": "Matematyka", "grade": "5", "date": "2026-10-10"}],
+            "calendar": [{"date": "2026-10-22", "title": "Sprawdzian"}],
+            "remarks": []
+        },
+        "homework": [{"subject": "Polski", "title": "Wypracowanie", "teacher": "Nowak",
+                      "category": "Zadanie", "dateAdded": "2026-10-15", "dateDue": "2026-10-21"}],
+        "sections": {}
+    }
+
+
+def test_expand_result_restores_fields_and_stats():
+    """Test dropped empty fields come back and stats are counted in Python"""
+    result = expand_result(compact_result())
+    raw = result["rawData"]
+
+    assert raw["messages"][0]["link"] == "https://synergia.librus.pl/wiadomosci/1/5/123"
+    assert "href" not in raw["messages"][0]
+    assert raw["messages"][0]["isRead"] is False and raw["messages"][0]["attachments"] is None
+    assert raw["grades"][0]["weight"] == "" and raw["grades"][0]["category"] == ""
+    assert result["stats"] == {"messages": 1, "announcements": 0, "grades": 1,
+                               "calendar": 1, "remarks": 0, "homework": 1}
+
+
+def test_only_changed_sections_rerendered():
+    """Test the section cache skips unchanged record kinds"""
+    result = expand_result(compact_result())
+    cache, rendered = render_sections(result, {})
+    assert rendered == 6
+
+    result["rawData"]["grades"].append({"subject": "Matematyka", "grade": "4", "date": "2026-10-17"})
+    cache_after, rendered = render_sections(result, cache)
+    assert rendered == 1
+    assert "**4**" in cache_after["grades"][1]
+    assert cache_after["messages"] is cache["messages"]
+
+
+def test_write_latest(temp_data_dir):
+    """Test latest.md holds every section, homework included"""
+    markdown = write_latest("Jakub", expand_result(compact_result()))
+
+    assert (get_child_dir("Jakub") / "latest.md").read_text(encoding="utf-8") == markdown
+    assert markdown.startswith("# Librus Data - Jakub\n**Collection date:** 19.10.2026, 08:00:00")
+    assert "## Homework (1)" in markdown and "- **Due:** 2026-10-21" in markdown
+    assert "### [NEW] 1. Zebranie" in markdown
+    assert write_latest("Jakub", expand_result(compact_result())) == markdown
+
+
+def test_write_latest_from_store(temp_data_dir):
+    """Test latest.md can be rendered from stored records, bodies loaded from blobs"""
+    now = datetime.now()
+    result = expand_result(compact_result())
+    result["rawData"]["messages"][0]["date"] = now.strftime("%Y-%m-%d 08:00:00")
+    save_scrape_data("Jakub", result, "full", now)
+
+    markdown = write_latest_from_store("Jakub", "teraz")
+    assert "**Collection date:** teraz" in markdown
+    assert "W czwartek o 17:00." in markdown
@@ -0,0 +1,85 @@
+"""Tests for date-range queries over partitioned storage"""
+import time
+from datetime import datetime
+import pytest
+from src import query as query_module
+from src.query import prune_partitions, query
+from src.storage import save_scrape_data
+
+
+def month_result(year, month, grades_per_month=40, messages_per_month=60):
+    """One scrape's worth of records dated inside the given month"""
+    subjects = ["Matematyka", "Polski", "Angielski", "Historia"]
+    return {
+        "markdown": "",
+        "rawData": {
+            "grades": [
+                {"subject": subjects[i % 4], "grade": str(1 + i % 6), "category": f"Kartkówka {i}",
+                 "date": f"{year}-{month:02d}-{1 + i % 28:02d}", "weight": "1"}
+                for i in range(grades_per_month)
+            ],
+            "messages": [
+                {"title": f"Wiadomość {i}", "sender": "Wychowawca", "content": "Informacja dla rodziców. " * 20,
+                 "date": f"{year}-{month:02d}-{1 + i % 28:02d} 08:{i % 60:02d}:00"}
+                for i in range(messages_per_month)
+            ]
+        },
+        "homework": []
+    }
+
+
+def test_prune_partitions():
+    """Test only partitions overlapping the range are kept"""
+    partitions = [(2025, 12), (2026, 1), (2026, 2), (2026, 3)]
+    assert prune_partitions(partitions, "2026-01-15", "2026-02-10") == [(2026, 1), (2026, 2)]
+    assert prune_partitions(partitions, date_from="2026-03-01") == [(2026, 3)]
+    assert prune_partitions(partitions) == partitions
+
+
+def test_query_filters_and_projection(temp_data_dir):
+    """Test date bounds, filters and field projection"""
+    save_scrape_data("Jakub", month_result(2026, 1), "full", datetime(2026, 1, 31))
+    save_scrape_data("Jakub", month_result(2026, 2), "delta", datetime(2026, 2, 28))
+    
+    rows = list(query(
+        "Jakub", "grades", "2026-01-20", "2026-02-05",
+        filters={"subject": ["Matematyka", "Polski"], "grade": lambda g: g in ("5", "6")},
+        fields=["subject", "grade", "date"]
+    ))
+    
+    assert rows
+    assert all(set(row) == {"subject", "grade", "date"} for row in rows)
+    assert all("2026-01-20" <= row["date"] <= "2026-02-05" for row in rows)
+    assert all(row["subject"] in ("Matematyka", "Polski") and row["grade"] in ("5", "6") for row in rows)
+    
+    with pytest.raises(ValueError):
+        list(query("Jakub", "unknown"))
+
+
+@pytest.mark.slow
+def test_semester_query_over_five_years(temp_data_dir, monkeypatch):
+    """Benchmark: a one-semester query over 5 years of history opens only its partitions"""
+    for year in range(2021, 2026):
+        for month in range(1, 13):
+            save_scrape_data("Jakub", month_result(year, month), "delta", datetime(year, month, 28))
+    
+    loaded = []
+    original_load = query_module.load_monthly_data
+    
+    def counting_load(child_name, year, month):
+        loaded.append((year, month))
+        return original_load(child_name, year, month)
+    monkeypatch.setattr(query_module, "load_monthly_data", counting_load)
+    
+    started = time.perf_counter()
+    semester = list(query("Jakub", "grades", "2025-02-01", "2025-06-30", fields=["subject", "grade"]))
+    semester_elapsed = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    everything = sum(1 for _ in query("Jakub", "grades"))
+    full_elapsed = time.perf_counter() - started
+    
+    assert len(semester) == 5 * 40
+    assert everything == 60 * 40
+    assert loaded[:5] == [(2025, m) for m in range(2, 7)]
+    assert semester_elapsed < full_elapsed
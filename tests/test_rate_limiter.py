@@ -0,0 +1,97 @@
+"""Unit tests for the adaptive per-host rate limiter"""
+import asyncio
+import pytest
+from src import rate_limiter
+from src.config import config
+from src.rate_limiter import AdaptiveTokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def bucket(clock, **overrides):
+    settings = dict(rate=2.0, burst=2, min_rate=0.5, max_rate=4.0, target_latency_ms=500,
+                    backoff_base_ms=1000, backoff_max_ms=8000)
+    settings.update(overrides)
+    return AdaptiveTokenBucket(clock=clock, sleep=clock.sleep, **settings)
+
+
+def test_burst_then_rate():
+    """Test the burst is served at once and later tokens arrive at the current rate"""
+    clock = FakeClock()
+    limiter = bucket(clock)
+
+    async def scenario():
+        for _ in range(4):
+            await limiter.acquire()
+
+    asyncio.run(scenario())
+    assert clock.now == pytest.approx(1.0)  # 2 immediately, then 2 more at 2 req/s
+
+
+def test_rate_adapts_to_latency():
+    """Test fast responses raise the rate up to max_rps and slow ones lower it"""
+    limiter = bucket(FakeClock())
+    for _ in range(20):
+        limiter.observe(100, True)
+    assert limiter.rate == 4.0
+
+    limiter.observe(2000, True)
+    assert limiter.rate == pytest.approx(4.0 * rate_limiter.SLOW_FACTOR)
+
+
+def test_failures_back_off_exponentially():
+    """Test consecutive failures halve the rate and pause the host for longer each time"""
+    clock = FakeClock()
+    limiter = bucket(clock)
+
+    limiter.observe(100, False)
+    assert limiter.rate == 1.0 and limiter.blocked_until == pytest.approx(1.0)
+    limiter.observe(100, False)
+    assert limiter.rate == 0.5 and limiter.blocked_until == pytest.approx(2.0)
+
+    asyncio.run(limiter.acquire())
+    assert clock.now >= 2.0
+
+    limiter.observe(100, True)
+    assert limiter.failures == 0
+
+
+def test_hosts_share_one_bucket_per_process():
+    """Test every caller of a host gets the same bucket and statuses map to outcomes"""
+    rate_limiter.reset()
+    try:
+        first = rate_limiter.limiter_for("https://synergia.librus.pl/wiadomosci")
+        assert rate_limiter.limiter_for("https://synergia.librus.pl/moje_zadania") is first
+        assert rate_limiter.limiter_for("https://portal.librus.pl/") is not first
+
+        assert rate_limiter.is_ok(200) and rate_limiter.is_ok(302)
+        assert not rate_limiter.is_ok(429) and not rate_limiter.is_ok(503)
+        assert not rate_limiter.is_ok(0) and not rate_limiter.is_ok(200, redirected=True)
+    finally:
+        rate_limiter.reset()
+
+
+def test_config_reload_updates_existing_hosts(monkeypatch):
+    """Test edited rate_limit settings apply to hosts that already have a bucket"""
+    rate_limiter.reset()
+    try:
+        bucket = rate_limiter.limiter_for("https://synergia.librus.pl/")
+        bucket.rate = 10.0
+        monkeypatch.setitem(config._config, 'rate_limit', dict(config.rate_limit, max_rps=3, burst=1))
+        config._notify()
+
+        assert rate_limiter.limiter_for("https://synergia.librus.pl/") is bucket
+        assert bucket.max_rate == 3 and bucket.rate == 3 and bucket.burst == 1
+    finally:
+        rate_limiter.reset()
@@ -0,0 +1,36 @@
+"""Unit tests for markdown tokenizing and PDF rendering"""
+import pytest
+from src.report_renderer import tokenize_markdown, format_inline
+
+
+def test_format_inline_bold_and_italic():
+    """Test bold/italic conversion and escaping in one pass"""
+    assert format_inline("**Pilne** i *ważne* & więcej") == "<b>Pilne</b> i <i>ważne</i> &amp; więcej"
+    assert format_inline("linia<br>druga") == "linia<br/>druga"
+
+
+def test_tokenize_blocks():
+    """Test headers, bullets, rules, blanks and text are recognised"""
+    content = "# Raport\n\n## Jakub\n### Oceny\n- **5** z matematyki\n* sprawdzian\n---\nZwykły tekst\n#### nie nagłówek"
+    tokens = tokenize_markdown(content)
+    assert tokens == [
+        ("title", "Raport"),
+        ("blank", ""),
+        ("heading1", "Jakub"),
+        ("heading2", "Oceny"),
+        ("bullet", "<b>5</b> z matematyki"),
+        ("bullet", "sprawdzian"),
+        ("rule", ""),
+        ("text", "Zwykły tekst"),
+        ("text", "#### nie nagłówek"),
+    ]
+
+
+def test_render_pdf_multiple_documents(tmp_path):
+    """Test several reports render into one PDF file"""
+    pytest.importorskip("reportlab")
+    from src.report_renderer import render_pdf
+    
+    output = render_pdf(["# Jakub\n- zadanie", "# Anna\n\nBrak zadań"], str(tmp_path / "family.pdf"))
+    assert (tmp_path / "family.pdf").exists()
+    assert output.endswith("family.pdf")
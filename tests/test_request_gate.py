@@ -0,0 +1,73 @@
+"""Unit tests for bounded tool-call concurrency and draining"""
+import asyncio
+import pytest
+from src.request_gate import RequestGate, ShuttingDown
+
+
+def test_limit_bounds_running_calls():
+    """Test no more than limit calls run at once and all of them complete"""
+    async def scenario():
+        gate = RequestGate(2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with gate.slot():
+                peak = max(peak, gate.running)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        return peak, gate.snapshot()
+
+    peak, snapshot = asyncio.run(scenario())
+    assert peak == 2
+    assert snapshot == {"limit": 2, "running": 0, "waiting": 0, "closing": False}
+
+
+def test_close_refuses_queued_calls_and_drains_running():
+    """Test shutdown lets the running call finish and refuses the queued and new ones"""
+    async def scenario():
+        gate = RequestGate(1)
+        finished = []
+
+        async def call(name):
+            async with gate.slot():
+                await asyncio.sleep(0.05)
+                finished.append(name)
+
+        running = asyncio.create_task(call("scrape"))
+        queued = asyncio.create_task(call("queued"))
+        await asyncio.sleep(0.01)
+
+        gate.close()
+        with pytest.raises(ShuttingDown):
+            await call("late")
+        drained = await gate.drain(1.0)
+        await running
+        with pytest.raises(ShuttingDown):
+            await queued
+        return drained, finished
+
+    drained, finished = asyncio.run(scenario())
+    assert drained and finished == ["scrape"]
+
+
+def test_drain_times_out():
+    """Test drain reports calls that outlive the grace period"""
+    async def scenario():
+        gate = RequestGate(1)
+        release = asyncio.Event()
+
+        async def call():
+            async with gate.slot():
+                await release.wait()
+
+        task = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        gate.close()
+        drained = await gate.drain(0.01)
+        release.set()
+        await task
+        return drained, await gate.drain(0.01)
+
+    assert asyncio.run(scenario()) == (False, True)
@@ -0,0 +1,87 @@
+"""Unit tests for resource blocking on scraping contexts"""
+import asyncio
+from src import resource_policy
+from src.resource_policy import ResourcePolicy
+
+
+class FakeRequest:
+    def __init__(self, resource_type, url, size=0):
+        self.resource_type = resource_type
+        self.url = url
+        self.size = size
+
+    async def sizes(self):
+        return {"responseBodySize": self.size, "responseHeadersSize": 100}
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+class FakeContext:
+    def __init__(self):
+        self.route_handler = None
+        self.listeners = {}
+
+    async def route(self, pattern, handler):
+        self.route_handler = handler
+
+    def on(self, event, callback):
+        self.listeners[event] = callback
+
+
+def test_policy_decisions():
+    """Test blocked types, trackers and the allowlist"""
+    policy = ResourcePolicy(allowlist=["synergia.librus.pl/images/captcha"])
+
+    assert policy.should_block("image", "https://synergia.librus.pl/images/logo.png")
+    assert policy.should_block("stylesheet", "https://synergia.librus.pl/css/main.css")
+    assert policy.should_block("script", "https://www.googletagmanager.com/gtm.js")
+    assert not policy.should_block("document", "https://synergia.librus.pl/przegladaj_oceny/uczen")
+    assert not policy.should_block("script", "https://synergia.librus.pl/js/grades.js")
+    assert not policy.should_block("image", "https://synergia.librus.pl/images/captcha.png")
+    assert not ResourcePolicy(enabled=False).should_block("image", "https://x/a.png")
+
+
+def test_install_routes_and_counts():
+    """Test the route handler aborts blocked requests and stats add up"""
+    async def scenario():
+        context = FakeContext()
+        stats = await resource_policy.install(context, ResourcePolicy())
+        routes = [
+            FakeRoute(FakeRequest("document", "https://synergia.librus.pl/moje_zadania")),
+            FakeRoute(FakeRequest("image", "https://synergia.librus.pl/a.png")),
+            FakeRoute(FakeRequest("font", "https://synergia.librus.pl/a.woff")),
+            FakeRoute(FakeRequest("image", "https://synergia.librus.pl/b.gif")),
+        ]
+        for route in routes:
+            await context.route_handler(route)
+        await context.listeners["requestfinished"](FakeRequest("document", "https://synergia.librus.pl/", 5000))
+        return routes, stats.report()
+
+    routes, report = asyncio.run(scenario())
+
+    assert [r.outcome for r in routes] == ["continued", "aborted", "aborted", "aborted"]
+    assert report["blocked"] == {"image": 2, "font": 1}
+    assert report["blocked_total"] == 3
+    assert report["requests"] == 1 and report["bytes"] == 5100
+
+
+def test_disabled_policy_installs_no_route():
+    """Test block_resources: false leaves requests alone but still collects stats"""
+    async def scenario():
+        context = FakeContext()
+        await resource_policy.install(context, ResourcePolicy(enabled=False))
+        return context
+
+    context = asyncio.run(scenario())
+    assert context.route_handler is None
+    assert "requestfinished" in context.listeners
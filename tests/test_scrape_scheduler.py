@@ -0,0 +1,93 @@
+"""Unit tests for fair scrape scheduling across tenants"""
+import asyncio
+from src.scrape_scheduler import FairScheduler
+
+
+def run_scrapes(capacity, quotas, requests):
+    """Run (tenant, label) scrapes through a scheduler; return labels in start order"""
+    async def scenario():
+        scheduler = FairScheduler(lambda: capacity, lambda tenant: quotas.get(tenant, 1))
+        started = []
+        peak = {}
+
+        async def scrape(tenant, label):
+            async with scheduler.slot(tenant):
+                started.append(label)
+                peak[tenant] = max(peak.get(tenant, 0), scheduler.running[tenant])
+                assert scheduler.total_running <= capacity
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(scrape(tenant, label) for tenant, label in requests))
+        assert scheduler.snapshot()["running"] == {} and scheduler.snapshot()["waiting"] == {}
+        return started, peak
+
+    return asyncio.run(scenario())
+
+
+def test_round_robin_between_tenants():
+    """Test a tenant queueing many scrapes doesn't hold back the others"""
+    requests = [("big", f"big-{i}") for i in range(5)] + [("small", "small-0"), ("other", "other-0")]
+    started, _ = run_scrapes(1, {"big": 1}, requests)
+    assert started[:4] == ["big-0", "small-0", "other-0", "big-1"]
+
+
+def test_quota_and_capacity():
+    """Test a tenant stays within its quota even with spare capacity"""
+    requests = [("big", f"big-{i}") for i in range(4)] + [("small", f"small-{i}") for i in range(4)]
+    started, peak = run_scrapes(3, {"big": 1, "small": 2}, requests)
+    assert peak == {"big": 1, "small": 2}
+    assert len(started) == 8
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    """Test a scrape cancelled while queued doesn't take a slot"""
+    async def scenario():
+        scheduler = FairScheduler(lambda: 1, lambda tenant: 1)
+        order = []
+
+        async def scrape(label):
+            async with scheduler.slot(label.split("-")[0]):
+                order.append(label)
+                await asyncio.sleep(0.01)
+
+        first = asyncio.create_task(scrape("a-0"))
+        doomed = asyncio.create_task(scrape("b-0"))
+        await asyncio.sleep(0)
+        doomed.cancel()
+        await asyncio.gather(first, scrape("c-0"), return_exceptions=True)
+        return order, scheduler.snapshot()
+
+    order, snapshot = asyncio.run(scenario())
+    assert order == ["a-0", "c-0"]
+    assert snapshot["running"] == {} and snapshot["waiting"] == {}
+
+
+def test_waiter_cancelled_while_slot_is_released():
+    """Test a waiter cancelled in the same tick as a release neither leaks the slot nor breaks the queue"""
+    async def scenario():
+        scheduler = FairScheduler(lambda: 1, lambda tenant: 1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.slot("a"):
+                await release.wait()
+
+        async def waiter():
+            async with scheduler.slot("b"):
+                pass
+
+        held = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        release.set()
+        waiting.cancel()
+        await asyncio.gather(held, waiting, return_exceptions=True)
+        after_cancel = scheduler.snapshot()
+
+        await asyncio.wait_for(waiter(), timeout=1)
+        return after_cancel, scheduler.snapshot()
+
+    after_cancel, final = asyncio.run(scenario())
+    assert after_cancel["running"] == {} and after_cancel["waiting"] == {}
+    assert final["running"] == {} and final["waiting"] == {}
@@ -0,0 +1,84 @@
+"""Tests for the in-page JavaScript scraper (run under node with a fake DOM)"""
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+import pytest
+from src.scraper_js import get_scraper_js, get_scraper_params
+
+
+HARNESS = Path(__file__).parent / "js" / "scraper_harness.js"
+
+
+def run_scraper(max_concurrent=2, resume=None, shared_limiter=False, redirect=None):
+    if shutil.which("node") is None:
+        pytest.skip("node not installed")
+    params = get_scraper_params(None, True, resume)
+    params["config"].update(FETCH_DELAY_MS=0, MAX_CONCURRENT_REQUESTS=max_concurrent)
+    env = dict(os.environ)
+    if shared_limiter:
+        env["SHARED_LIMITER"] = "1"
+    if redirect:
+        env["REDIRECT"] = redirect
+    out = subprocess.run(
+        ["node", str(HARNESS), "(" + get_scraper_js() + ")", json.dumps(params)],
+        capture_output=True, text=True, timeout=30, check=True, env=env
+    )
+    return json.loads(out.stdout)
+
+
+def test_sections_report_errors_separately():
+    """Test a failing section is reported without losing the others"""
+    result = run_scraper()
+    sections = result["sections"]
+    
+    assert set(sections) == {"messages", "announcements", "grades", "calendar", "remarks"}
+    assert sections["remarks"] == {"ms": sections["remarks"]["ms"], "status": "error", "error": "boom"}
+    assert all(s["status"] == "ok" for name, s in sections.items() if name != "remarks")
+
+
+def test_shared_limiter_caps_concurrency():
+    """Test concurrent sections never exceed the configured requests in flight"""
+    assert run_scraper(max_concurrent=2)["maxInFlight"] == 2
+    assert run_scraper(max_concurrent=1)["maxInFlight"] == 1
+
+
+def test_payload_is_compact():
+    """Test no records, markdown or stats cross page.evaluate when streaming"""
+    result = run_scraper()
+    
+    assert sorted(result["keys"]) == ["rawData", "sections"]
+    assert result["rawData"]["messages"] == [] and result["rawData"]["remarks"] == []
+
+
+def test_resume_skips_checkpointed_sections():
+    """Test sections finished by an interrupted run are not fetched again"""
+    result = run_scraper(resume={"sectionsDone": ["remarks"], "messagesPage": 0, "messagesCollected": 0})
+    
+    assert result["sections"]["remarks"] == {"ms": 0, "resumed": True, "status": "ok"}
+
+
+def test_finished_sections_checkpointed():
+    """Test every section that completes is streamed to librusIngest with its cursor, failed ones are not"""
+    done = {c["section"] for c in run_scraper()["checkpoints"] if c.get("done")}
+    
+    assert done == {"messages", "announcements", "grades", "calendar"}
+
+
+def test_shared_limiter_observes_and_retries():
+    """Test fetches report to the Python limiter and a throttled page is retried"""
+    result = run_scraper(shared_limiter=True)
+    
+    assert result["fetched"]["https://synergia.librus.pl/ogloszenia"] == 2
+    assert 503 in result["observed"] and 0 in result["observed"]  # 0 = network error (remarks)
+    assert result["sections"]["announcements"]["status"] == "ok"
+
+
+def test_redirected_page_fails_its_section():
+    """Test a page redirected mid-scrape (expired session) errors its section instead of reading as empty"""
+    result = run_scraper(redirect="terminarz")
+    
+    assert result["sections"]["calendar"]["status"] == "error"
+    assert "Redirected" in result["sections"]["calendar"]["error"]
+    assert "calendar" not in {c["section"] for c in result["checkpoints"] if c.get("done")}
@@ -0,0 +1,67 @@
+"""Unit tests for full-text search index"""
+from src.handlers.search import search_children
+from src.search_index import analyze, fold_diacritics, search
+from src.storage import save_monthly_data
+
+
+def scrape_result(messages=(), announcements=(), remarks=(), homework=()):
+    return {
+        "timestamp": "2026-03-10T10:00:00",
+        "mode": "delta",
+        "data": {
+            "rawData": {
+                "messages": list(messages),
+                "announcements": list(announcements),
+                "remarks": list(remarks)
+            },
+            "homework": list(homework)
+        }
+    }
+
+
+def test_fold_and_stem_polish_inflections():
+    """Test diacritics folding and suffix stripping"""
+    assert fold_diacritics("Łódź Wycieczkę") == "lodz wycieczke"
+    assert analyze("wycieczka") == analyze("wycieczki") == analyze("Wycieczkę")
+
+
+def test_ingest_indexes_and_search_ranks(temp_data_dir):
+    """Test records saved by save_monthly_data are searchable with snippets"""
+    save_monthly_data("Jakub", 2026, 3, scrape_result(
+        messages=[
+            {"title": "Wycieczka do Krakowa", "sender": "A. Nowak", "date": "2026-03-02 08:00:00",
+             "content": "Proszę o zgodę na wycieczkę klasową."},
+            {"title": "Zebranie", "sender": "B. Kowalska", "date": "2026-03-05 09:00:00",
+             "content": "Zebranie rodziców w czwartek."}
+        ],
+        announcements=[
+            {"title": "Dzień sportu", "content": "Po wycieczkach zapraszamy na boisko.",
+             "author": "Dyrekcja", "date": "2026-02-20 12:00:00"}
+        ],
+        homework=[
+            {"subject": "Matematyka", "title": "Ułamki", "category": "Zadanie",
+             "dateAdded": "2026-03-01", "dateDue": "2026-03-12"}
+        ]
+    ))
+    
+    hits = search("Jakub", "wycieczki")
+    assert [h["kind"] for h in hits] == ["messages", "announcements"]
+    assert "**Wycieczka**" in hits[0]["snippet"] or "**wycieczkę**" in hits[0]["snippet"]
+    
+    assert [h["kind"] for h in search("Jakub", "wycieczka", date_from="2026-03-01")] == ["messages"]
+    assert [h["kind"] for h in search("Jakub", "wycieczka", kinds=["announcements"])] == ["announcements"]
+    assert search("Jakub", "ulamki")[0]["title"] == "Matematyka - Ułamki"
+    
+    page = search_children({"child_name": "Jakub", "query": "wycieczka", "limit": 1})
+    assert page["total"] == 2 and page["returned"] == 1 and len(page["results"]) == 1
+
+
+def test_reingest_updates_instead_of_duplicating(temp_data_dir):
+    """Test re-scraping the same record doesn't create a duplicate hit"""
+    message = {"title": "Basen", "sender": "C", "date": "2026-03-03 10:00:00", "content": "Zabrać czepek."}
+    save_monthly_data("Jakub", 2026, 3, scrape_result(messages=[message]))
+    save_monthly_data("Jakub", 2026, 3, scrape_result(messages=[dict(message, content="Zabrać czepek i ręcznik.")]))
+    
+    hits = search("Jakub", "czepek")
+    assert len(hits) == 1
+    assert "ręcznik" in hits[0]["snippet"]
@@ -0,0 +1,61 @@
+"""Startup benchmark - server cold start must not pull in heavy dependencies"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Budget for a fresh interpreter to import the server and answer list_tools
+LIST_TOOLS_BUDGET_S = 1.5
+
+HEAVY_MODULES = ["playwright", "reportlab", "src.handlers.scraping", "src.handlers.reports"]
+
+
+def run_probe(code: str) -> dict:
+    """Run code in a fresh interpreter and return the JSON it prints"""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.slow
+def test_registry_import_is_light():
+    """Test importing the tool registry does not load handlers or heavy libraries"""
+    probe = run_probe(
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "from src.tools import registry\n"
+        "specs = registry.specs()\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy, 'tools': len(specs)}))\n"
+    )
+    assert probe["heavy"] == []
+    assert probe["tools"] > 0
+    assert probe["elapsed"] < LIST_TOOLS_BUDGET_S
+
+
+@pytest.mark.slow
+def test_list_tools_within_budget():
+    """Test a cold server process answers list_tools within the startup budget"""
+    pytest.importorskip("mcp")
+    probe = run_probe(
+        "import asyncio, json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import server\n"
+        "tools = asyncio.run(server.list_tools())\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy, 'tools': len(tools)}))\n"
+    )
+    assert probe["heavy"] == []
+    assert probe["tools"] > 0
+    assert probe["elapsed"] < LIST_TOOLS_BUDGET_S
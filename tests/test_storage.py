@@ -1,8 +1,6 @@
 """Unit tests for storage module"""
 import pytest
 import json
-import tempfile
-from pathlib import Path
 from src.storage import (
     get_child_dir,
     get_context_dir,
@@ -11,21 +9,13 @@ from src.storage import (
     save_scrape_result,
     load_memory,
     save_memory,
-    get_last_scan_date
+    get_last_scan_date,
+    save_monthly_data,
+    load_monthly_data,
+    child_lock
 )
 
 
-@pytest.fixture
-def temp_data_dir(monkeypatch):
-    """Create temporary data directory"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        temp_path = Path(tmpdir)
-        import src.config
-        src.config.config.set_test_override('data_dir', temp_path)
-        yield temp_path
-        src.config.config.clear_test_overrides()
-
-
 @pytest.fixture
 def mock_credentials(monkeypatch):
     """Mock credentials to avoid file dependency"""
@@ -124,3 +114,96 @@ def test_get_last_scan_date_exists(temp_data_dir, mock_credentials):
     save_state("Jakub", state)
     
     assert get_last_scan_date("Jakub") == "2026-01-06 20:00:00"
+
+
+def test_atomic_write_keeps_old_content_on_failure(temp_data_dir, mock_credentials, monkeypatch):
+    """Test a failed write leaves the previous file intact and no temp files"""
+    save_state("Jakub", {"last_scrape_iso": "2026-01-06 20:00:00"})
+    
+    import src.storage
+    def failing_replace(src_path, dst_path):
+        raise OSError("disk full")
+    monkeypatch.setattr(src.storage.os, "replace", failing_replace)
+    
+    with pytest.raises(OSError):
+        save_state("Jakub", {"last_scrape_iso": "2026-02-01 10:00:00"})
+    
+    monkeypatch.undo()
+    assert load_state("Jakub")["last_scrape_iso"] == "2026-01-06 20:00:00"
+    assert [p.name for p in get_child_dir("Jakub").iterdir() if p.name.endswith(".tmp")] == []
+
+
+def test_child_lock_is_reentrant(temp_data_dir, mock_credentials):
+    """Test load + save can be wrapped in the same lock without deadlock"""
+    with child_lock("Jakub"):
+        save_state("Jakub", {"last_scrape_iso": None})
+    assert load_state("Jakub") == {"last_scrape_iso": None}
+
+
+def test_concurrent_delta_saves_keep_all_records(temp_data_dir, mock_credentials):
+    """Test parallel delta merges into one month don't lose records"""
+    import threading
+    
+    save_monthly_data("Jakub", 2026, 1, {
+        "timestamp": "t0", "mode": "full",
+        "data": {"rawData": {"messages": []}}
+    })
+    
+    def save_batch(n):
+        save_monthly_data("Jakub", 2026, 1, {
+            "timestamp": f"t{n}", "mode": "delta",
+            "data": {"rawData": {"messages": [
+                {"date": f"2026-01-{n:02d}", "sender": "T", "subject": str(i)} for i in range(5)
+            ]}}
+        })
+    
+    threads = [threading.Thread(target=save_batch, args=(n,)) for n in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    stored = load_monthly_data("Jakub", 2026, 1)
+    assert len(stored["data"]["rawData"]["messages"]) == 40
+
+
+def test_scrape_data_partitioned_by_record_date(temp_data_dir, mock_credentials):
+    """Test records land in the month of their own date and are stored once"""
+    from datetime import datetime
+    from src.storage import save_scrape_data
+    
+    result = {
+        "markdown": "# scrape",
+        "rawData": {
+            "messages": [{"date": "2026-02-27 10:00:00", "sender": "T", "title": "Luty"}],
+            "grades": [
+                {"subject": "Matematyka", "grade": "5", "date": "2026-02-10", "category": "Test"},
+                {"subject": "Matematyka", "grade": "4", "date": "", "category": "ocena śródroczna"}
+            ],
+            "calendar": [{"date": "2026-05-04", "title": "Egzamin", "category": ""}],
+            "descriptiveGrade": None
+        },
+        "homework": [{"subject": "Polski", "title": "Lektura", "dateAdded": "2026-03-01", "dateDue": "2026-04-02"}]
+    }
+    scraped_at = datetime(2026, 3, 5, 12, 0)
+    
+    written = save_scrape_data("Jakub", result, "full", scraped_at)
+    assert written == [(2026, 2), (2026, 3), (2026, 4), (2026, 5)]
+    
+    february = load_monthly_data("Jakub", 2026, 2)["data"]
+    assert len(february["rawData"]["messages"]) == 1
+    assert [g["grade"] for g in february["rawData"]["grades"]] == ["5"]
+    
+    march = load_monthly_data("Jakub", 2026, 3)["data"]
+    assert "markdown" not in march
+    assert [g["grade"] for g in march["rawData"]["grades"]] == ["4"]
+    assert load_monthly_data("Jakub", 2026, 4)["data"]["homework"][0]["title"] == "Lektura"
+    assert load_monthly_data("Jakub", 2026, 5)["data"]["rawData"]["calendar"][0]["title"] == "Egzamin"
+    
+    # A later scrape seeing the same records upserts instead of duplicating
+    result["homework"][0]["category"] = "Zmienione"
+    save_scrape_data("Jakub", result, "delta", datetime(2026, 4, 1, 8, 0))
+    april = load_monthly_data("Jakub", 2026, 4)["data"]
+    assert len(april["homework"]) == 1
+    assert april["homework"][0]["category"] == "Zmienione"
+    assert len(load_monthly_data("Jakub", 2026, 2)["data"]["rawData"]["messages"]) == 1
@@ -0,0 +1,80 @@
+"""Unit tests for tenant-scoped configuration and storage"""
+import asyncio
+import pytest
+from src import tenants
+from src.child_registry import UnknownChild, child_registry
+from src.executor import run_io
+from src.storage import load_state, save_state
+
+
+@pytest.fixture
+def temp_data_dir(temp_data_dir, monkeypatch):
+    """Temporary data directory with a default family and one more tenant"""
+    import src.config
+    monkeypatch.setitem(src.config.config._config, 'children', [
+        {"name": "Jakub", "aliases": ["Kuba"], "login": "j", "password": "p"}
+    ])
+    monkeypatch.setitem(src.config.config._config, 'tenants', {
+        "kowalscy": {
+            "token": "secret-k",
+            "max_concurrent_scrapes": 2,
+            "children": [{"name": "Jakub", "aliases": ["Kubuś"], "login": "k", "password": "p"}]
+        }
+    })
+    return temp_data_dir
+
+
+def test_tenants_have_separate_roots_and_aliases(temp_data_dir):
+    """Test the same child name resolves to a different directory and alias set per tenant"""
+    default_dir = child_registry.child_dir("Kuba")
+    with tenants.use_tenant("kowalscy"):
+        tenant_dir = child_registry.child_dir("Kubuś")
+        assert child_registry.resolve("Kuba") == "Kuba"
+        save_state("Jakub", {"last_scrape_iso": "2025-01-01 10:00:00"})
+
+    assert default_dir == temp_data_dir / "jakub"
+    assert tenant_dir == temp_data_dir / "tenants" / "kowalscy" / "jakub"
+    assert load_state("Jakub")["last_scrape_iso"] is None
+    assert tenants.tenant_ids() == ["default", "kowalscy"]
+
+
+def test_child_names_cannot_reach_another_tenant(temp_data_dir):
+    """Test only configured children get a directory, so a path-like name can't escape the tenant root"""
+    save_state("Jakub", {"last_scrape_iso": "2025-01-01 10:00:00"})
+
+    with tenants.use_tenant("kowalscy"):
+        for name in ("../../jakub", "../jakub", "/etc", "Anna"):
+            with pytest.raises(UnknownChild):
+                load_state(name)
+
+    assert not (temp_data_dir / "tenants" / "kowalscy" / "anna").exists()
+
+
+def test_tenant_follows_calls_into_thread_pool(temp_data_dir):
+    """Test run_io runs blocking work in the caller's tenant"""
+    async def scenario():
+        with tenants.use_tenant("kowalscy"):
+            return await run_io(tenants.current_tenant), await run_io(child_registry.child_dir, "Jakub")
+
+    tenant_id, path = asyncio.run(scenario())
+    assert tenant_id == "kowalscy"
+    assert path == temp_data_dir / "tenants" / "kowalscy" / "jakub"
+    assert tenants.current_tenant() == tenants.DEFAULT_TENANT
+
+
+def test_tokens_and_quotas(temp_data_dir, monkeypatch):
+    """Test bearer tokens select a tenant, unknown ones are refused and quotas fall back to the default"""
+    assert tenants.tenant_for_authorization("Bearer secret-k") == "kowalscy"
+    assert tenants.tenant_for_authorization("Bearer wrong") is None
+    assert tenants.tenant_for_authorization(None) is None
+    assert tenants.max_concurrent_scrapes("kowalscy") == 2
+    assert tenants.max_concurrent_scrapes(tenants.DEFAULT_TENANT) == 1
+
+    with pytest.raises(tenants.UnknownTenant):
+        with tenants.use_tenant("nowakowie"):
+            pass
+
+    import src.config
+    monkeypatch.delitem(src.config.config._config, 'tenants')
+    assert tenants.tenant_for_authorization(None) == tenants.DEFAULT_TENANT
+    assert tenants.max_concurrent_scrapes(tenants.DEFAULT_TENANT) == src.config.config.max_concurrent_scrapes
@@ -0,0 +1,103 @@
+"""Unit tests for tool registry and argument validation"""
+import asyncio
+import importlib.util
+import sys
+import pytest
+from src.schema import compile_schema, ToolArgumentError
+from src.tools import registry, ToolRegistry
+
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "child_name": {"type": "string"},
+        "force_full": {"type": "boolean", "default": False},
+        "months_back": {"type": "integer", "default": 2, "minimum": 1},
+        "report_type": {"type": "string", "enum": ["weekly", "monthly"]}
+    },
+    "required": ["child_name"]
+}
+
+
+def test_validator_applies_defaults():
+    """Test defaults are filled in for missing optional arguments"""
+    validate = compile_schema(SCHEMA)
+    args = validate({"child_name": "Jakub"})
+    assert args == {"child_name": "Jakub", "force_full": False, "months_back": 2}
+
+
+def test_validator_missing_required():
+    """Test missing required argument fails fast"""
+    validate = compile_schema(SCHEMA)
+    with pytest.raises(ToolArgumentError, match="child_name"):
+        validate({})
+
+
+def test_validator_wrong_type():
+    """Test type mismatches are rejected, including bool for integer"""
+    validate = compile_schema(SCHEMA)
+    with pytest.raises(ToolArgumentError, match="months_back"):
+        validate({"child_name": "Jakub", "months_back": "2"})
+    with pytest.raises(ToolArgumentError, match="months_back"):
+        validate({"child_name": "Jakub", "months_back": True})
+
+
+def test_validator_enum_and_minimum():
+    """Test enum and minimum constraints"""
+    validate = compile_schema(SCHEMA)
+    with pytest.raises(ToolArgumentError, match="report_type"):
+        validate({"child_name": "Jakub", "report_type": "daily"})
+    with pytest.raises(ToolArgumentError, match="months_back"):
+        validate({"child_name": "Jakub", "months_back": 0})
+
+
+def test_validator_pattern():
+    """Test date range arguments of read tools must be YYYY-MM-DD"""
+    validate = registry.get("get_homework_summary").validate
+    assert validate({"child_name": "Jakub", "date_from": "2026-02-01"})["date_from"] == "2026-02-01"
+    with pytest.raises(ToolArgumentError, match="date_to"):
+        validate({"child_name": "Jakub", "date_to": "01.02.2026"})
+    with pytest.raises(ToolArgumentError, match="date_from"):
+        registry.get("search").validate({"query": "wycieczka", "date_from": "marzec"})
+
+
+def test_registry_rejects_duplicates():
+    """Test the same tool cannot be registered twice"""
+    reg = ToolRegistry()
+    reg.register("x", "X", {"type": "object", "properties": {}}, "json:dumps")
+    with pytest.raises(ValueError, match="already registered"):
+        reg.register("x", "X", {"type": "object", "properties": {}}, "json:dumps")
+
+
+def test_registry_unknown_tool():
+    """Test dispatching an unknown tool raises"""
+    with pytest.raises(ValueError, match="Unknown tool"):
+        asyncio.run(registry.dispatch("no_such_tool", {}))
+
+
+def test_registry_dispatch_is_lazy(monkeypatch):
+    """Test handler module is imported on first dispatch only"""
+    reg = ToolRegistry()
+    reg.register(
+        "echo",
+        "Echo",
+        {"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]},
+        "tests.fake_handlers:handle_echo"
+    )
+    monkeypatch.delitem(sys.modules, "tests.fake_handlers", raising=False)
+    
+    with pytest.raises(ToolArgumentError):
+        asyncio.run(reg.dispatch("echo", {}))
+    assert "tests.fake_handlers" not in sys.modules
+    
+    assert asyncio.run(reg.dispatch("echo", {"text": "hi"})) == "hi"
+    assert "tests.fake_handlers" in sys.modules
+
+
+def test_registered_handlers_exist():
+    """Test every registered handler points to an existing module"""
+    names = [spec.name for spec in registry.specs()]
+    assert len(names) == len(set(names))
+    for spec in registry.specs():
+        module_name, _ = spec.handler_path.split(":")
+        assert importlib.util.find_spec(module_name) is not None, spec.handler_path
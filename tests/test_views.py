@@ -0,0 +1,72 @@
+"""Unit tests for materialized summary views"""
+from datetime import datetime
+from src.storage import save_monthly_data
+from src.views import get_views, homework_buckets, recent_month_keys, upcoming_events
+
+
+def save_current_month(raw_data=None, homework=()):
+    now = datetime.now()
+    save_monthly_data("Jakub", now.year, now.month, {
+        "timestamp": now.isoformat(),
+        "mode": "full",
+        "data": {"rawData": raw_data or {}, "homework": list(homework)}
+    })
+
+
+def test_views_rebuilt_on_save_with_new_generation(temp_data_dir):
+    """Test each save rematerializes views and bumps the generation"""
+    save_current_month({"remarks": [{"content": "Świetna praca na lekcji"}]})
+    first = get_views("Jakub")
+    assert first["months"] == recent_month_keys()
+    assert len(first["remarks"]["positive"]) == 1
+
+    save_current_month({
+        "remarks": [{"content": "Brak zadania"}],
+        "grades": [
+            {"subject": "Matematyka", "grade": "5", "category": "Kartkówka"},
+            {"subject": "Matematyka", "grade": "4", "category": "Ocena śródroczna"}
+        ]
+    })
+    second = get_views("Jakub")
+    assert second["generation"] == first["generation"] + 1
+    assert len(second["remarks"]["negative"]) == 1
+    assert [g["grade"] for g in second["grades"]["subjects"]["Matematyka"]] == ["5"]
+    assert [g["grade"] for g in second["grades"]["semester"]["Matematyka"]] == ["4"]
+
+
+def test_views_built_lazily_for_legacy_data(temp_data_dir):
+    """Test get_views materializes when no views file exists"""
+    views = get_views("Jakub")
+    assert views["generation"] == 1
+    assert not views["has_data"]
+
+
+def test_date_buckets_cut_from_sorted_index(temp_data_dir):
+    """Test homework and calendar buckets relative to a given day"""
+    save_current_month(
+        {"calendar": [
+            {"date": "2026-03-10", "title": "Dziś"},
+            {"date": "2026-03-12", "title": "Wycieczka"},
+            {"date": "2026-04-30", "title": "Za daleko"},
+            {"date": "wkrótce", "title": "Bez daty"}
+        ]},
+        homework=[
+            {"title": "D", "dateDue": "2026-03-20"},
+            {"title": "A", "dateDue": "2026-03-10"},
+            {"title": "B", "dateDue": "2026-03-11"},
+            {"title": "C", "dateDue": "2026-03-15"},
+            {"title": "X", "dateDue": "po feriach"},
+            {"title": "Z", "dateDue": ""}
+        ]
+    )
+    views = get_views("Jakub")
+    now = datetime(2026, 3, 10, 12, 0)
+
+    buckets = homework_buckets(views, now)
+    assert buckets["total_homework"] == 6
+    assert [h["title"] for h in buckets["overdue"]] == ["A"]
+    assert [h["title"] for h in buckets["urgent_today_tomorrow"]] == ["B"]
+    assert [h["title"] for h in buckets["upcoming_this_week"]] == ["C", "X"]
+    assert [h["title"] for h in buckets["upcoming_14_days"]] == ["D"]
+
+    assert [e["title"] for e in upcoming_events(views, now)] == ["Wycieczka", "Bez daty"]